@@ -364,3 +364,10 @@ def dispersion_zscore_series(dispersion_series: pd.Series, window: int) -> pd.Se
     mean = dispersion_series.rolling(window).mean()
     std = dispersion_series.rolling(window).std(ddof=1)
     return ((dispersion_series - mean) / std.replace(0, np.nan)).replace([np.inf, -np.inf], np.nan)
+
+
+def dispersion_regime_labels(dispersion_z: pd.Series, threshold: float = 1.0) -> pd.Series:
+    """Label each dispersion z-score high_disp (z > threshold), low_disp (z < -threshold) or mid (incl. NaN)."""
+    z = dispersion_z.to_numpy(dtype=float)
+    labels = np.select([z > threshold, z < -threshold], ["high_disp", "low_disp"], default="mid")
+    return pd.Series(labels, index=dispersion_z.index, name=dispersion_z.name, dtype=object)
@@ -5,15 +5,19 @@ Used by CLI (cli/backtest.py), walk-forward (walkforward.py), and dashboard (cli
 
 from __future__ import annotations
 
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
+from numpy.typing import ArrayLike
 
+from crypto_analyzer import fastkernels
 from crypto_analyzer.execution_cost import (
     ExecutionCostConfig,
     ExecutionCostModel,
-    slippage_bps_from_liquidity,
+    slippage_bps_series_from_liquidity,
 )
 from crypto_analyzer.features import bars_per_year, ema, log_returns, rolling_volatility
 
@@ -22,6 +26,302 @@ DEFAULT_FEE_BPS = 30
 DEFAULT_SLIPPAGE_BPS = 10
 
 
+def _combine_equity(curves: List[pd.Series]) -> pd.Series:
+    """
+    Equal-weight per-pair equity curves on the union of timestamps (ffill/bfill gaps). Each curve is forward-filled
+    onto the union grid and added into one buffer, so no pairs x timestamps frame is built. Every grid point sums
+    the curves in the same order, so stretches where all curves are flat stay exactly flat (0 returns in metrics).
+    """
+    if not curves:
+        return pd.Series(dtype=float)
+    if len(curves) == 1:
+        return curves[0]
+    idx = np.unique(np.concatenate([c.index.to_numpy() for c in curves]))
+    total = np.zeros(len(idx))
+    for c in curves:
+        eq = c.to_numpy(dtype=np.float64)
+        pos = np.searchsorted(idx, c.index.to_numpy())
+        lo, hi = int(pos[0]), int(pos[-1]) + 1
+        total[:lo] += eq[0]  # bfill before the curve starts
+        # ffill within [lo, hi): each grid point takes the latest of this curve's rows at or before it
+        total[lo:hi] += eq[np.cumsum(np.bincount(pos - lo, minlength=hi - lo)) - 1]
+        total[hi:] += eq[-1]  # ffill after it ends
+    return pd.Series(total / len(curves), index=pd.Index(idx))
+
+
+_TRADE_COLUMNS = ["ts_utc", "chain_id", "pair_address", "side", "price", "position_pct"]
+_PAIR_KEYS = ["chain_id", "pair_address"]
+
+
+def _pair_blocks(bars: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    bars sorted by (chain_id, pair_address, ts_utc) with a RangeIndex, and the row offsets of each pair's block:
+    pair k is rows starts[k]:starts[k + 1]. One sort and a key comparison replace groupby's per-pair DataFrames.
+    Rows with a missing pair key are dropped, as groupby does.
+    """
+    if bars[_PAIR_KEYS].isna().any(axis=None):
+        bars = bars.dropna(subset=_PAIR_KEYS)
+    bars = bars.sort_values([*_PAIR_KEYS, "ts_utc"], ignore_index=True)
+    chain = bars["chain_id"].to_numpy()
+    addr = bars["pair_address"].to_numpy()
+    change = np.flatnonzero((chain[1:] != chain[:-1]) | (addr[1:] != addr[:-1])) + 1
+    starts = np.concatenate(([0], change, [len(bars)])) if len(bars) else np.zeros(1, dtype=np.intp)
+    return bars, starts
+
+
+@dataclass(frozen=True)
+class _Panel:
+    """Column arrays of a block-sorted bars frame (see _pair_blocks); each pair works on its a:b slice."""
+
+    ts: np.ndarray  # ts_utc values: the equity index
+    ts_utc: ArrayLike  # ts_utc in its own dtype (tz kept) for trade rows
+    chain_id: np.ndarray
+    pair_address: np.ndarray
+    close: np.ndarray
+    cost_rate: Union[float, np.ndarray]  # fee + slippage per unit turnover, per row when liquidity-based
+
+
+def _panel(bars: pd.DataFrame, fee_bps: float, slippage_bps_fixed: Optional[float]) -> _Panel:
+    """Arrays for every pair at once; the liquidity slippage proxy is evaluated in one pass over the panel."""
+    cfg = ExecutionCostConfig(fee_bps=fee_bps, slippage_bps=slippage_bps_fixed or DEFAULT_SLIPPAGE_BPS)
+    if slippage_bps_fixed is not None:
+        slip_bps = None
+    else:
+        liq = bars["liquidity_usd"] if "liquidity_usd" in bars.columns else pd.Series(index=bars.index, dtype=float)
+        slip_bps = slippage_bps_series_from_liquidity(liq, cfg).to_numpy()
+    return _Panel(
+        ts=bars["ts_utc"].values,
+        ts_utc=bars["ts_utc"].array,
+        chain_id=bars["chain_id"].to_numpy(),
+        pair_address=bars["pair_address"].to_numpy(),
+        close=bars["close"].to_numpy(dtype=np.float64),
+        cost_rate=ExecutionCostModel(cfg).cost_rate(slip_bps),
+    )
+
+
+def _pair_result(
+    panel: _Panel,
+    a: int,
+    b: int,
+    position: np.ndarray,
+    ret: np.ndarray,
+    position_pct: float,
+    return_gross: bool,
+) -> Tuple[pd.Series, Optional[pd.Series], pd.DataFrame]:
+    """
+    Costs, equity and trades for one pair's position path (rows a:b of the panel, sorted by ts_utc).
+    Returns (net equity, pre-cost equity or None, trades: one row per entry then one per exit).
+    """
+    # Plain arrays from here on: the cost/equity tail is elementwise, so no index alignment is needed.
+    pos = np.asarray(position, dtype=np.float64)
+    prev_pos = np.empty_like(pos)
+    prev_pos[:1] = 0.0
+    prev_pos[1:] = np.nan_to_num(pos[:-1], nan=0.0)
+    gross_ret = prev_pos * ret
+    turnover = np.abs(pos - prev_pos)
+    turnover[np.isnan(turnover)] = 0.0
+    rate = panel.cost_rate[a:b] if isinstance(panel.cost_rate, np.ndarray) else panel.cost_rate
+    strategy_ret = gross_ret - turnover * rate
+    ts = panel.ts[a:b]
+    equity = pd.Series(np.cumprod(1.0 + np.nan_to_num(strategy_ret, nan=0.0)), index=ts)
+    gross = pd.Series(np.cumprod(1.0 + np.nan_to_num(gross_ret, nan=0.0)), index=ts) if return_gross else None
+    # Trades: entry/exit when position changes
+    pos_diff = np.diff(pos, prepend=pos[:1])
+    entries = np.flatnonzero(pos_diff > 0)
+    exits = np.flatnonzero(pos_diff < 0)
+    rows = np.concatenate((entries, exits)) + a
+    trades = pd.DataFrame(
+        {
+            "ts_utc": panel.ts_utc[rows],
+            "chain_id": panel.chain_id[rows],
+            "pair_address": panel.pair_address[rows],
+            "side": ["long"] * len(entries) + ["exit"] * len(exits),
+            "price": panel.close[rows],
+            "position_pct": np.repeat([float(position_pct), 0.0], [len(entries), len(exits)]),
+        },
+        columns=_TRADE_COLUMNS,
+    )
+    return equity, gross, trades
+
+
+def _collect(
+    all_equity: List[pd.Series], all_gross: List[pd.Series], all_trades: List[pd.DataFrame], return_gross: bool
+) -> Union[Tuple[pd.DataFrame, pd.Series], Tuple[pd.DataFrame, pd.Series, pd.Series]]:
+    """Strategy return value from the per-pair results: (trades_df, equity[, equity_gross])."""
+    trades = [t for t in all_trades if not t.empty]
+    trades_df = pd.concat(trades, ignore_index=True) if trades else pd.DataFrame()
+    equity_curve = _combine_equity(all_equity)
+    if return_gross:
+        return trades_df, equity_curve, _combine_equity(all_gross)
+    return trades_df, equity_curve
+
+
+def _trend_position(
+    close: np.ndarray, ema_fast: int, ema_slow: int, vol_window: int, vol_max: Optional[float], position_pct: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Trend position (position_pct while EMA fast > EMA slow and vol < vol_max, else 0) and the log returns it earns."""
+    close_s = pd.Series(close)
+    lr = log_returns(close_s)
+    long_signal = ema(close_s, ema_fast) > ema(close_s, ema_slow)
+    if vol_max is not None:
+        long_signal = long_signal & (rolling_volatility(lr, vol_window) < vol_max)
+    return long_signal.to_numpy(dtype=np.float64) * position_pct, lr.to_numpy()
+
+
+def _vol_breakout_position(
+    close: np.ndarray, z_entry: float, trailing_stop_pct: float, vol_window: int, position_pct: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vol breakout position (enter on return z-score > z_entry, exit on trailing stop) and the log returns it earns."""
+    lr = log_returns(pd.Series(close))
+    # Keep lr aligned with close (same length); rolling produces NaN for first vol_window-1
+    mean_r = lr.rolling(vol_window).mean()
+    std_r = lr.rolling(vol_window).std(ddof=1)
+    z = (lr - mean_r) / std_r.replace(0, np.nan)
+    position = fastkernels.trailing_stop_position(
+        close, z.to_numpy(), z_entry, trailing_stop_pct, position_pct, vol_window
+    )
+    return position, lr.to_numpy()
+
+
+def _pair_position_fn(
+    strategy: str,
+    position_pct: float,
+    ema_fast: int = 20,
+    ema_slow: int = 50,
+    vol_window: int = 24,
+    vol_max: Optional[float] = None,
+    z_entry: float = 2.0,
+    trailing_stop_pct: float = 0.05,
+) -> Tuple[Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]], int]:
+    """(close -> (position, log returns), minimum bars per pair) for strategy "trend" or vol breakout."""
+    if strategy == "trend":
+        fn = partial(
+            _trend_position,
+            ema_fast=ema_fast,
+            ema_slow=ema_slow,
+            vol_window=vol_window,
+            vol_max=vol_max,
+            position_pct=position_pct,
+        )
+        return fn, ema_slow + 5
+    fn = partial(
+        _vol_breakout_position,
+        z_entry=z_entry,
+        trailing_stop_pct=trailing_stop_pct,
+        vol_window=vol_window,
+        position_pct=position_pct,
+    )
+    return fn, vol_window + 10
+
+
+def _run_blocks(
+    bars: pd.DataFrame,
+    starts: np.ndarray,
+    positions: Callable[[np.ndarray, int, int], Optional[Tuple[np.ndarray, np.ndarray]]],
+    position_pct: float,
+    fee_bps: float,
+    slippage_bps_fixed: Optional[float],
+    return_gross: bool,
+) -> Union[Tuple[pd.DataFrame, pd.Series], Tuple[pd.DataFrame, pd.Series, pd.Series]]:
+    """Shared driver: positions(close, a, b) -> (position, ret) or None to skip the pair, then costs/equity/trades."""
+    panel = _panel(bars, fee_bps, slippage_bps_fixed)
+    all_equity = []
+    all_gross = []
+    all_trades = []
+    for a, b in zip(starts[:-1].tolist(), starts[1:].tolist()):
+        pos_ret = positions(panel.close[a:b], a, b)
+        if pos_ret is None:
+            continue
+        equity, gross, trades = _pair_result(panel, a, b, pos_ret[0], pos_ret[1], position_pct, return_gross)
+        all_equity.append(equity)
+        if return_gross:
+            all_gross.append(gross)
+        all_trades.append(trades)
+    return _collect(all_equity, all_gross, all_trades, return_gross)
+
+
+def strategy_positions(
+    bars: pd.DataFrame,
+    strategy: str,
+    position_pct: float = 0.25,
+    ema_fast: int = 20,
+    ema_slow: int = 50,
+    vol_window: int = 24,
+    vol_max: Optional[float] = None,
+    z_entry: float = 2.0,
+    trailing_stop_pct: float = 0.05,
+) -> pd.DataFrame:
+    """
+    Bars sorted by (chain_id, pair_address, ts_utc) with the strategy's "position" and "ret" (log return) columns,
+    computed in one pass over each pair's full history. strategy is "trend" or a vol breakout name; pairs shorter
+    than the strategy's warm-up are dropped. Any row slice of the result can be costed with run_positions.
+    """
+    fn, min_len = _pair_position_fn(
+        strategy, position_pct, ema_fast, ema_slow, vol_window, vol_max, z_entry, trailing_stop_pct
+    )
+    bars, starts = _pair_blocks(bars)
+    close = bars["close"].to_numpy(dtype=np.float64)
+    position = np.full(len(bars), np.nan)
+    ret = np.full(len(bars), np.nan)
+    keep = np.zeros(len(bars), dtype=bool)
+    for a, b in zip(starts[:-1].tolist(), starts[1:].tolist()):
+        if b - a < min_len:
+            continue
+        position[a:b], ret[a:b] = fn(close[a:b])
+        keep[a:b] = True
+    if not keep.any():
+        return pd.DataFrame()
+    return bars.assign(position=position, ret=ret)[keep].reset_index(drop=True)
+
+
+def run_positions(
+    bars_pos: pd.DataFrame,
+    position_pct: float = 0.25,
+    fee_bps: float = DEFAULT_FEE_BPS,
+    slippage_bps_fixed: Optional[float] = None,
+    return_gross: bool = False,
+) -> Union[Tuple[pd.DataFrame, pd.Series], Tuple[pd.DataFrame, pd.Series, pd.Series]]:
+    """Costs, equity and trades for precomputed positions (strategy_positions output or a slice of it).
+    Same return shape as the strategies; equity starts at 1 on each pair's first row of bars_pos."""
+    if bars_pos.empty:
+        return _collect([], [], [], return_gross)
+    bars, starts = _pair_blocks(bars_pos)
+    position = bars["position"].to_numpy(dtype=np.float64)
+    ret = bars["ret"].to_numpy(dtype=np.float64)
+    return _run_blocks(
+        bars,
+        starts,
+        lambda close, a, b: (position[a:b], ret[a:b]),
+        position_pct,
+        fee_bps,
+        slippage_bps_fixed,
+        return_gross,
+    )
+
+
+def _run_strategy(
+    bars: pd.DataFrame,
+    strategy: str,
+    position_pct: float,
+    fee_bps: float,
+    slippage_bps_fixed: Optional[float],
+    return_gross: bool,
+    **signal_params,
+) -> Union[Tuple[pd.DataFrame, pd.Series], Tuple[pd.DataFrame, pd.Series, pd.Series]]:
+    """Run one strategy over every pair with enough bars; signal_params go to _pair_position_fn."""
+    fn, min_len = _pair_position_fn(strategy, position_pct, **signal_params)
+    bars, starts = _pair_blocks(bars)
+    return _run_blocks(
+        bars,
+        starts,
+        lambda close, a, b: fn(close) if b - a >= min_len else None,
+        position_pct,
+        fee_bps,
+        slippage_bps_fixed,
+        return_gross,
+    )
+
+
 def run_trend_strategy(
     bars: pd.DataFrame,
     freq: str,
@@ -32,81 +332,22 @@ def run_trend_strategy(
     position_pct: float = 0.25,
     fee_bps: float = DEFAULT_FEE_BPS,
     slippage_bps_fixed: Optional[float] = None,
-) -> Tuple[pd.DataFrame, pd.Series]:
-    """Trend: long when EMA20 > EMA50 and vol below vol_max (optional). Fixed fraction position. slippage_bps_fixed=None uses liquidity-based proxy."""
-    bars = bars.sort_values(["chain_id", "pair_address", "ts_utc"])
-    all_equity = []
-    all_trades = []
-
-    for (cid, addr), g in bars.groupby(["chain_id", "pair_address"]):
-        g = g.sort_values("ts_utc").reset_index(drop=True)
-        if len(g) < ema_slow + 5:
-            continue
-        close = g["close"]
-        e20 = ema(close, ema_fast)
-        e50 = ema(close, ema_slow)
-        vol = rolling_volatility(log_returns(close), vol_window)
-        long_signal = e20 > e50
-        if vol_max is not None:
-            long_signal = long_signal & (vol < vol_max)
-        # Position: 1 when long, 0 when flat
-        position = long_signal.astype(float) * position_pct
-        ret = log_returns(close)
-        prev_pos = position.shift(1).fillna(0)
-        gross_ret = prev_pos * ret
-        turnover = (position - prev_pos).abs()
-        cfg = ExecutionCostConfig(fee_bps=fee_bps, slippage_bps=slippage_bps_fixed or DEFAULT_SLIPPAGE_BPS)
-        if slippage_bps_fixed is not None:
-            slip_series = None
-        else:
-            liq = g["liquidity_usd"] if "liquidity_usd" in g.columns else pd.Series(index=g.index, dtype=float)
-            slip_series = liq.map(lambda x: slippage_bps_from_liquidity(x, cfg))
-        model = ExecutionCostModel(cfg)
-        strategy_ret, _ = model.apply_costs(gross_ret, turnover, slippage_bps_series=slip_series)
-        equity = (1 + strategy_ret.fillna(0)).cumprod()
-        equity.index = g["ts_utc"].values
-        all_equity.append(equity)
-        # Trades: entry/exit when position changes
-        pos_diff = position.diff().fillna(0)
-        entries = g.loc[pos_diff > 0, ["ts_utc", "chain_id", "pair_address", "close"]].copy()
-        entries["side"] = "long"
-        entries["position_pct"] = position_pct
-        exits = g.loc[pos_diff < 0, ["ts_utc", "chain_id", "pair_address", "close"]].copy()
-        exits["side"] = "exit"
-        for _, row in entries.iterrows():
-            all_trades.append(
-                {
-                    "ts_utc": row["ts_utc"],
-                    "chain_id": cid,
-                    "pair_address": addr,
-                    "side": "long",
-                    "price": row["close"],
-                    "position_pct": position_pct,
-                }
-            )
-        for _, row in exits.iterrows():
-            all_trades.append(
-                {
-                    "ts_utc": row["ts_utc"],
-                    "chain_id": cid,
-                    "pair_address": addr,
-                    "side": "exit",
-                    "price": row["close"],
-                    "position_pct": 0,
-                }
-            )
-
-    if not all_equity:
-        return pd.DataFrame(), pd.Series(dtype=float)
-    if len(all_equity) == 1:
-        equity_curve = all_equity[0]
-    else:
-        eq_df = pd.concat(all_equity, axis=1)
-        idx = eq_df.index.union(eq_df.index).drop_duplicates().sort_values()
-        eq_df = eq_df.reindex(idx).ffill().bfill()
-        equity_curve = eq_df.mean(axis=1)
-    trades_df = pd.DataFrame(all_trades) if all_trades else pd.DataFrame()
-    return trades_df, equity_curve
+    return_gross: bool = False,
+) -> Union[Tuple[pd.DataFrame, pd.Series], Tuple[pd.DataFrame, pd.Series, pd.Series]]:
+    """Trend: long when EMA20 > EMA50 and vol below vol_max (optional). Fixed fraction position. slippage_bps_fixed=None uses liquidity-based proxy.
+    return_gross=True also returns the pre-cost equity curve from the same pass: (trades_df, equity, equity_gross)."""
+    return _run_strategy(
+        bars,
+        "trend",
+        position_pct,
+        fee_bps,
+        slippage_bps_fixed,
+        return_gross,
+        ema_fast=ema_fast,
+        ema_slow=ema_slow,
+        vol_window=vol_window,
+        vol_max=vol_max,
+    )
 
 
 def run_vol_breakout_strategy(
@@ -118,96 +359,33 @@ def run_vol_breakout_strategy(
     position_pct: float = 0.25,
     fee_bps: float = DEFAULT_FEE_BPS,
     slippage_bps_fixed: Optional[float] = None,
-) -> Tuple[pd.DataFrame, pd.Series]:
-    """Vol breakout: enter when return z-score > z_entry; exit on trailing stop (from high)."""
-    bars = bars.sort_values(["chain_id", "pair_address", "ts_utc"])
-    all_equity = []
-    all_trades = []
-
-    for (cid, addr), g in bars.groupby(["chain_id", "pair_address"]):
-        g = g.sort_values("ts_utc").reset_index(drop=True)
-        if len(g) < vol_window + 10:
-            continue
-        close = g["close"]
-        lr = log_returns(close)
-        # Keep lr aligned with g (same index/length); rolling produces NaN for first vol_window-1
-        mean_r = lr.rolling(vol_window).mean()
-        std_r = lr.rolling(vol_window).std(ddof=1)
-        z = (lr - mean_r) / std_r.replace(0, np.nan)
-        position = pd.Series(0.0, index=g.index)
-        high_water = close.copy()
-        for pos in range(1, len(g)):
-            if pos < vol_window or std_r.iloc[pos] == 0 or pd.isna(std_r.iloc[pos]) or pd.isna(z.iloc[pos]):
-                position.iloc[pos] = position.iloc[pos - 1]
-                continue
-            if position.iloc[pos - 1] == 0 and z.iloc[pos] >= z_entry:
-                position.iloc[pos] = position_pct
-                high_water.iloc[pos] = close.iloc[pos]
-            elif position.iloc[pos - 1] > 0:
-                high_water.iloc[pos] = max(high_water.iloc[pos - 1], close.iloc[pos])
-                if close.iloc[pos] < high_water.iloc[pos] * (1 - trailing_stop_pct):
-                    position.iloc[pos] = 0
-                else:
-                    position.iloc[pos] = position.iloc[pos - 1]
-            else:
-                position.iloc[pos] = 0
-        prev_pos = position.shift(1).fillna(0)
-        gross_ret = prev_pos * lr
-        turnover = (position - prev_pos).abs()
-        cfg = ExecutionCostConfig(fee_bps=fee_bps, slippage_bps=slippage_bps_fixed or DEFAULT_SLIPPAGE_BPS)
-        if slippage_bps_fixed is not None:
-            slip_series = None
-        else:
-            liq = g["liquidity_usd"] if "liquidity_usd" in g.columns else pd.Series(index=g.index, dtype=float)
-            slip_series = liq.map(lambda x: slippage_bps_from_liquidity(x, cfg))
-        model = ExecutionCostModel(cfg)
-        strategy_ret, _ = model.apply_costs(gross_ret, turnover, slippage_bps_series=slip_series)
-        equity = (1 + strategy_ret.fillna(0)).cumprod()
-        equity.index = g["ts_utc"].values
-        all_equity.append(equity)
-        pos_diff = position.diff().fillna(0)
-        for i in g.index[pos_diff > 0]:
-            all_trades.append(
-                {
-                    "ts_utc": g.loc[i, "ts_utc"],
-                    "chain_id": cid,
-                    "pair_address": addr,
-                    "side": "long",
-                    "price": g.loc[i, "close"],
-                    "position_pct": position_pct,
-                }
-            )
-        for i in g.index[pos_diff < 0]:
-            all_trades.append(
-                {
-                    "ts_utc": g.loc[i, "ts_utc"],
-                    "chain_id": cid,
-                    "pair_address": addr,
-                    "side": "exit",
-                    "price": g.loc[i, "close"],
-                    "position_pct": 0,
-                }
-            )
-
-    if not all_equity:
-        return pd.DataFrame(), pd.Series(dtype=float)
-    if len(all_equity) == 1:
-        equity_curve = all_equity[0]
-    else:
-        eq_df = pd.concat(all_equity, axis=1)
-        idx = eq_df.index.union(eq_df.index).drop_duplicates().sort_values()
-        eq_df = eq_df.reindex(idx).ffill().bfill()
-        equity_curve = eq_df.mean(axis=1)
-    trades_df = pd.DataFrame(all_trades) if all_trades else pd.DataFrame()
-    return trades_df, equity_curve
+    return_gross: bool = False,
+) -> Union[Tuple[pd.DataFrame, pd.Series], Tuple[pd.DataFrame, pd.Series, pd.Series]]:
+    """Vol breakout: enter when return z-score > z_entry; exit on trailing stop (from high).
+    return_gross=True also returns the pre-cost equity curve from the same pass: (trades_df, equity, equity_gross)."""
+    return _run_strategy(
+        bars,
+        "vol_breakout",
+        position_pct,
+        fee_bps,
+        slippage_bps_fixed,
+        return_gross,
+        z_entry=z_entry,
+        trailing_stop_pct=trailing_stop_pct,
+        vol_window=vol_window,
+    )
 
 
 def metrics(equity: pd.Series, freq: str) -> dict:
     """CAGR-ish, vol, Sharpe, Sortino, max DD, win rate, avg win/loss (from period returns)."""
     if equity.empty or len(equity) < 2:
         return {}
-    ret = equity.pct_change().dropna()
-    if ret.empty:
+    # Returns, their moments, win/loss splits and max drawdown in one compiled pass over the curve.
+    # Forward-fill first: equity_stats drops returns touching NaN, pct_change() padded over gaps.
+    n_ret, mean, std, n_win, avg_win, n_loss, avg_loss, downside_std, max_dd = fastkernels.equity_stats(
+        equity.ffill().to_numpy()
+    )
+    if n_ret == 0:
         return {}
     bars_yr = bars_per_year(freq)
     total_return = float(equity.iloc[-1] / equity.iloc[0] - 1.0)
@@ -219,21 +397,11 @@ def metrics(equity: pd.Series, freq: str) -> dict:
     if n_years <= 0:
         n_years = len(equity) / bars_yr
     cagr = (1 + total_return) ** (1 / n_years) - 1.0 if n_years > 0 else total_return
-    vol = ret.std(ddof=1) * np.sqrt(bars_yr) if ret.std(ddof=1) else np.nan
-    sharpe = (ret.mean() / ret.std(ddof=1)) * np.sqrt(bars_yr) if ret.std(ddof=1) and ret.std(ddof=1) != 0 else np.nan
-    downside = ret[ret < 0]
-    sortino = (
-        (ret.mean() / downside.std(ddof=1)) * np.sqrt(bars_yr)
-        if len(downside) > 1 and downside.std(ddof=1) != 0
-        else np.nan
-    )
-    cum = (1 + ret).cumprod()
-    dd = cum.cummax() - cum
-    max_dd = float(dd.max()) if len(dd) else np.nan
-    wins, losses = ret[ret > 0], ret[ret < 0]
-    win_rate = len(wins) / len(ret) if len(ret) else np.nan
-    avg_win = float(wins.mean()) if len(wins) else np.nan
-    avg_loss = float(losses.mean()) if len(losses) else np.nan
+    sqrt_yr = np.sqrt(bars_yr)
+    vol = std * sqrt_yr if std else np.nan
+    sharpe = (mean / std) * sqrt_yr if std and std != 0 else np.nan
+    sortino = (mean / downside_std) * sqrt_yr if n_loss > 1 and downside_std != 0 else np.nan
+    win_rate = n_win / n_ret
     n_trades = 0  # caller can add from trades_df
     return {
         "total_return": total_return,
@@ -58,11 +58,11 @@ from crypto_analyzer.features import (
     compute_lookback_return,
     compute_lookback_return_from_price,
     compute_ratio_series,
-    compute_rolling_beta,
     compute_rolling_corr,
     dispersion_window_for_freq,
     period_return_bars,
     periods_per_year,
+    rolling_beta_matrix,
     rolling_windows_for_freq,
 )
 
@@ -101,14 +101,22 @@ def load_snapshots(
     for a generic 'snapshots' table we expect a column named price_usd.
     Optionally filter by liquidity_usd and vol_h24 (None = no filter).
     """
-    where = ""
-    params: List[str] = []
+    clauses: List[str] = []
+    params: List[object] = []
     if only_pairs:
-        clauses = []
+        pair_clauses = []
         for pk in only_pairs:
-            clauses.append("(chain_id=? AND pair_address=?)")
+            pair_clauses.append("(chain_id=? AND pair_address=?)")
             params.extend([pk.chain_id, pk.pair_address])
-        where = "WHERE " + " OR ".join(clauses)
+        clauses.append("(" + " OR ".join(pair_clauses) + ")")
+    # Liquidity filter: drop garbage pairs (improves Sharpe ranking stability); applied in SQL so they are never read
+    if min_liquidity_usd is not None:
+        clauses.append("liquidity_usd > ?")
+        params.append(float(min_liquidity_usd))
+    if min_vol_h24 is not None:
+        clauses.append("vol_h24 > ?")
+        params.append(float(min_vol_h24))
+    where = "WHERE " + " AND ".join(clauses) if clauses else ""
 
     # Column mapping: project table has dex_price_usd; generic snapshots has price_usd
     select_price = f"{price_col} AS price_usd" if price_col != "price_usd" else "price_usd"
@@ -137,17 +145,6 @@ def load_snapshots(
     df["price_usd"] = pd.to_numeric(df["price_usd"], errors="coerce")
     df = df.dropna(subset=["price_usd"])
 
-    # Liquidity filter: drop garbage pairs (improves Sharpe ranking stability)
-    if min_liquidity_usd is not None or min_vol_h24 is not None:
-        mask = pd.Series(True, index=df.index)
-        if min_liquidity_usd is not None and "liquidity_usd" in df.columns:
-            liq = pd.to_numeric(df["liquidity_usd"], errors="coerce")
-            mask = mask & (liq > min_liquidity_usd)
-        if min_vol_h24 is not None and "vol_h24" in df.columns:
-            vol = pd.to_numeric(df["vol_h24"], errors="coerce")
-            mask = mask & (vol > min_vol_h24)
-        df = df.loc[mask]
-
     return df
 
 
@@ -243,6 +240,13 @@ def compute_metrics(
     win_short, win_long = rolling_windows_for_freq(freq)
     beta_compress_threshold = 0.15
 
+    # Latest rolling beta vs BTC_spot for every pair in one pass (ffill().iloc[-1] = last non-NaN per column).
+    has_factor = factor_ret is not None and not factor_ret.dropna().empty and not panel.empty
+    if has_factor:
+        lr_wide = panel.xs("log_return", axis=1, level=1)
+        last_beta_24 = rolling_beta_matrix(lr_wide, factor_ret, win_short).ffill().iloc[-1]
+        last_beta_72 = rolling_beta_matrix(lr_wide, factor_ret, win_long).ffill().iloc[-1]
+
     # summary metrics
     summary_rows = []
     for pair_id in panel.columns.levels[0]:
@@ -279,19 +283,15 @@ def compute_metrics(
 
         # Rolling corr/beta vs BTC_spot (latest non-NaN)
         corr_24 = corr_72 = beta_24 = beta_72 = np.nan
-        if factor_ret is not None and not factor_ret.dropna().empty:
+        if has_factor:
             roll_corr_24 = compute_rolling_corr(r, factor_ret, win_short)
             roll_corr_72 = compute_rolling_corr(r, factor_ret, win_long)
-            roll_beta_24 = compute_rolling_beta(r, factor_ret, win_short)
-            roll_beta_72 = compute_rolling_beta(r, factor_ret, win_long)
+            beta_24 = float(last_beta_24[pair_id])
+            beta_72 = float(last_beta_72[pair_id])
             if not roll_corr_24.empty:
                 corr_24 = float(roll_corr_24.dropna().iloc[-1]) if roll_corr_24.notna().any() else np.nan
             if not roll_corr_72.empty:
                 corr_72 = float(roll_corr_72.dropna().iloc[-1]) if roll_corr_72.notna().any() else np.nan
-            if not roll_beta_24.empty:
-                beta_24 = float(roll_beta_24.dropna().iloc[-1]) if roll_beta_24.notna().any() else np.nan
-            if not roll_beta_72.empty:
-                beta_72 = float(roll_beta_72.dropna().iloc[-1]) if roll_beta_72.notna().any() else np.nan
 
         beta_compression = compute_beta_compression(beta_24, beta_72)
         beta_state = classify_beta_state(beta_24, beta_72, beta_compress_threshold)
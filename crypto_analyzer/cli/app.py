@@ -10,8 +10,11 @@ Width handled by crypto_analyzer.ui helpers (width='stretch' on Streamlit >= 1.4
 from __future__ import annotations
 
 import json
+import math
 import os
+import sqlite3
 import traceback
+from datetime import datetime, timezone
 from pathlib import Path
 
 import numpy as np
@@ -20,12 +23,13 @@ import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
-from crypto_analyzer import ingest, read_api
+from crypto_analyzer import fastkernels, ingest, read_api
 
 # Aliases avoid UI variable shadowing (UnboundLocalError for rank_signal_df / signal_momentum_24h).
 from crypto_analyzer.alpha_research import (
     compute_dispersion_series,
     compute_forward_returns,
+    dispersion_regime_labels,
     dispersion_zscore_series,
     ic_decay,
     ic_summary,
@@ -66,28 +70,34 @@ from crypto_analyzer.data import (
     load_spot_price_resampled,
 )
 from crypto_analyzer.evaluation import conditional_metrics
+from crypto_analyzer.experiments import (
+    load_distinct_metric_names,
+    load_experiment_metrics,
+    load_experiments,
+    load_experiments_filtered,
+    load_metric_history,
+)
 from crypto_analyzer.features import (
+    PERIODS_PER_YEAR,
     bars_per_year,
     classify_beta_state,
     classify_vol_regime,
     compute_beta_compression,
-    compute_beta_vs_factor,
+    compute_beta_vs_factor_panel,
     compute_correlation_matrix,
     compute_dispersion_index,
     compute_dispersion_zscore,
-    compute_drawdown_from_equity,
-    compute_excess_cum_return,
     compute_excess_log_returns,
     compute_excess_lookback_return,
     compute_lookback_return_from_price,
     compute_ratio_series,
-    compute_rolling_beta,
-    compute_rolling_corr,
+    compute_rolling_corr_beta,
     dispersion_window_for_freq,
     drawdown,
+    latest_rolling_beta,
     log_returns,
-    max_drawdown,
     period_return_bars,
+    rolling_corr_matrix,
     rolling_volatility,
     rolling_windows_for_freq,
 )
@@ -100,6 +110,9 @@ from crypto_analyzer.portfolio import (
     turnover_from_weights,
 )
 from crypto_analyzer.portfolio_advanced import optimize_long_short_portfolio
+from crypto_analyzer.promotion.gating import ThresholdConfig
+from crypto_analyzer.promotion.service import evaluate_and_record
+from crypto_analyzer.promotion.store_sqlite import get_candidate, get_events, list_candidates, update_status
 from crypto_analyzer.regimes import classify_market_regime, explain_regime
 from crypto_analyzer.research_universe import get_research_assets
 from crypto_analyzer.risk_model import estimate_covariance
@@ -107,9 +120,52 @@ from crypto_analyzer.signals import load_signals
 from crypto_analyzer.signals_xs import build_exposure_panel, clean_momentum, orthogonalize_signals, value_vs_beta
 from crypto_analyzer.statistics import significance_summary
 from crypto_analyzer.ui import _safe_df as _safe_df
-from crypto_analyzer.ui import st_df, st_plot, streamlit_compatibility_caption
+from crypto_analyzer.ui import downsample_minmax, format_float, st_df, st_plot, streamlit_compatibility_caption
 from crypto_analyzer.walkforward import bars_per_day, run_walkforward_backtest
 
+# Leaderboard vol window (one day of bars) and annualization factor per UI freq, resolved once at import.
+_LEADERBOARD_WINDOW = {"5min": 288, "15min": 96, "1h": 24, "1D": 24}
+_SQRT_BARS_PER_YEAR = {f: math.sqrt(n) for f, n in PERIODS_PER_YEAR.items()}
+
+# Scanner result columns shown in the table, in display order (whichever the scan mode produced).
+_SCAN_DISPLAY_COLS = (
+    "chain_id",
+    "pair_address",
+    "label",
+    "close",
+    "liquidity_usd",
+    "vol_h24",
+    "return_24h",
+    "return_zscore",
+    "residual_return_24h",
+    "residual_annual_vol",
+    "residual_max_drawdown",
+    "capacity_usd",
+    "est_slippage_bps",
+    "tradable",
+    "annual_vol",
+    "annual_sharpe",
+    "max_drawdown",
+    "beta_vs_btc",
+    "corr_btc_24",
+    "corr_btc_72",
+    "beta_btc_24",
+    "beta_btc_72",
+    "excess_return_24h",
+    "excess_total_cum_return",
+    "excess_max_drawdown",
+    "beta_compression",
+    "beta_state",
+    "regime",
+)
+
+
+def _scan_csv_bytes(res: pd.DataFrame) -> bytes:
+    """Scanner export, serialized once per scan run (header-only when the scan returned nothing)."""
+    if res.empty:
+        res = pd.DataFrame(columns=["chain_id", "pair_address", "label"])
+    return res.to_csv(index=False).encode("utf-8")
+
 
 def get_db_path() -> str:
     p = db_path() if callable(db_path) else db_path
@@ -121,6 +177,18 @@ def load_latest_universe_allowlist(db_path_override: str, limit: int = 20) -> pd
     return read_api.load_latest_universe_allowlist(db_path_override, limit=limit)
 
 
+def _pair_id_category(df: pd.DataFrame) -> pd.Categorical:
+    """
+    "chain_id:pair_address" per row as a categorical with sorted categories. Only the unique pairs are formatted
+    as strings; rows carry integer codes, so later groupby/unstack on pair_id hash codes instead of Python strings.
+    """
+    grouped = df.groupby(["chain_id", "pair_address"], dropna=False)
+    keys = grouped.size().index  # group i <-> ngroup() code i
+    labels = keys.get_level_values(0).astype(str) + ":" + keys.get_level_values(1).astype(str)
+    cat = pd.Categorical.from_codes(grouped.ngroup().to_numpy(), categories=labels)
+    return cat.reorder_categories(labels.sort_values())
+
+
 def load_leaderboard(freq: str, min_liq: float, min_vol: float, min_bars_count: int):
     """Load snapshots, resample, compute metrics; return summary DataFrame."""
     df = load_snapshots(
@@ -131,37 +199,222 @@ def load_leaderboard(freq: str, min_liq: float, min_vol: float, min_bars_count:
     )
     if df.empty:
         return pd.DataFrame(), pd.DataFrame()
-    df["pair_id"] = df["chain_id"].astype(str) + ":" + df["pair_address"].astype(str)
-    window = 288 if "5" in freq else 24
+    df["pair_id"] = _pair_id_category(df)
+    window = _LEADERBOARD_WINDOW.get(freq, 24)
+    sqrt_bpy = _SQRT_BARS_PER_YEAR.get(freq) or math.sqrt(bars_per_year(freq))
+    df = df.sort_values("ts_utc", kind="stable")
+    # All pairs at once: one grouped resample to a (bucket x pair) frame instead of a Python loop per pair.
+    wide = (
+        df.groupby([pd.Grouper(key="ts_utc", freq=freq), "pair_id"], observed=True)["price_usd"]
+        .last()
+        .unstack("pair_id")
+    )
+    bars = wide.notna().sum()
+    wide = wide.loc[:, bars >= max(min_bars_count, window + 2)]
+    if wide.shape[1] == 0:
+        return df, pd.DataFrame()
+    # Each pair's series is its non-empty buckets only (gaps are skipped, not NaN returns), so stable-sort every
+    # column's valid bars to the bottom: row -1 is then each pair's last bar and returns chain across gaps.
+    values = wide.to_numpy(dtype=np.float64)
+    order = np.argsort(~np.isnan(values), axis=0, kind="stable")
+    close = pd.DataFrame(np.take_along_axis(values, order, axis=0), columns=wide.columns)
+    lr = np.log(close).diff()
+    cum = np.exp(lr.cumsum()) - 1.0
+    lr_std = lr.std(ddof=1)
+    meta = df.drop_duplicates("pair_id", keep="last").set_index("pair_id").loc[wide.columns]
+    summary = pd.DataFrame(
+        {
+            "pair_id": wide.columns.astype(object),
+            "label": (meta["base_symbol"].astype(str) + "/" + meta["quote_symbol"].astype(str)).to_numpy(),
+            "chain_id": meta["chain_id"].to_numpy(),
+            "pair_address": meta["pair_address"].to_numpy(),
+            "bars": bars[wide.columns].to_numpy(),
+            "total_cum_return": cum.iloc[-1].to_numpy(),
+            # Trailing `window` returns are all valid (bars >= window + 2), so this is rolling(window).std()[-1].
+            "annual_vol": (lr.iloc[-window:].std(ddof=1) * sqrt_bpy).to_numpy(),
+            "sharpe": (lr.mean() / lr_std.where(lr_std != 0) * sqrt_bpy).to_numpy(),
+            "max_drawdown": fastkernels.max_drawdown(cum.to_numpy()),
+        }
+    ).sort_values("sharpe", ascending=False)
+    return df, summary
+
+
+def _metrics_card(metrics: dict, decimals: int = 4) -> pd.DataFrame:
+    """metric/value table for st_df: numbers via format_float ("—" for NaN), string values (states) as-is."""
+    values = [v if isinstance(v, str) else format_float(v, decimals) for v in metrics.values()]
+    return pd.DataFrame({"metric": list(metrics), "value": values}, dtype="string[pyarrow]")
+
+
+def _db_mtime(path: str) -> float:
+    """Latest mtime of the SQLite file and its WAL sidecar (writes land in -wal until checkpoint); 0.0 if absent."""
+    mtimes = [os.path.getmtime(p) for p in (path, path + "-wal") if os.path.exists(p)]
+    return max(mtimes, default=0.0)
+
+
+# Streamlit re-runs main() on every widget interaction. These memoize the DB reads and the metric passes over them;
+# db_mtime is only part of the cache key, so a poller write invalidates them while unrelated reruns hit the cache.
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_leaderboard(freq: str, min_liq: float, min_vol: float, min_bars_count: int, db_mtime: float):
+    return load_leaderboard(freq, min_liq, min_vol, min_bars_count)
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_load_bars(freq: str, db_path_str: str, min_bars: int | None, db_mtime: float) -> pd.DataFrame:
+    return load_bars(freq, db_path_override=db_path_str, min_bars=min_bars)
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_overview_scans(freq: str, db_path_str: str, min_bars: int, top: int, db_mtime: float):
+    """(momentum, vol, top_vol, worst_dd) scans of the Overview bars; keyed on the load args, not a frame hash."""
+    bars = _cached_load_bars(freq, db_path_str, min_bars, db_mtime)
+    momentum_df = run_momentum_scan(bars, freq, top=top)
+    vol_df = run_vol_scan(bars, freq, top=top)
+    top_vol_df, worst_dd_df = run_risk_snapshot(bars, freq, top_vol=10, top_dd=10)
+    return momentum_df, vol_df, top_vol_df, worst_dd_df
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_pair_closes(freq: str, db_path_str: str, db_mtime: float):
+    """
+    Pair detail inputs: (one row per pair with label, close indexed by sorted (chain_id, pair_address, ts_utc)).
+    Selecting a pair is then an index lookup of its own rows instead of a boolean mask over every bar.
+    """
+    bars = _cached_load_bars(freq, db_path_str, None, db_mtime)
+    if bars.empty:
+        return pd.DataFrame(), pd.Series(dtype=float)
+    pairs = bars.groupby(["chain_id", "pair_address"])[["base_symbol", "quote_symbol"]].first().reset_index()
+    pairs["label"] = pairs["base_symbol"].fillna("") + "/" + pairs["quote_symbol"].fillna("")
+    closes = bars.set_index(["chain_id", "pair_address", "ts_utc"])["close"].sort_index()
+    return pairs, closes
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_market_returns(freq: str, db_path_str: str, db_mtime: float):
+    """
+    Market Structure inputs: (bars with pair_id/label/log_return, wide ts x pair_id log returns, pair_id -> label).
+    bars is sorted by (chain_id, pair_address, ts_utc), so each pair is one contiguous, time-ordered block.
+    """
+    bars = _cached_load_bars(freq, db_path_str, None, db_mtime)
+    if bars.empty:
+        return bars, pd.DataFrame(), {}
+    bars = bars.sort_values(["chain_id", "pair_address", "ts_utc"], kind="stable", ignore_index=True)
+    bars["pair_id"] = _pair_id_category(bars)
+    bars["label"] = bars["base_symbol"].fillna("").astype(str) + "/" + bars["quote_symbol"].fillna("").astype(str)
+    if "log_return" not in bars.columns:
+        log_close = pd.Series(np.log(bars["close"].to_numpy(dtype=np.float64)), index=bars.index)
+        bars["log_return"] = log_close.groupby([bars["chain_id"], bars["pair_address"]]).diff()
+    # unstack is a pure reshape; pivot_table would run a groupby-mean over every row to aggregate nothing
+    # ((ts_utc, pair) is unique in bars tables; the drop_duplicates only guards against that changing).
+    returns_df = (
+        bars.drop_duplicates(subset=["ts_utc", "pair_id"], keep="last")
+        .set_index(["ts_utc", "pair_id"])["log_return"]
+        .unstack("pair_id")
+        .sort_index()
+        .dropna(axis=1, how="all")
+        .dropna(how="all")
+    )
+    returns_df.columns = returns_df.columns.astype(object)  # spot columns (BTC_spot, ...) are appended later
+    meta = bars.groupby("pair_id", observed=True)["label"].last().to_dict()
+    return bars, returns_df, meta
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_market_closes(freq: str, db_path_str: str, db_mtime: float) -> pd.Series:
+    """Market Structure closes indexed by sorted (pair_id, ts_utc), so a selected pair is an index lookup."""
+    bars, _, _ = _cached_market_returns(freq, db_path_str, db_mtime)
+    if bars.empty:
+        return pd.Series(dtype=float)
+    return bars.set_index(["pair_id", "ts_utc"])["close"].sort_index()
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_market_enriched(freq: str, db_path_str: str, db_mtime: float):
+    """_cached_market_returns plus the appended *_spot return columns and the BTC factor returns (both DB reads)."""
+    bars, returns_df, meta = _cached_market_returns(freq, db_path_str, db_mtime)
+    if bars.empty:
+        return bars, returns_df, meta, None
+    try:
+        returns_df, meta = append_spot_returns_to_returns_df(returns_df, meta, db_path_str, freq)
+    except Exception:
+        pass  # keep returns_df/meta as-is if spot append fails
+    factor_ret = (
+        get_factor_returns(returns_df, meta, db_path_str, freq, factor_symbol="BTC") if not returns_df.empty else None
+    )
+    return bars, returns_df, meta, factor_ret
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_beta_vs_btc(freq: str, db_path_str: str, db_mtime: float) -> pd.DataFrame:
+    """Market Structure "Beta vs BTC" table: one row per pair with >= 2 returns (beta NaN without a BTC factor)."""
+    bars, returns_df, meta, factor_ret = _cached_market_enriched(freq, db_path_str, db_mtime)
+    if bars.empty:
+        return pd.DataFrame()
+    # All betas come from one masked cov/var reduction over the wide ts x pair_id panel (built by
+    # _cached_market_returns anyway) instead of a per-pair groupby with a pandas regression each.
+    panel = returns_df.reindex(columns=bars["pair_id"].unique().tolist())  # pairs in (chain_id, pair_address) order
+    keep = panel.notna().sum().to_numpy() >= 2
+    panel = panel.loc[:, keep]
+    if factor_ret is not None:
+        betas = compute_beta_vs_factor_panel(panel, factor_ret).to_numpy()
+    else:
+        betas = np.full(panel.shape[1], np.nan)
+    labels = [meta.get(pid, pid.replace(":", "/", 1)) for pid in panel.columns]
+    return pd.DataFrame({"label": labels, "beta_vs_btc": betas})
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_vol_regime(freq: str, db_path_str: str, db_mtime: float, vol_short: int, vol_medium: int) -> pd.DataFrame:
+    """Market Structure "Volatility regime" table from the std of each pair's last vol_short / vol_medium returns."""
+    bars, _, meta, _ = _cached_market_enriched(freq, db_path_str, db_mtime)
+    if bars.empty:
+        return pd.DataFrame()
+    # Only the latest window matters, so take NumPy tail slices of each pair's non-NaN returns instead of building
+    # full rolling-std series per pair to read their last value. bars is already pair-contiguous and time-sorted,
+    # so the pair blocks are the runs of equal pair_id codes.
+    valid = bars["log_return"].notna().to_numpy()
+    ret_all = bars["log_return"].to_numpy(dtype=np.float64)[valid]
+    codes = bars["pair_id"].cat.codes.to_numpy()[valid]
+    pair_ids = bars["pair_id"].cat.categories
+    ends = np.append(np.flatnonzero(codes[1:] != codes[:-1]) + 1, len(codes))
     rows = []
-    for pid, g in df.groupby("pair_id"):
-        g = g.sort_values("ts_utc").set_index("ts_utc")
-        close = g["price_usd"].resample(freq).last().dropna()
-        if len(close) < max(min_bars_count, window + 2):
+    for start, end in zip(np.append(0, ends[:-1]), ends):
+        if end - start < vol_short:
             continue
-        lr = log_returns(close)
-        cum = np.exp(lr.cumsum()) - 1.0
-        vol = lr.rolling(window).std(ddof=1)
-        bars_yr = bars_per_year(freq)
-        ann_vol = vol.iloc[-1] * np.sqrt(bars_yr) if not pd.isna(vol.iloc[-1]) else np.nan
-        sharpe = (lr.mean() / lr.std(ddof=1)) * np.sqrt(bars_yr) if lr.std(ddof=1) and lr.std(ddof=1) != 0 else np.nan
-        total_ret = cum.iloc[-1] if len(cum) else np.nan
-        label = f"{g['base_symbol'].iloc[-1]}/{g['quote_symbol'].iloc[-1]}"
-        rows.append(
-            {
-                "pair_id": pid,
-                "label": label,
-                "chain_id": g["chain_id"].iloc[0],
-                "pair_address": g["pair_address"].iloc[0],
-                "bars": len(close),
-                "total_cum_return": total_ret,
-                "annual_vol": ann_vol,
-                "sharpe": sharpe,
-                "max_drawdown": max_drawdown(cum),
-            }
-        )
-    summary = pd.DataFrame(rows).sort_values("sharpe", ascending=False) if rows else pd.DataFrame()
-    return df, summary
+        r = ret_all[start:end]
+        short_vol = float(np.std(r[-vol_short:], ddof=1))
+        medium_vol = float(np.std(r[-vol_medium:], ddof=1)) if len(r) >= vol_medium else short_vol
+        pid = pair_ids[codes[start]]
+        label = meta.get(pid, pid.replace(":", "/", 1))
+        rows.append({"label": label, "regime": classify_vol_regime(short_vol, medium_vol)})
+    return pd.DataFrame(rows)
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_research_assets(freq: str, db_path_str: str, include_spot: bool, db_mtime: float):
+    """(returns_df, meta_df) research universe, as get_research_assets; errors are raised, not cached."""
+    return get_research_assets(db_path_str, freq, include_spot=include_spot)
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_research_factor(freq: str, db_path_str: str, include_spot: bool, db_mtime: float):
+    """BTC factor returns for the research universe; None when the universe is empty (keyed on the load args)."""
+    returns_df, meta_df = _cached_research_assets(freq, db_path_str, include_spot, db_mtime)
+    meta_dict = meta_df.set_index("asset_id")["label"].to_dict() if not meta_df.empty else {}
+    return get_factor_returns(returns_df, meta_dict, db_path_str, freq) if meta_dict else None
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_research_dispersion(freq: str, db_path_str: str, include_spot: bool, db_mtime: float, window: int = 24):
+    """(cross-sectional dispersion, its rolling z-score) of the research universe; z is empty below `window` bars."""
+    returns_df, _ = _cached_research_assets(freq, db_path_str, include_spot, db_mtime)
+    disp_ser = compute_dispersion_series(returns_df)
+    disp_z_ser = dispersion_zscore_series(disp_ser, window) if len(disp_ser) >= window else pd.Series(dtype=float)
+    return disp_ser, disp_z_ser
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_signals(db_path_str: str, signal_type: str | None, last_n: int, db_mtime: float) -> pd.DataFrame:
+    return load_signals(db_path_str, signal_type=signal_type, last_n=last_n)
 
 
 def main():
@@ -206,8 +459,10 @@ def main():
             )
             top_n = st.number_input("Top N", value=10, min_value=1, max_value=50, step=1, key="overview_top")
         try:
-            snap_df, summary = load_leaderboard(freq, min_liq, min_vol, int(min_bars_count))
-            bars_overview = load_bars(freq, db_path_override=db_path_str, min_bars=int(min_bars_count))
+            snap_df, summary = _cached_leaderboard(
+                freq, min_liq, min_vol, int(min_bars_count), _db_mtime(get_db_path())
+            )
+            bars_overview = _cached_load_bars(freq, db_path_str, int(min_bars_count), _db_mtime(db_path_str))
         except Exception:
             snap_df = pd.DataFrame()
             summary = pd.DataFrame()
@@ -255,21 +510,21 @@ def main():
             else:
                 st_df(allowlist_df)
             if not bars_overview.empty:
+                momentum_df, vol_df, top_vol_df, worst_dd_df = _cached_overview_scans(
+                    freq, db_path_str, int(min_bars_count), int(top_n), _db_mtime(db_path_str)
+                )
                 st.subheader("Top momentum (return_24h, annual_vol, annual_sharpe, max_drawdown)")
                 st.caption("annual_vol = 24h rolling realized vol, annualized.")
-                momentum_df = run_momentum_scan(bars_overview, freq, top=int(top_n))
                 if not momentum_df.empty:
                     st_df(momentum_df.round(4))
                 else:
                     st.write("No momentum data.")
                 st.subheader("Top volatility (annual_vol, return_24h, annual_sharpe, max_drawdown)")
-                vol_df = run_vol_scan(bars_overview, freq, top=int(top_n))
                 if not vol_df.empty:
                     st_df(vol_df.round(4))
                 else:
                     st.write("No volatility data.")
                 st.subheader("Risk snapshot")
-                top_vol_df, worst_dd_df = run_risk_snapshot(bars_overview, freq, top_vol=10, top_dd=10)
                 st.caption("Top 10 by annual_vol (24h rolling)")
                 if not top_vol_df.empty:
                     st_df(top_vol_df.round(4))
@@ -281,14 +536,12 @@ def main():
         st.header("Pair detail")
         freq = st.selectbox("Freq", ["5min", "15min", "1h", "1D"], key="pair_freq")
         try:
-            bars = load_bars(freq, db_path_override=db_path_str)
+            pairs, closes = _cached_pair_closes(freq, db_path_str, _db_mtime(db_path_str))
         except Exception:
-            bars = pd.DataFrame()
-        if bars.empty:
+            pairs = pd.DataFrame()
+        if pairs.empty:
             st.warning("No data yet—run poll. If DB exists, run materialize_bars for this freq.")
         else:
-            pairs = bars.groupby(["chain_id", "pair_address"]).first().reset_index()
-            pairs["label"] = pairs["base_symbol"].fillna("") + "/" + pairs["quote_symbol"].fillna("")
             sel = st.selectbox(
                 "Pair",
                 options=range(len(pairs)),
@@ -297,29 +550,26 @@ def main():
                 ),
             )
             r = pairs.iloc[sel]
-            g = bars[(bars["chain_id"] == r["chain_id"]) & (bars["pair_address"] == r["pair_address"])].sort_values(
-                "ts_utc"
-            )
-            close = g.set_index("ts_utc")["close"]
+            close = closes.loc[(r["chain_id"], r["pair_address"])]
             lr = log_returns(close)
             cum = np.exp(lr.cumsum()) - 1.0
             dd_ser = drawdown(cum)
             vol = rolling_volatility(lr, 24)
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(x=close.index, y=close.values, name="Close"))
+            # Only the selected chart is built and serialized on each rerun.
+            chart = st.selectbox(
+                "Chart",
+                ["Close", "Cum return", "Rolling vol", "Drawdown", "Returns histogram"],
+                key="pair_chart",
+            )
+            if chart == "Returns histogram":
+                fig = px.histogram(x=lr.dropna().values, nbins=50, labels={"x": "Log return"})
+            else:
+                series = downsample_minmax(
+                    {"Close": close, "Cum return": cum, "Rolling vol": vol, "Drawdown": dd_ser}[chart]
+                )
+                fig = go.Figure()
+                fig.add_trace(go.Scattergl(x=series.index, y=series.values, name=chart, mode="lines"))
             st_plot(fig, use_container_width=True)
-            fig2 = go.Figure()
-            fig2.add_trace(go.Scatter(x=cum.index, y=cum.values, name="Cum return"))
-            st_plot(fig2, use_container_width=True)
-            fig3 = go.Figure()
-            fig3.add_trace(go.Scatter(x=vol.index, y=vol.values, name="Rolling vol"))
-            st_plot(fig3, use_container_width=True)
-            fig4 = go.Figure()
-            fig4.add_trace(go.Scatter(x=dd_ser.index, y=dd_ser.values, name="Drawdown"))
-            st_plot(fig4, use_container_width=True)
-            st.subheader("Returns histogram")
-            fig5 = px.histogram(x=lr.dropna().values, nbins=50, labels={"x": "Log return"})
-            st_plot(fig5, use_container_width=True)
             st.subheader("Latest metrics")
             last_vol = float(vol.iloc[-1]) if not vol.empty and vol.notna().any() else np.nan
             last_dd = float(dd_ser.iloc[-1]) if not dd_ser.empty and dd_ser.notna().any() else np.nan
@@ -376,7 +626,9 @@ def main():
                     )
                     st.session_state["scan_result"] = (res, disp_latest, disp_z_latest, reasons)
                 except Exception as e:
-                    st.session_state["scan_result"] = (pd.DataFrame(), np.nan, np.nan, ["__error__", str(e)])
+                    res = pd.DataFrame()
+                    st.session_state["scan_result"] = (res, np.nan, np.nan, ["__error__", str(e)])
+                st.session_state["scan_csv"] = _scan_csv_bytes(res)
         if "scan_result" in st.session_state:
             res, disp_latest, disp_z_latest, reasons = st.session_state["scan_result"]
             st.caption(
@@ -393,49 +645,18 @@ def main():
                 else:
                     st.info("No signals.")
             else:
-                display_cols = [
-                    c
-                    for c in [
-                        "chain_id",
-                        "pair_address",
-                        "label",
-                        "close",
-                        "liquidity_usd",
-                        "vol_h24",
-                        "return_24h",
-                        "return_zscore",
-                        "residual_return_24h",
-                        "residual_annual_vol",
-                        "residual_max_drawdown",
-                        "capacity_usd",
-                        "est_slippage_bps",
-                        "tradable",
-                        "annual_vol",
-                        "annual_sharpe",
-                        "max_drawdown",
-                        "beta_vs_btc",
-                        "corr_btc_24",
-                        "corr_btc_72",
-                        "beta_btc_24",
-                        "beta_btc_72",
-                        "excess_return_24h",
-                        "excess_total_cum_return",
-                        "excess_max_drawdown",
-                        "beta_compression",
-                        "beta_state",
-                        "regime",
-                    ]
-                    if c in res.columns
-                ]
+                avail = set(res.columns)
+                display_cols = [c for c in _SCAN_DISPLAY_COLS if c in avail]
                 out = res[display_cols] if display_cols else res
                 st_df(out.round(4))
-            sample_csv = (
-                res.to_csv(index=False).encode("utf-8")
-                if not res.empty
-                else pd.DataFrame(columns=["chain_id", "pair_address", "label"]).to_csv(index=False).encode("utf-8")
-            )
+            if "scan_csv" not in st.session_state:
+                st.session_state["scan_csv"] = _scan_csv_bytes(res)
             st.download_button(
-                "Download scan CSV", data=sample_csv, file_name="scan_export.csv", mime="text/csv", key="scan_dl"
+                "Download scan CSV",
+                data=st.session_state["scan_csv"],
+                file_name="scan_export.csv",
+                mime="text/csv",
+                key="scan_dl",
             )
         else:
             st.info("Use sidebar filters and click **Run scan** to run.")
@@ -448,10 +669,11 @@ def main():
         run_bt_clicked = st.sidebar.button("Run backtest", key="bt_run")
         if run_bt_clicked:
             try:
-                bars_bt = load_bars(
+                bars_bt = _cached_load_bars(
                     freq_bt,
-                    db_path_override=db_path_str,
-                    min_bars=int(config_min_bars() if callable(config_min_bars) else 48),
+                    db_path_str,
+                    int(config_min_bars() if callable(config_min_bars) else 48),
+                    _db_mtime(db_path_str),
                 )
                 if bars_bt.empty:
                     st.session_state["bt_result"] = (
@@ -462,11 +684,9 @@ def main():
                     )
                 else:
                     if strategy == "trend":
-                        _, equity_gross = run_trend_strategy(bars_bt, freq_bt, fee_bps=0, slippage_bps_fixed=0)
-                        trades_df, equity = run_trend_strategy(bars_bt, freq_bt)
+                        trades_df, equity, equity_gross = run_trend_strategy(bars_bt, freq_bt, return_gross=True)
                     else:
-                        _, equity_gross = run_vol_breakout_strategy(bars_bt, freq_bt, fee_bps=0, slippage_bps_fixed=0)
-                        trades_df, equity = run_vol_breakout_strategy(bars_bt, freq_bt)
+                        trades_df, equity, equity_gross = run_vol_breakout_strategy(bars_bt, freq_bt, return_gross=True)
                     if equity is None or (hasattr(equity, "empty") and equity.empty):
                         st.session_state["bt_result"] = (None, None, None, "Not enough data for strategy.")
                     else:
@@ -507,7 +727,10 @@ def main():
                 if equity is not None and not (hasattr(equity, "empty") and equity.empty):
                     st.subheader("Equity curve")
                     fig_equity = go.Figure()
-                    fig_equity.add_trace(go.Scatter(x=equity.index, y=equity.values, name="Equity", mode="lines"))
+                    equity_plot = downsample_minmax(equity)
+                    fig_equity.add_trace(
+                        go.Scattergl(x=equity_plot.index, y=equity_plot.values, name="Equity", mode="lines")
+                    )
                     fig_equity.update_layout(height=350, yaxis_title="Equity")
                     st_plot(fig_equity, use_container_width=True)
                 if trades_df is not None and not trades_df.empty:
@@ -538,10 +761,11 @@ def main():
         run_wf = st.sidebar.button("Run walk-forward", key="wf_run")
         if run_wf:
             try:
-                bars_wf = load_bars(
+                bars_wf = _cached_load_bars(
                     wf_freq,
-                    db_path_override=db_path_str,
-                    min_bars=int(config_min_bars() if callable(config_min_bars) else 48),
+                    db_path_str,
+                    int(config_min_bars() if callable(config_min_bars) else 48),
+                    _db_mtime(db_path_str),
                 )
                 if bars_wf.empty:
                     st.session_state["wf_result"] = (None, None, None, "No bars.")
@@ -563,6 +787,9 @@ def main():
                         expanding=wf_expanding,
                     )
                     st.session_state["wf_result"] = (stitched, fold_df, fold_metrics, None)
+                    st.session_state["wf_csv"] = (
+                        fold_df.to_csv(index=False).encode("utf-8") if fold_df is not None else b""
+                    )
             except Exception:
                 st.session_state["wf_result"] = (None, None, None, traceback.format_exc())
         if "wf_result" in st.session_state:
@@ -572,7 +799,10 @@ def main():
             elif stitched is not None and not stitched.empty:
                 st.subheader("Stitched equity")
                 fig_wf = go.Figure()
-                fig_wf.add_trace(go.Scatter(x=stitched.index, y=stitched.values, name="Equity", mode="lines"))
+                stitched_plot = downsample_minmax(stitched)
+                fig_wf.add_trace(
+                    go.Scattergl(x=stitched_plot.index, y=stitched_plot.values, name="Equity", mode="lines")
+                )
                 fig_wf.update_layout(height=350, yaxis_title="Equity")
                 st_plot(fig_wf, use_container_width=True)
                 total_ret = float(stitched.iloc[-1] / stitched.iloc[0] - 1.0)
@@ -582,7 +812,7 @@ def main():
                     st_df(fold_df)
                     st.download_button(
                         "Download fold CSV",
-                        data=fold_df.to_csv(index=False).encode("utf-8"),
+                        data=st.session_state.get("wf_csv") or fold_df.to_csv(index=False).encode("utf-8"),
                         file_name="walkforward_folds.csv",
                         mime="text/csv",
                         key="wf_dl",
@@ -598,35 +828,16 @@ def main():
             "Freq (1h recommended for beta/correlation)", ["5min", "15min", "1h", "1D"], index=2, key="ms_freq"
         )
         try:
-            bars_ms = load_bars(freq_ms, db_path_override=db_path_str)
+            bars_ms, returns_df, meta, factor_ret = _cached_market_enriched(
+                freq_ms, db_path_str, _db_mtime(db_path_str)
+            )
         except Exception:
             bars_ms = pd.DataFrame()
         if bars_ms.empty:
             st.warning("No data yet—run poll. If DB exists, run materialize_bars for this freq.")
         else:
-            bars_ms = bars_ms.copy()
-            bars_ms["pair_id"] = bars_ms["chain_id"].astype(str) + ":" + bars_ms["pair_address"].astype(str)
-            bars_ms["label"] = (
-                bars_ms["base_symbol"].fillna("").astype(str) + "/" + bars_ms["quote_symbol"].fillna("").astype(str)
-            )
-            if "log_return" not in bars_ms.columns:
-                out = []
-                for (c, a), g in bars_ms.groupby(["chain_id", "pair_address"]):
-                    g = g.sort_values("ts_utc").copy()
-                    g["log_return"] = log_returns(g["close"]).values
-                    out.append(g)
-                bars_ms = pd.concat(out, ignore_index=True)
-            returns_df = bars_ms.pivot_table(index="ts_utc", columns="pair_id", values="log_return").dropna(how="all")
-            meta = bars_ms.groupby("pair_id")["label"].last().to_dict()
-            try:
-                returns_df, meta = append_spot_returns_to_returns_df(returns_df, meta, db_path_str, freq_ms)
-            except Exception:
-                pass  # keep returns_df/meta as-is if spot append fails
-            factor_ret = (
-                get_factor_returns(returns_df, meta, db_path_str, freq_ms, factor_symbol="BTC")
-                if not returns_df.empty
-                else None
-            )
+            # DEX pair columns (everything except the appended *_spot series), classified once per rerun.
+            dex_cols = returns_df.columns[~returns_df.columns.astype(str).str.endswith("_spot")].tolist()
 
             if returns_df.shape[1] >= 2:
                 corr = compute_correlation_matrix(returns_df)
@@ -657,26 +868,17 @@ def main():
                             disp_z_latest_ms = float(disp_z_ms.iloc[-1])
                 vol_regime_ms = "unknown"
                 beta_state_ms = "unknown"
-                dex_cols_early = [c for c in returns_df.columns if not str(c).endswith("_spot")]
-                if dex_cols_early and factor_ret is not None and not factor_ret.dropna().empty:
-                    first_pair = dex_cols_early[0]
+                if dex_cols and factor_ret is not None and not factor_ret.dropna().empty:
+                    first_pair = dex_cols[0]
                     r_first = returns_df[first_pair].dropna()
                     if len(r_first) >= 48:
-                        vol_short = r_first.rolling(24).std(ddof=1).iloc[-1]
-                        vol_med = r_first.rolling(48).std(ddof=1).iloc[-1]
+                        # Only the latest window of each statistic feeds the regime label.
+                        r_tail = r_first.to_numpy(dtype=np.float64)
+                        vol_short = float(np.std(r_tail[-24:], ddof=1))
+                        vol_med = float(np.std(r_tail[-48:], ddof=1))
                         vol_regime_ms = classify_vol_regime(vol_short, vol_med)
-                        roll_b24 = compute_rolling_beta(r_first, factor_ret, 24)
-                        roll_b72 = compute_rolling_beta(r_first, factor_ret, 72)
-                        b24 = (
-                            float(roll_b24.dropna().iloc[-1])
-                            if not roll_b24.empty and roll_b24.notna().any()
-                            else np.nan
-                        )
-                        b72 = (
-                            float(roll_b72.dropna().iloc[-1])
-                            if not roll_b72.empty and roll_b72.notna().any()
-                            else np.nan
-                        )
+                        b24 = latest_rolling_beta(r_first, factor_ret, 24)
+                        b72 = latest_rolling_beta(r_first, factor_ret, 72)
                         beta_state_ms = classify_beta_state(b24, b72, 0.15)
                 regime_label_ms = classify_market_regime(disp_z_latest_ms, vol_regime_ms, beta_state_ms)
                 regime_explanation_ms = explain_regime(regime_label_ms)
@@ -691,15 +893,14 @@ def main():
                 btc_price = load_spot_price_resampled(db_path_str, "BTC", freq_ms)
             except Exception:
                 btc_price = pd.Series(dtype=float)
-            dex_cols_for_ratio = [c for c in returns_df.columns if not str(c).endswith("_spot")]
-            if not btc_price.empty and dex_cols_for_ratio:
+            if not btc_price.empty and dex_cols:
                 st.subheader("Asset/BTC ratio")
-                pair_ratio_options = dex_cols_for_ratio
-                default_idx = 0
-                for i, c in enumerate(pair_ratio_options):
-                    if "SOL" in (meta.get(c, c) or "") and "USDC" in (meta.get(c, c) or ""):
-                        default_idx = i
-                        break
+                pair_ratio_options = dex_cols
+                ratio_labels = pd.Series([meta.get(c, c) or "" for c in pair_ratio_options], dtype=object)
+                is_sol_usdc = ratio_labels.str.contains("SOL", regex=False) & ratio_labels.str.contains(
+                    "USDC", regex=False
+                )
+                default_idx = int(is_sol_usdc.to_numpy().argmax()) if is_sol_usdc.any() else 0
                 pair_ratio_sel = st.selectbox(
                     "Pair (vs BTC_spot)",
                     options=pair_ratio_options,
@@ -707,9 +908,13 @@ def main():
                     format_func=lambda x: meta.get(x, x),
                     key="pair_ratio",
                 )
-                g_ratio = bars_ms[bars_ms["pair_id"] == pair_ratio_sel].sort_values("ts_utc").set_index("ts_utc")
-                if not g_ratio.empty and "close" in g_ratio.columns:
-                    price_series = g_ratio["close"].dropna()
+                closes_ms = _cached_market_closes(freq_ms, db_path_str, _db_mtime(db_path_str))
+                try:
+                    pair_closes = closes_ms.loc[pair_ratio_sel]
+                except KeyError:
+                    pair_closes = pd.Series(dtype=float)
+                if not pair_closes.empty:
+                    price_series = pair_closes.dropna()
                     ratio_series = compute_ratio_series(price_series, btc_price)
                     if len(ratio_series) >= 2:
                         n_24h = period_return_bars(freq_ms)["24h"]
@@ -719,17 +924,8 @@ def main():
                             else np.nan
                         )
                         ratio_cum_return = (float(ratio_series.iloc[-1]) / float(ratio_series.iloc[0])) - 1.0
-                        ratio_metrics = pd.DataFrame(
-                            [
-                                {
-                                    "metric": "ratio_return_24h",
-                                    "value": round(ratio_return_24h, 4) if pd.notna(ratio_return_24h) else "—",
-                                },
-                                {
-                                    "metric": "ratio_cum_return",
-                                    "value": round(ratio_cum_return, 4) if pd.notna(ratio_cum_return) else "—",
-                                },
-                            ]
+                        ratio_metrics = _metrics_card(
+                            {"ratio_return_24h": ratio_return_24h, "ratio_cum_return": ratio_cum_return}
                         )
                         st.caption(
                             f"Metrics for {meta.get(pair_ratio_sel, pair_ratio_sel)} / BTC. Ratio = asset price / BTC price; strength vs BTC."
@@ -737,7 +933,7 @@ def main():
                         st_df(ratio_metrics, hide_index=True)
                         fig_ratio = go.Figure()
                         fig_ratio.add_trace(
-                            go.Scatter(x=ratio_series.index, y=ratio_series.values, name="Ratio", mode="lines")
+                            go.Scattergl(x=ratio_series.index, y=ratio_series.values, name="Ratio", mode="lines")
                         )
                         fig_ratio.update_layout(
                             title=f"Asset/BTC ratio — {meta.get(pair_ratio_sel, pair_ratio_sel)}",
@@ -749,7 +945,7 @@ def main():
                         st.info("Not enough aligned ratio points.")
                 else:
                     st.info("No price series for selected pair.")
-            elif not dex_cols_for_ratio:
+            elif not dex_cols:
                 st.caption("No DEX pairs for ratio.")
             else:
                 st.caption("BTC_spot price not available for ratio.")
@@ -764,15 +960,12 @@ def main():
                     format_func=lambda x: meta.get(x, x),
                     key="roll_pair",
                 )
-                ref_col = returns_df[pair_sel]
-                roll_corr = pd.DataFrame(index=returns_df.index)
-                for c in returns_df.columns:
-                    if c != pair_sel:
-                        roll_corr[c] = ref_col.rolling(roll_window).corr(returns_df[c])
-                roll_corr = roll_corr.rename(columns=meta)
+                roll_corr = rolling_corr_matrix(
+                    returns_df.drop(columns=[pair_sel]), returns_df[pair_sel], int(roll_window)
+                ).rename(columns=meta)
                 fig_roll = go.Figure()
                 for col in roll_corr.columns:
-                    fig_roll.add_trace(go.Scatter(x=roll_corr.index, y=roll_corr[col], name=col, mode="lines"))
+                    fig_roll.add_trace(go.Scattergl(x=roll_corr.index, y=roll_corr[col], name=col, mode="lines"))
                 fig_roll.update_layout(
                     title=f"Rolling correlation vs {meta.get(pair_sel, pair_sel)} (window={roll_window})",
                     height=350,
@@ -781,7 +974,6 @@ def main():
                 st_plot(fig_roll, use_container_width=True)
 
             st.subheader("Rolling corr / beta vs BTC_spot")
-            dex_cols = [c for c in returns_df.columns if not str(c).endswith("_spot")]
             if dex_cols and factor_ret is not None and not factor_ret.dropna().empty:
                 win_short, win_long = rolling_windows_for_freq(freq_ms)
                 roll_win_sel = st.selectbox(
@@ -797,12 +989,11 @@ def main():
                     key="pair_btc",
                 )
                 asset_ret = returns_df[pair_btc_sel].dropna()
-                roll_corr_btc = compute_rolling_corr(asset_ret, factor_ret, roll_win_sel)
-                roll_beta_btc = compute_rolling_beta(asset_ret, factor_ret, roll_win_sel)
-                roll_corr_24 = compute_rolling_corr(asset_ret, factor_ret, win_short)
-                roll_corr_72 = compute_rolling_corr(asset_ret, factor_ret, win_long)
-                roll_beta_24 = compute_rolling_beta(asset_ret, factor_ret, win_short)
-                roll_beta_72 = compute_rolling_beta(asset_ret, factor_ret, win_long)
+                # One corr+beta pass per window; the selected window reuses its result.
+                roll_by_win = {w: compute_rolling_corr_beta(asset_ret, factor_ret, w) for w in (win_short, win_long)}
+                roll_corr_24, roll_beta_24 = roll_by_win[win_short]
+                roll_corr_72, roll_beta_72 = roll_by_win[win_long]
+                roll_corr_btc, roll_beta_btc = roll_by_win[roll_win_sel]
                 beta_hat_72 = (
                     float(roll_beta_72.dropna().iloc[-1])
                     if not roll_beta_72.empty and roll_beta_72.notna().any()
@@ -850,34 +1041,29 @@ def main():
                 beta_state = classify_beta_state(beta_24, beta_72, beta_compress_threshold)
                 n_24h = period_return_bars(freq_ms)["24h"]
                 excess_return_24h = excess_max_drawdown = np.nan
+                excess_cum = None  # BTC-hedged cumulative return; shared by the metrics card and the chart below
                 if beta_hat is not None and len(asset_ret) >= 2:
                     r_excess = compute_excess_log_returns(asset_ret, factor_ret, beta_hat)
                     if len(r_excess) >= 2:
                         excess_return_24h = (
                             compute_excess_lookback_return(r_excess, n_24h) if len(r_excess) >= n_24h else np.nan
                         )
-                        excess_equity = np.exp(r_excess.cumsum())
-                        _, excess_max_drawdown = compute_drawdown_from_equity(excess_equity)
-                metrics_card = pd.DataFrame(
-                    [
-                        {"metric": "corr_btc_24", "value": round(corr_24, 4) if pd.notna(corr_24) else "—"},
-                        {"metric": "corr_btc_72", "value": round(corr_72, 4) if pd.notna(corr_72) else "—"},
-                        {"metric": "beta_btc_24", "value": round(beta_24, 4) if pd.notna(beta_24) else "—"},
-                        {"metric": "beta_btc_72", "value": round(beta_72, 4) if pd.notna(beta_72) else "—"},
-                        {
-                            "metric": "beta_compression",
-                            "value": round(beta_compression, 4) if pd.notna(beta_compression) else "—",
-                        },
-                        {"metric": "beta_state", "value": beta_state},
-                        {
-                            "metric": "excess_return_24h",
-                            "value": round(excess_return_24h, 4) if pd.notna(excess_return_24h) else "—",
-                        },
-                        {
-                            "metric": "excess_max_drawdown",
-                            "value": round(excess_max_drawdown, 4) if pd.notna(excess_max_drawdown) else "—",
-                        },
-                    ]
+                        # r_excess is already NaN-free, so exp(log_cum) equals compute_excess_cum_return(r_excess) + 1;
+                        # the peak-relative drawdown min(eq / cummax(eq) - 1) is expm1(-max(cummax(log_cum) - log_cum)).
+                        log_cum = r_excess.cumsum()
+                        excess_max_drawdown = float(np.expm1(-fastkernels.max_drawdown(log_cum.to_numpy())))
+                        excess_cum = np.expm1(log_cum)
+                metrics_card = _metrics_card(
+                    {
+                        "corr_btc_24": corr_24,
+                        "corr_btc_72": corr_72,
+                        "beta_btc_24": beta_24,
+                        "beta_btc_72": beta_72,
+                        "beta_compression": beta_compression,
+                        "beta_state": beta_state,
+                        "excess_return_24h": excess_return_24h,
+                        "excess_max_drawdown": excess_max_drawdown,
+                    }
                 )
                 st.caption(f"Metrics for {meta.get(pair_btc_sel, pair_btc_sel)}")
                 st.caption(
@@ -887,7 +1073,7 @@ def main():
                 fig_rc = go.Figure()
                 if not roll_corr_btc.empty:
                     fig_rc.add_trace(
-                        go.Scatter(x=roll_corr_btc.index, y=roll_corr_btc.values, name="Rolling corr", mode="lines")
+                        go.Scattergl(x=roll_corr_btc.index, y=roll_corr_btc.values, name="Rolling corr", mode="lines")
                     )
                 fig_rc.update_layout(
                     title=f"Rolling correlation vs BTC_spot — {meta.get(pair_btc_sel, pair_btc_sel)} (window={roll_win_sel})",
@@ -898,7 +1084,7 @@ def main():
                 fig_rb = go.Figure()
                 if not roll_beta_btc.empty:
                     fig_rb.add_trace(
-                        go.Scatter(x=roll_beta_btc.index, y=roll_beta_btc.values, name="Rolling beta", mode="lines")
+                        go.Scattergl(x=roll_beta_btc.index, y=roll_beta_btc.values, name="Rolling beta", mode="lines")
                     )
                 fig_rb.update_layout(
                     title=f"Rolling beta vs BTC_spot — {meta.get(pair_btc_sel, pair_btc_sel)} (window={roll_win_sel})",
@@ -906,40 +1092,24 @@ def main():
                     yaxis_title="Beta",
                 )
                 st_plot(fig_rb, use_container_width=True)
-                if beta_hat is not None and len(asset_ret) >= 2:
-                    r_excess = compute_excess_log_returns(asset_ret, factor_ret, beta_hat)
-                    if len(r_excess) >= 2:
-                        excess_cum = compute_excess_cum_return(r_excess)
-                        fig_ex = go.Figure()
-                        fig_ex.add_trace(
-                            go.Scatter(x=excess_cum.index, y=excess_cum.values, name="Excess cum return", mode="lines")
-                        )
-                        fig_ex.update_layout(
-                            title=f"BTC-hedged cumulative return — {meta.get(pair_btc_sel, pair_btc_sel)} (beta_hat={beta_hat_sel})",
-                            height=300,
-                            yaxis_title="Excess cum return",
-                        )
-                        st_plot(fig_ex, use_container_width=True)
+                if excess_cum is not None:
+                    fig_ex = go.Figure()
+                    fig_ex.add_trace(
+                        go.Scattergl(x=excess_cum.index, y=excess_cum.values, name="Excess cum return", mode="lines")
+                    )
+                    fig_ex.update_layout(
+                        title=f"BTC-hedged cumulative return — {meta.get(pair_btc_sel, pair_btc_sel)} (beta_hat={beta_hat_sel})",
+                        height=300,
+                        yaxis_title="Excess cum return",
+                    )
+                    st_plot(fig_ex, use_container_width=True)
             else:
                 st.info("Need DEX pairs and BTC_spot (run poller with spot).")
 
             st.subheader("Beta vs BTC")
-            rows_beta = []
-            for (cid, addr), g in bars_ms.groupby(["chain_id", "pair_address"]):
-                g = g.sort_values("ts_utc").set_index("ts_utc")
-                r = g["log_return"].dropna()
-                if len(r) < 2:
-                    continue
-                factor_aligned = factor_ret.reindex(r.index).dropna() if factor_ret is not None else None
-                beta = (
-                    compute_beta_vs_factor(r, factor_aligned)
-                    if factor_aligned is not None and not (factor_aligned.dropna().empty)
-                    else np.nan
-                )
-                label = meta.get(f"{cid}:{addr}", f"{cid}/{addr}")
-                rows_beta.append({"label": label, "beta_vs_btc": beta})
-            if rows_beta:
-                st_df(pd.DataFrame(rows_beta))
+            beta_tbl = _cached_beta_vs_btc(freq_ms, db_path_str, _db_mtime(db_path_str))
+            if not beta_tbl.empty:
+                st_df(beta_tbl)
             else:
                 st.write("No data or no BTC factor.")
 
@@ -970,11 +1140,11 @@ def main():
                     st_df(disp_metrics, hide_index=True)
                     fig_disp = go.Figure()
                     fig_disp.add_trace(
-                        go.Scatter(x=disp_series.index, y=disp_series.values, name="Dispersion (std)", mode="lines")
+                        go.Scattergl(x=disp_series.index, y=disp_series.values, name="Dispersion (std)", mode="lines")
                     )
                     if not disp_z_series.empty:
                         fig_disp.add_trace(
-                            go.Scatter(
+                            go.Scattergl(
                                 x=disp_z_series.index,
                                 y=disp_z_series.values,
                                 name="Dispersion z-score",
@@ -993,22 +1163,9 @@ def main():
                 st.caption("Need 2+ assets for dispersion.")
 
             st.subheader("Volatility regime")
-            vol_short, vol_medium = 24, 48
-            rows_regime = []
-            for (cid, addr), g in bars_ms.groupby(["chain_id", "pair_address"]):
-                g = g.sort_values("ts_utc")
-                r = g["log_return"].dropna()
-                if len(r) < vol_short:
-                    continue
-                short_vol = r.rolling(vol_short).std(ddof=1).iloc[-1]
-                medium_vol = (
-                    r.rolling(min(vol_medium, len(r))).std(ddof=1).iloc[-1] if len(r) >= vol_medium else short_vol
-                )
-                regime = classify_vol_regime(short_vol, medium_vol)
-                label = meta.get(f"{cid}:{addr}", f"{cid}/{addr}")
-                rows_regime.append({"label": label, "regime": regime})
-            if rows_regime:
-                st_df(pd.DataFrame(rows_regime))
+            regime_tbl = _cached_vol_regime(freq_ms, db_path_str, _db_mtime(db_path_str), 24, 48)
+            if not regime_tbl.empty:
+                st_df(regime_tbl)
             else:
                 st.write("No data.")
 
@@ -1022,7 +1179,7 @@ def main():
         last_n = st.sidebar.number_input("Last N signals", value=100, min_value=1, max_value=1000, step=10, key="sig_n")
         sig_type = None if signal_type_filter == "all" else signal_type_filter
         try:
-            signals_df = load_signals(db_path_str, signal_type=sig_type, last_n=int(last_n))
+            signals_df = _cached_signals(db_path_str, sig_type, int(last_n), _db_mtime(db_path_str))
         except Exception:
             signals_df = pd.DataFrame()
         if not signals_df.empty:
@@ -1041,7 +1198,7 @@ def main():
         st.header("Research (cross-sectional alpha)")
         freq_res = st.sidebar.selectbox("Freq", ["5min", "15min", "1h", "1D"], index=2, key="res_freq")
         try:
-            returns_df_res, meta_df_res = get_research_assets(db_path_str, freq_res, include_spot=True)
+            returns_df_res, meta_df_res = _cached_research_assets(freq_res, db_path_str, True, _db_mtime(db_path_str))
         except Exception as e:
             returns_df_res = pd.DataFrame()
             meta_df_res = pd.DataFrame()
@@ -1054,6 +1211,16 @@ def main():
             _meta_dict_res = {}  # noqa: F841
         else:
             _meta_dict_res = meta_df_res.set_index("asset_id")["label"].to_dict() if not meta_df_res.empty else {}  # noqa: F841
+        # Every tab body runs on each rerun, so the momentum signal, its ranks and the default 3/3 L/S book are
+        # built once here and shared by the IC, decay, portfolio and regime tabs.
+        sig_mom_res = ranks_res = pd.DataFrame()
+        port_ret_3x3 = pd.Series(dtype=float)
+        weights_3x3 = pd.DataFrame()
+        if n_assets >= 3 and not returns_df_res.empty:
+            sig_mom_res = calc_signal_momentum_24h(returns_df_res, freq_res)
+            ranks_res = calc_rank_signal_df(sig_mom_res)
+            weights_3x3 = long_short_from_ranks(ranks_res, 3, 3, gross_leverage=1.0)
+            port_ret_3x3 = portfolio_returns_from_weights(weights_3x3, returns_df_res).dropna()
         tab_univ, tab_ic, tab_decay, tab_port, tab_regime = st.tabs(
             ["Universe", "IC Summary", "IC Decay", "Portfolio", "Regime Conditioning"]
         )
@@ -1067,7 +1234,6 @@ def main():
         with tab_ic:
             st.subheader("IC Summary")
             if n_assets >= 3 and not returns_df_res.empty:
-                sig_mom_res = calc_signal_momentum_24h(returns_df_res, freq_res)
                 if not sig_mom_res.empty:
                     fwd1 = compute_forward_returns(returns_df_res, 1)
                     ic_ts_res = information_coefficient(sig_mom_res, fwd1, method="spearman")
@@ -1076,7 +1242,9 @@ def main():
                     if not ic_ts_res.empty and ic_ts_res.notna().any():
                         fig_ic = go.Figure()
                         fig_ic.add_trace(
-                            go.Scatter(x=ic_ts_res.dropna().index, y=ic_ts_res.dropna().values, name="IC", mode="lines")
+                            go.Scattergl(
+                                x=ic_ts_res.dropna().index, y=ic_ts_res.dropna().values, name="IC", mode="lines"
+                            )
                         )
                         fig_ic.update_layout(title="IC over time (momentum_24h vs fwd 1-bar)", height=300)
                         st_plot(fig_ic, use_container_width=True)
@@ -1087,7 +1255,6 @@ def main():
         with tab_decay:
             st.subheader("IC Decay")
             if n_assets >= 3 and not returns_df_res.empty:
-                sig_mom_res = calc_signal_momentum_24h(returns_df_res, freq_res)
                 horizons_res = [1, 2, 3, 6, 12, 24]
                 decay_df_res = ic_decay(sig_mom_res, returns_df_res, horizons_res, method="spearman")
                 if not decay_df_res.empty:
@@ -1112,10 +1279,11 @@ def main():
             if n_assets >= 3 and not returns_df_res.empty:
                 top_k = st.number_input("Top K", value=3, min_value=1, max_value=10, step=1, key="res_topk")
                 bot_k = st.number_input("Bottom K", value=3, min_value=1, max_value=10, step=1, key="res_botk")
-                sig_mom_res = calc_signal_momentum_24h(returns_df_res, freq_res)
-                ranks_res = calc_rank_signal_df(sig_mom_res)
-                weights_res = long_short_from_ranks(ranks_res, int(top_k), int(bot_k), gross_leverage=1.0)
-                port_ret_res = portfolio_returns_from_weights(weights_res, returns_df_res).dropna()
+                if (int(top_k), int(bot_k)) == (3, 3):
+                    weights_res, port_ret_res = weights_3x3, port_ret_3x3
+                else:
+                    weights_res = long_short_from_ranks(ranks_res, int(top_k), int(bot_k), gross_leverage=1.0)
+                    port_ret_res = portfolio_returns_from_weights(weights_res, returns_df_res).dropna()
                 turnover_res = turnover_from_weights(weights_res)
                 fee_bps = 30.0
                 slip_bps = 10.0
@@ -1124,13 +1292,12 @@ def main():
                 )
                 if len(port_net_res) >= 2:
                     summ_res = significance_summary(port_net_res, freq_res)
-                    eq_res = (1 + port_net_res).cumprod()
-                    dd_res = eq_res.cummax() - eq_res
+                    eq_res = pd.Series(fastkernels.cum_return(port_net_res.to_numpy()) + 1.0, index=port_net_res.index)
                     st.metric("Sharpe (net)", f"{summ_res['sharpe_annual']:.3f}")
-                    st.metric("Max DD", f"{dd_res.max():.3f}")
+                    st.metric("Max DD", f"{fastkernels.max_drawdown(eq_res.to_numpy()):.3f}")
                     st.metric("Avg turnover", f"{turnover_res.mean():.3f}")
                     fig_eq = go.Figure()
-                    fig_eq.add_trace(go.Scatter(x=eq_res.index, y=eq_res.values, name="Equity", mode="lines"))
+                    fig_eq.add_trace(go.Scattergl(x=eq_res.index, y=eq_res.values, name="Equity", mode="lines"))
                     fig_eq.update_layout(title="L/S momentum equity", height=300)
                     st_plot(fig_eq, use_container_width=True)
                 else:
@@ -1140,27 +1307,22 @@ def main():
         with tab_regime:
             st.subheader("Regime conditioning")
             if n_assets >= 3 and not returns_df_res.empty:
-                disp_ser = compute_dispersion_series(returns_df_res)
-                disp_z_ser = dispersion_zscore_series(disp_ser, 24) if len(disp_ser) >= 24 else pd.Series(dtype=float)
-                sig_mom_res = calc_signal_momentum_24h(returns_df_res, freq_res)
-                ranks_res = calc_rank_signal_df(sig_mom_res)
-                weights_res = long_short_from_ranks(ranks_res, 3, 3, gross_leverage=1.0)
-                port_ret_res = portfolio_returns_from_weights(weights_res, returns_df_res).dropna()
-                common_r = port_ret_res.index.intersection(disp_z_ser.index)
+                _, disp_z_ser = _cached_research_dispersion(freq_res, db_path_str, True, _db_mtime(db_path_str))
+                common_r = port_ret_3x3.index.intersection(disp_z_ser.index)
                 if len(common_r) >= 10:
-                    port_r = port_ret_res.loc[common_r]
+                    port_r = port_ret_3x3.loc[common_r]
                     z_r = disp_z_ser.reindex(common_r).ffill().bfill()
                     high = (z_r > 1).fillna(False)
                     low = (z_r < -1).fillna(False)
                     mid = (~high & ~low).fillna(False)
+                    sqrt_bpy_res = _SQRT_BARS_PER_YEAR[freq_res]
                     rows_r = []
                     for label, mask in [("z > +1", high), ("z in [-1,+1]", mid), ("z < -1", low)]:
                         r = port_r.loc[mask]
-                        if len(r) >= 2 and r.std() and r.std() != 0:
-                            sh = float(r.mean() / r.std() * np.sqrt(bars_per_year(freq_res)))
-                            rows_r.append(
-                                {"regime": label, "n_bars": len(r), "mean_ret": r.mean(), "sharpe_approx": sh}
-                            )
+                        mean_r, std_r = r.mean(), r.std()
+                        if len(r) >= 2 and std_r and std_r != 0:
+                            sh = float(mean_r / std_r * sqrt_bpy_res)
+                            rows_r.append({"regime": label, "n_bars": len(r), "mean_ret": mean_r, "sharpe_approx": sh})
                     if rows_r:
                         st_df(pd.DataFrame(rows_r).round(4))
                     else:
@@ -1172,26 +1334,62 @@ def main():
 
     elif page == "Institutional Research":
         st.header("Institutional Research (M4)")
+        # Only the selected section is built on each rerun (st.tabs would run every tab body).
+        inst_sections = [
+            "Signal Hygiene",
+            "Advanced Portfolio",
+            "Overfitting Defenses",
+            "Conditional Performance",
+            "Experiments",
+        ]
+        inst_tab = (
+            st.segmented_control(
+                "Section", inst_sections, default=inst_sections[0], key="inst_tab", label_visibility="collapsed"
+            )
+            or inst_sections[0]
+        )
         try:
-            returns_inst, meta_inst = get_research_assets(db_path_str, "1h", include_spot=True)
+            returns_inst, meta_inst = _cached_research_assets("1h", db_path_str, True, _db_mtime(db_path_str))
         except Exception as e:
             returns_inst = pd.DataFrame()
             meta_inst = pd.DataFrame()
             st.warning(f"Universe load failed: {e}")
         n_inst = returns_inst.shape[1] if not returns_inst.empty else 0
         meta_dict_inst = meta_inst.set_index("asset_id")["label"].to_dict() if not meta_inst.empty else {}
-        factor_inst = get_factor_returns(returns_inst, meta_dict_inst, db_path_str, "1h") if meta_dict_inst else None
-
-        tab_hygiene, tab_adv_port, tab_overfit, tab_cond, tab_exp = st.tabs(
-            ["Signal Hygiene", "Advanced Portfolio", "Overfitting Defenses", "Conditional Performance", "Experiments"]
+        factor_inst = (
+            _cached_research_factor("1h", db_path_str, True, _db_mtime(db_path_str)) if meta_dict_inst else None
         )
-        with tab_hygiene:
+        # momentum_24h, its ranks and the 3/3 L/S net-of-cost book are shared by the hygiene, portfolio, overfitting
+        # and conditional sections. A failure is kept and re-raised inside the section that needs the result so it
+        # still surfaces through that section's own st.error.
+        sig_mom_i = ranks_i = pd.DataFrame()
+        port_net_i = pd.Series(dtype=float)
+        sig_exc_i = book_exc_i = None
+        if n_inst >= 2 and inst_tab != "Experiments":
+            try:
+                sig_mom_i = calc_signal_momentum_24h(returns_inst, "1h")
+                ranks_i = calc_rank_signal_df(sig_mom_i) if not sig_mom_i.empty else pd.DataFrame()
+            except Exception as e:
+                sig_exc_i = e
+            if sig_exc_i is None and not sig_mom_i.empty:
+                try:
+                    weights_i = long_short_from_ranks(ranks_i, 3, 3, gross_leverage=1.0)
+                    port_ret_i = portfolio_returns_from_weights(weights_i, returns_inst).dropna()
+                    turnover_i = turnover_from_weights(weights_i)
+                    port_net_i = apply_costs_to_portfolio(
+                        port_ret_i, turnover_i.reindex(port_ret_i.index).fillna(0), 30, 10
+                    )
+                except Exception as e:
+                    book_exc_i = e
+
+        if inst_tab == "Signal Hygiene":
             st.subheader("Signal Hygiene (cross-corr before/after)")
             if n_inst < 2:
                 st.info("Need at least 2 assets for cross-sectional hygiene. Add more DEX pairs.")
             else:
                 try:
-                    sig_mom_i = calc_signal_momentum_24h(returns_inst, "1h")
+                    if sig_exc_i is not None:
+                        raise sig_exc_i
                     sig_clean_i = (
                         clean_momentum(returns_inst, "1h", factor_inst) if not returns_inst.empty else pd.DataFrame()
                     )
@@ -1214,17 +1412,17 @@ def main():
                         st.write("Need at least 2 signals for orthogonalization.")
                 except Exception as e:
                     st.error(str(e))
-        with tab_adv_port:
+        if inst_tab == "Advanced Portfolio":
             st.subheader("Advanced Portfolio (constraints, diagnostics)")
             if n_inst < 2:
                 st.info("Need at least 2 assets for advanced portfolio.")
             else:
                 try:
-                    sig_mom_i = calc_signal_momentum_24h(returns_inst, "1h")
+                    if sig_exc_i is not None:
+                        raise sig_exc_i
                     if sig_mom_i.empty:
                         st.write("No signal.")
                     else:
-                        ranks_i = calc_rank_signal_df(sig_mom_i)
                         last_t = ranks_i.index[-1] if len(ranks_i) else None
                         if last_t is None:
                             st.write("No timestamps.")
@@ -1259,70 +1457,52 @@ def main():
                                 st_df(w_df)
                 except Exception as e:
                     st.error(str(e))
-        with tab_overfit:
+        if inst_tab == "Overfitting Defenses":
             st.subheader("Overfitting Defenses")
             if n_inst < 2:
                 st.info("Need at least 2 assets.")
             else:
                 try:
-                    sig_mom_i = calc_signal_momentum_24h(returns_inst, "1h")
+                    if sig_exc_i is not None or book_exc_i is not None:
+                        raise sig_exc_i or book_exc_i
                     if sig_mom_i.empty:
                         st.write("No signal.")
-                    else:
-                        ranks_i = calc_rank_signal_df(sig_mom_i)
-                        weights_i = long_short_from_ranks(ranks_i, 3, 3, gross_leverage=1.0)
-                        port_ret_i = portfolio_returns_from_weights(weights_i, returns_inst).dropna()
-                        turnover_i = turnover_from_weights(weights_i)
-                        port_net_i = apply_costs_to_portfolio(
-                            port_ret_i, turnover_i.reindex(port_ret_i.index).fillna(0), 30, 10
+                    elif len(port_net_i) >= 10:
+                        dsr = deflated_sharpe_ratio(port_net_i, "1h", 50, skew_kurtosis_optional=True)
+                        st_df(pd.DataFrame([dsr]).T)
+                        st.caption("Deflated Sharpe (n_trials=50). Use for research screening only.")
+                        st.info(reality_check_warning(3, 1))
+                        wf_df = pd.DataFrame(
+                            [
+                                {
+                                    "train_sharpe": np.nan,
+                                    "test_sharpe": float(port_net_i.mean() / port_net_i.std())
+                                    if port_net_i.std() and port_net_i.std() > 0
+                                    else np.nan,
+                                }
+                            ]
                         )
-                        if len(port_net_i) >= 10:
-                            dsr = deflated_sharpe_ratio(port_net_i, "1h", 50, skew_kurtosis_optional=True)
-                            st_df(pd.DataFrame([dsr]).T)
-                            st.caption("Deflated Sharpe (n_trials=50). Use for research screening only.")
-                            st.info(reality_check_warning(3, 1))
-                            wf_df = pd.DataFrame(
-                                [
-                                    {
-                                        "train_sharpe": np.nan,
-                                        "test_sharpe": float(port_net_i.mean() / port_net_i.std())
-                                        if port_net_i.std() and port_net_i.std() > 0
-                                        else np.nan,
-                                    }
-                                ]
-                            )
-                            pbo = pbo_proxy_walkforward(wf_df)
-                            st.write("PBO proxy:", pbo.get("pbo_proxy", np.nan), "—", pbo.get("explanation", ""))
-                        else:
-                            st.write("Insufficient pnl for deflated Sharpe.")
+                        pbo = pbo_proxy_walkforward(wf_df)
+                        st.write("PBO proxy:", pbo.get("pbo_proxy", np.nan), "—", pbo.get("explanation", ""))
+                    else:
+                        st.write("Insufficient pnl for deflated Sharpe.")
                 except Exception as e:
                     st.error(str(e))
-        with tab_cond:
+        if inst_tab == "Conditional Performance":
             st.subheader("Conditional Performance (regime)")
             if n_inst < 2:
                 st.info("Need at least 2 assets.")
             else:
                 try:
-                    disp_ser = compute_dispersion_series(returns_inst)
-                    disp_z_ser = (
-                        dispersion_zscore_series(disp_ser, 24) if len(disp_ser) >= 24 else pd.Series(dtype=float)
-                    )
-                    regime_ser = (
-                        disp_z_ser.apply(lambda z: "high_disp" if z > 1 else ("low_disp" if z < -1 else "mid"))
-                        if not disp_z_ser.empty
-                        else pd.Series(dtype=str)
-                    )
-                    sig_mom_i = calc_signal_momentum_24h(returns_inst, "1h")
+                    _, disp_z_ser = _cached_research_dispersion("1h", db_path_str, True, _db_mtime(db_path_str))
+                    regime_ser = dispersion_regime_labels(disp_z_ser) if not disp_z_ser.empty else pd.Series(dtype=str)
+                    if sig_exc_i is not None:
+                        raise sig_exc_i
                     if sig_mom_i.empty or regime_ser.empty:
                         st.write("No signal or regime.")
                     else:
-                        ranks_i = calc_rank_signal_df(sig_mom_i)
-                        weights_i = long_short_from_ranks(ranks_i, 3, 3, gross_leverage=1.0)
-                        port_ret_i = portfolio_returns_from_weights(weights_i, returns_inst).dropna()
-                        turnover_i = turnover_from_weights(weights_i)
-                        port_net_i = apply_costs_to_portfolio(
-                            port_ret_i, turnover_i.reindex(port_ret_i.index).fillna(0), 30, 10
-                        )
+                        if book_exc_i is not None:
+                            raise book_exc_i
                         cm = conditional_metrics(port_net_i, regime_ser)
                         if not cm.empty:
                             st_df(cm.round(4))
@@ -1330,13 +1510,11 @@ def main():
                             st.write("No regime breakdown.")
                 except Exception as e:
                     st.error(str(e))
-        with tab_exp:
+        if inst_tab == "Experiments":
             st.subheader("Experiments (past runs — legacy CSV)")
             try:
-                from crypto_analyzer.experiments import load_experiments as _load_exp_csv
-
                 exp_dir = Path("reports/experiments")
-                df_exp = _load_exp_csv(str(exp_dir))
+                df_exp = load_experiments(str(exp_dir))
                 if df_exp.empty:
                     st.info("No experiments logged. Run research_report_v2.py to log.")
                 else:
@@ -1360,22 +1538,6 @@ def main():
         if not os.path.isfile(exp_db):
             st.info("No experiment database found. Run `reportv2` first to record experiments.")
         else:
-            from crypto_analyzer.experiments import (
-                load_distinct_metric_names as load_mnames,
-            )
-            from crypto_analyzer.experiments import (
-                load_experiment_metrics as load_exp_metrics,
-            )
-            from crypto_analyzer.experiments import (
-                load_experiments as load_exp_db,
-            )
-            from crypto_analyzer.experiments import (
-                load_experiments_filtered as load_exp_filtered,
-            )
-            from crypto_analyzer.experiments import (
-                load_metric_history as load_mhist,
-            )
-
             tab_runs, tab_compare, tab_hist = st.tabs(["Run List", "Compare Runs", "Metric History"])
 
             with tab_runs:
@@ -1389,9 +1551,9 @@ def main():
                 search_val = filter_search.strip() if filter_search.strip() else None
                 try:
                     if tag_val or search_val:
-                        df_runs = load_exp_filtered(exp_db, tag=tag_val, search=search_val, limit=200)
+                        df_runs = load_experiments_filtered(exp_db, tag=tag_val, search=search_val, limit=200)
                     else:
-                        df_runs = load_exp_db(exp_db, limit=200)
+                        df_runs = load_experiments(exp_db, limit=200)
                 except Exception:
                     df_runs = pd.DataFrame()
                 if df_runs.empty:
@@ -1401,7 +1563,7 @@ def main():
                     for _, row in df_runs.iterrows():
                         r = row.to_dict()
                         try:
-                            metrics = load_exp_metrics(exp_db, row["run_id"])
+                            metrics = load_experiment_metrics(exp_db, row["run_id"])
                         except Exception:
                             metrics = pd.DataFrame()
                         if not metrics.empty:
@@ -1448,7 +1610,7 @@ def main():
             with tab_compare:
                 st.subheader("Compare two runs")
                 try:
-                    df_runs = load_exp_db(exp_db, limit=200)
+                    df_runs = load_experiments(exp_db, limit=200)
                 except Exception:
                     df_runs = pd.DataFrame()
                 if df_runs.empty or len(df_runs) < 1:
@@ -1470,8 +1632,8 @@ def main():
                             key="cmp_b",
                         )
                     try:
-                        metrics_a = load_exp_metrics(exp_db, run_ids[idx_a])
-                        metrics_b = load_exp_metrics(exp_db, run_ids[idx_b])
+                        metrics_a = load_experiment_metrics(exp_db, run_ids[idx_a])
+                        metrics_b = load_experiment_metrics(exp_db, run_ids[idx_b])
                     except Exception:
                         metrics_a = metrics_b = pd.DataFrame()
                     if metrics_a.empty and metrics_b.empty:
@@ -1497,7 +1659,7 @@ def main():
             with tab_hist:
                 st.subheader("Metric history across runs")
                 try:
-                    mnames = load_mnames(exp_db)
+                    mnames = load_distinct_metric_names(exp_db)
                 except Exception:
                     mnames = []
                 if not mnames:
@@ -1505,7 +1667,7 @@ def main():
                 else:
                     sel_metric = st.selectbox("Metric", mnames, key="hist_metric")
                     try:
-                        hist_df = load_mhist(exp_db, sel_metric, limit=500)
+                        hist_df = load_metric_history(exp_db, sel_metric, limit=500)
                     except Exception:
                         hist_df = pd.DataFrame()
                     if hist_df.empty:
@@ -1539,17 +1701,6 @@ def main():
             key="prom_db_path",
         )
         try:
-            import sqlite3
-
-            from crypto_analyzer.promotion.gating import ThresholdConfig
-            from crypto_analyzer.promotion.service import evaluate_and_record
-            from crypto_analyzer.promotion.store_sqlite import (
-                get_candidate,
-                get_events,
-                list_candidates,
-                update_status,
-            )
-
             if not prom_db or not Path(prom_db).is_file():
                 st.info("Set a valid DB path. Apply run_migrations_phase3 to that DB to create promotion tables.")
             else:
@@ -1765,13 +1916,10 @@ def main():
                     freshness = None
                     if h.last_ok_at:
                         try:
-                            from datetime import datetime as dt_cls
-                            from datetime import timezone as tz_cls
-
-                            last_ok = dt_cls.fromisoformat(h.last_ok_at)
+                            last_ok = datetime.fromisoformat(h.last_ok_at)
                             if last_ok.tzinfo is None:
-                                last_ok = last_ok.replace(tzinfo=tz_cls.utc)
-                            age_s = (dt_cls.now(tz_cls.utc) - last_ok).total_seconds()
+                                last_ok = last_ok.replace(tzinfo=timezone.utc)
+                            age_s = (datetime.now(timezone.utc) - last_ok).total_seconds()
                             if age_s < 120:
                                 freshness = f"{age_s:.0f}s ago"
                             elif age_s < 7200:
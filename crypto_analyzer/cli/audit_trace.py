@@ -16,6 +16,15 @@ from typing import List, Optional
 
 from crypto_analyzer.governance.audit import trace_acceptance
 
+# Read-side SQLite tuning: refuse writes, large page cache + mmap for the lineage/event joins, temp B-trees in
+# memory. journal_mode is left alone (changing it would write the DB header).
+SQLITE_READ_PRAGMAS = """
+PRAGMA query_only=1;
+PRAGMA cache_size=-200000;
+PRAGMA mmap_size=268435456;
+PRAGMA temp_store=MEMORY;
+"""
+
 
 def _get_db_path(args: argparse.Namespace) -> str:
     if getattr(args, "db", None):
@@ -53,6 +62,7 @@ def cmd_trace_acceptance(args: argparse.Namespace) -> int:
         return 1
 
     conn = sqlite3.connect(db_path)
+    conn.executescript(SQLITE_READ_PRAGMAS)
     conn.row_factory = sqlite3.Row
     try:
         cur = conn.execute("SELECT status FROM promotion_candidates WHERE candidate_id = ?", (candidate_id,))
@@ -93,17 +103,8 @@ def cmd_trace_acceptance(args: argparse.Namespace) -> int:
     }
 
     if getattr(args, "json", False):
-
-        def _serialize(obj):
-            if isinstance(obj, dict):
-                return {k: _serialize(v) for k, v in obj.items()}
-            if isinstance(obj, (list, tuple)):
-                return [_serialize(x) for x in obj]
-            if hasattr(obj, "keys"):
-                return dict(obj)
-            return obj
-
-        print(json.dumps(_serialize(out), indent=2, default=str))
+        # trace_acceptance already returns events and lineage as lists of plain dicts (dict(zip(cols, row)))
+        print(json.dumps(out, indent=2, default=str))
     else:
         print(f"Candidate ID: {trace.candidate_id}")
         print(f"Eligibility report ID: {trace.eligibility_report_id}")
@@ -12,18 +12,8 @@ import sys
 from pathlib import Path
 from typing import List, Optional
 
-import numpy as np
-
-# Backtest logic lives in library; CLI is thin wrapper
-from crypto_analyzer.backtest_core import (
-    DEFAULT_FEE_BPS,
-    metrics,
-    run_trend_strategy,
-    run_vol_breakout_strategy,
-)
 from crypto_analyzer.config import db_path, default_freq
 from crypto_analyzer.config import min_bars as config_min_bars
-from crypto_analyzer.data import load_bars
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -33,7 +23,9 @@ def main(argv: Optional[List[str]] = None) -> int:
     ap.add_argument("--strategy", choices=["trend", "volatility_breakout"], default="trend")
     ap.add_argument("--db", default=None)
     ap.add_argument("--freq", default=None)
-    ap.add_argument("--fee-bps", type=float, default=DEFAULT_FEE_BPS)
+    ap.add_argument(
+        "--fee-bps", type=float, default=None, help="Fee bps per trade (default: backtest_core.DEFAULT_FEE_BPS)"
+    )
     ap.add_argument(
         "--slippage-bps", type=float, default=None, help="Fixed slippage bps per trade (default: liquidity-based proxy)"
     )
@@ -42,6 +34,21 @@ def main(argv: Optional[List[str]] = None) -> int:
     ap.add_argument("--plot", default=None, metavar="DIR", help="Save equity and drawdown plots to DIR")
     args = ap.parse_args(argv)
 
+    # Backtest logic lives in library; CLI is thin wrapper. Imported after parsing (numpy/pandas/numba come with
+    # it) so --help stays fast.
+    import numpy as np
+
+    from crypto_analyzer.backtest_core import (
+        DEFAULT_FEE_BPS,
+        metrics,
+        run_trend_strategy,
+        run_vol_breakout_strategy,
+    )
+    from crypto_analyzer.data import load_bars
+    from crypto_analyzer.features import drawdown
+
+    if args.fee_bps is None:
+        args.fee_bps = DEFAULT_FEE_BPS
     db = args.db or (db_path() if callable(db_path) else db_path())
     freq = args.freq or (default_freq() if callable(default_freq) else "1h")
     min_bars_count = config_min_bars() if callable(config_min_bars) else 48
@@ -57,20 +64,24 @@ def main(argv: Optional[List[str]] = None) -> int:
         print("No bars. Run materialize_bars.py first.")
         return 1
 
-    # Gross (no costs) and net (with costs)
+    # Net (with costs) and gross (pre-cost) equity from a single pass
     if args.strategy == "trend":
-        _, equity_gross = run_trend_strategy(
-            bars, freq, fee_bps=0, position_pct=args.position_pct, slippage_bps_fixed=0
-        )
-        trades_df, equity = run_trend_strategy(
-            bars, freq, fee_bps=args.fee_bps, position_pct=args.position_pct, slippage_bps_fixed=args.slippage_bps
+        trades_df, equity, equity_gross = run_trend_strategy(
+            bars,
+            freq,
+            fee_bps=args.fee_bps,
+            position_pct=args.position_pct,
+            slippage_bps_fixed=args.slippage_bps,
+            return_gross=True,
         )
     else:
-        _, equity_gross = run_vol_breakout_strategy(
-            bars, freq, fee_bps=0, position_pct=args.position_pct, slippage_bps_fixed=0
-        )
-        trades_df, equity = run_vol_breakout_strategy(
-            bars, freq, fee_bps=args.fee_bps, position_pct=args.position_pct, slippage_bps_fixed=args.slippage_bps
+        trades_df, equity, equity_gross = run_vol_breakout_strategy(
+            bars,
+            freq,
+            fee_bps=args.fee_bps,
+            position_pct=args.position_pct,
+            slippage_bps_fixed=args.slippage_bps,
+            return_gross=True,
         )
 
     if equity.empty:
@@ -102,19 +113,25 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"Trades written to {args.csv}")
 
     if args.plot:
+        import matplotlib
+
+        matplotlib.use("Agg")
         import matplotlib.pyplot as plt
 
+        from crypto_analyzer.ui import downsample_minmax
+
+        # ~960 px wide at dpi=150: min/max per pixel column draws the same image as every point, much faster.
         Path(args.plot).mkdir(parents=True, exist_ok=True)
         fig, ax = plt.subplots(1, 1)
-        equity.plot(ax=ax)
+        downsample_minmax(equity, max_points=2000).plot(ax=ax)
         ax.set_title(f"Equity curve — {args.strategy} ({freq})")
         ax.set_ylabel("Equity")
         plt.tight_layout()
         plt.savefig(Path(args.plot) / "equity.png", dpi=150)
         plt.close()
         fig, ax = plt.subplots(1, 1)
-        dd = equity.cummax() - equity
-        dd.plot(ax=ax)
+        dd = drawdown(equity)
+        downsample_minmax(dd, max_points=2000).plot(ax=ax)
         ax.set_title(f"Drawdown — {args.strategy} ({freq})")
         ax.set_ylabel("Drawdown")
         plt.tight_layout()
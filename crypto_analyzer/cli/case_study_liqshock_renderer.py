@@ -63,27 +63,28 @@ def _top10_valuable_pairs(
     cols = returns_df.columns
     liq = liquidity_panel.reindex(index=oos_index, columns=cols)
     raw_z = _raw_z_pre_negation(liquidity_panel, oos_index, cols)
-    rows: list[dict[str, Any]] = []
-    for c in cols:
-        s = liq[c]
-        median_liq = float(s.median())
-        p10 = float(s.quantile(0.10)) if s.notna().any() else 0.0
-        total = len(s)
-        missing_or_zero_pct = 100.0 * ((~s.notna()) | (s <= 0)).sum() / total if total else 100.0
-        zc = raw_z[c]
-        extreme = (zc < -2).sum()
-        event_rate = float(extreme / total) if total else 0.0
-        rows.append(
-            {
-                "pair": str(c),
-                "median_liquidity_usd": median_liq,
-                "p10_liquidity_usd": p10,
-                "missing_pct": missing_or_zero_pct,
-                "event_rate": event_rate,
-                "opportunity_score": event_rate * median_liq if np.isfinite(median_liq) else 0.0,
-            }
-        )
-    df = pd.DataFrame(rows)
+    # One axis-0 reduction per statistic over all pairs instead of scalar reducers per column
+    total = len(liq)
+    median_liq = liq.median(axis=0)
+    p10 = liq.quantile(0.10, axis=0).fillna(0.0)  # NaN only for all-missing columns
+    if total:
+        missing_or_zero_pct = 100.0 * (liq.isna() | (liq <= 0)).sum(axis=0) / total
+        event_rate = (raw_z < -2).sum(axis=0) / total
+    else:
+        missing_or_zero_pct = pd.Series(100.0, index=cols)
+        event_rate = pd.Series(0.0, index=cols)
+    df = pd.DataFrame(
+        {
+            "pair": cols.astype(str),
+            "median_liquidity_usd": median_liq.to_numpy(dtype=float),
+            "p10_liquidity_usd": p10.to_numpy(dtype=float),
+            "missing_pct": missing_or_zero_pct.to_numpy(dtype=float),
+            "event_rate": event_rate.to_numpy(dtype=float),
+        }
+    )
+    df["opportunity_score"] = (df["event_rate"] * df["median_liquidity_usd"]).where(
+        np.isfinite(df["median_liquidity_usd"]), 0.0
+    )
     if df.empty:
         return []
     # Eligibility
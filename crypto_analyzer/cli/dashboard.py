@@ -7,7 +7,7 @@ import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import List, Optional
 
 import numpy as np
 import pandas as pd
@@ -16,6 +16,8 @@ import plotly.graph_objects as go
 import streamlit as st
 from streamlit_autorefresh import st_autorefresh
 
+from crypto_analyzer.fastkernels import cum_return, rolling_std, sharpe_sortino_columns
+
 try:
     from st_keyup import st_keyup
 except ImportError:
@@ -29,6 +31,16 @@ DB_PATH_DEFAULT = str(Path(__file__).resolve().parents[2] / "dex_data.sqlite")
 SOL_MONITOR_TABLE = "sol_monitor_snapshots"
 SPOT_TABLE = "spot_price_snapshots"
 
+# Read-side SQLite tuning: WAL so the poller can append while the dashboard reads, large page cache +
+# mmap for the full snapshot scans, temp B-trees (ORDER BY / window sorts) in memory.
+SQLITE_READ_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-200000;
+PRAGMA mmap_size=268435456;
+PRAGMA temp_store=MEMORY;
+"""
+
 # All displayed timestamps in Central Time (CST/CDT)
 DISPLAY_TZ = "America/Chicago"
 
@@ -36,27 +48,6 @@ DISPLAY_TZ = "America/Chicago"
 # -----------------------------
 # Quant helpers
 # -----------------------------
-def sharpe_ratio(r: pd.Series, periods_per_year: float) -> float:
-    r = r.dropna()
-    if r.empty:
-        return float("nan")
-    s = r.std(ddof=1)
-    if s == 0 or np.isnan(s):
-        return float("nan")
-    return float((r.mean() / s) * np.sqrt(periods_per_year))
-
-
-def sortino_ratio(r: pd.Series, periods_per_year: float) -> float:
-    r = r.dropna()
-    if r.empty:
-        return float("nan")
-    downside = r.clip(upper=0)
-    dd = np.sqrt((downside**2).mean())
-    if dd == 0 or np.isnan(dd):
-        return float("nan")
-    return float((r.mean() / dd) * np.sqrt(periods_per_year))
-
-
 def downside_deviation(r: pd.Series, periods_per_year: float) -> float:
     r = r.dropna()
     if r.empty:
@@ -142,17 +133,18 @@ def resample_prices_wide(spot_df: pd.DataFrame, freq: str) -> pd.DataFrame:
     spot_df["spot_price_usd"] = pd.to_numeric(spot_df["spot_price_usd"], errors="coerce")
     spot_df = spot_df.dropna(subset=["spot_price_usd"])
 
-    out: Dict[str, pd.Series] = {}
-    for sym in sorted(spot_df["symbol"].unique().tolist()):
-        sub = spot_df[spot_df["symbol"] == sym].set_index("ts_utc").sort_index()
-        s = sub["spot_price_usd"].resample(freq).last().dropna()
-        if len(s) >= 2:
-            out[sym] = s
-
-    if not out:
+    # One grouped pass (bucket x symbol) instead of a boolean-mask filter and resample per symbol.
+    wide = (
+        spot_df.sort_values("ts_utc", kind="stable")
+        .groupby([pd.Grouper(key="ts_utc", freq=freq), "symbol"])["spot_price_usd"]
+        .last()
+        .unstack("symbol")
+    )
+    wide = wide.loc[:, wide.count() >= 2].rename_axis(columns=None)
+    if wide.shape[1] == 0:
         return pd.DataFrame()
 
-    return pd.DataFrame(out).dropna(how="any")  # inner-join alignment
+    return wide.dropna(how="any")  # inner-join alignment
 
 
 def resample_liquidity(sol_df: pd.DataFrame, freq: str) -> pd.Series:
@@ -499,6 +491,7 @@ def fig_style(fig: go.Figure, title: str, height: int = 430) -> go.Figure:
 conn = None
 try:
     conn = sqlite3.connect(db_path)
+    conn.executescript(SQLITE_READ_PRAGMAS)
     tables = load_tables(conn)
 
     if SOL_MONITOR_TABLE not in tables:
@@ -552,8 +545,10 @@ st.caption(
 symbols = list(prices_wide.columns)
 
 rets = prices_wide.pct_change()
-cum = (1.0 + rets.fillna(0)).cumprod() - 1.0
-roll_vol = rets.rolling(roll_window).std(ddof=1) * np.sqrt(periods_per_year)
+cum = pd.DataFrame(cum_return(rets.to_numpy()), index=rets.index, columns=rets.columns)
+roll_vol = pd.DataFrame(
+    rolling_std(rets.to_numpy(), roll_window, scale=np.sqrt(periods_per_year)), index=rets.index, columns=rets.columns
+)
 
 downside = rets.clip(upper=0)
 roll_down_dev = downside.rolling(roll_window).apply(lambda x: np.sqrt((x * x).mean()), raw=True) * np.sqrt(
@@ -572,7 +567,9 @@ if "SOL" in symbols and "BTC" in symbols:
         beta_static = float(cov / var) if var and not np.isnan(var) else float("nan")
 
 sol_vol_for_regime = (
-    rets["SOL"].rolling(regime_window).std(ddof=1) * np.sqrt(periods_per_year) if "SOL" in symbols else None
+    pd.Series(rolling_std(rets["SOL"].to_numpy(), regime_window, scale=np.sqrt(periods_per_year)), index=rets.index)
+    if "SOL" in symbols
+    else None
 )
 regime_df = add_regime_from_percentile(sol_vol_for_regime) if sol_vol_for_regime is not None else pd.DataFrame()
 
@@ -700,13 +697,14 @@ elif page == "RISK":
     st.markdown("#### Ratio snapshot (gated)")
     if len(prices_wide) >= min_ratio_points:
         rows = []
-        for sym in symbols:
+        sharpe_cols, sortino_cols = sharpe_sortino_columns(rets[symbols].to_numpy(), periods_per_year)
+        for i, sym in enumerate(symbols):
             rr = rets[sym]
             rows.append(
                 {
                     "symbol": sym,
-                    "sharpe": sharpe_ratio(rr, periods_per_year),
-                    "sortino": sortino_ratio(rr, periods_per_year),
+                    "sharpe": float(sharpe_cols[i]),
+                    "sortino": float(sortino_cols[i]),
                     "downside_dev": downside_deviation(rr, periods_per_year),
                     "vol_ann": float(rr.std(ddof=1) * np.sqrt(periods_per_year)),
                 }
@@ -795,7 +793,9 @@ elif page == "DEX ↔ VOL":
     if "SOL" not in symbols:
         st.warning("SOL not present.")
     else:
-        sol_vol = rets["SOL"].rolling(roll_window).std(ddof=1) * np.sqrt(periods_per_year)
+        sol_vol = pd.Series(
+            rolling_std(rets["SOL"].to_numpy(), roll_window, scale=np.sqrt(periods_per_year)), index=rets.index
+        )
 
         scatter_df = pd.DataFrame({"liq_usd": liq, "sol_vol_ann": sol_vol, "sol_return": rets["SOL"]}).dropna()
         if not regime_df.empty and "regime" in regime_df.columns:
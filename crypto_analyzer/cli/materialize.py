@@ -17,7 +17,7 @@ import pandas as pd
 
 from crypto_analyzer.config import bars_freqs, db_path
 from crypto_analyzer.data import load_bars, load_snapshots
-from crypto_analyzer.features import cumulative_returns_log, log_returns, rolling_volatility
+from crypto_analyzer.features import cumulative_returns_log, log_returns, resample_ohlc, rolling_volatility
 
 
 def _bars_table_schema(table: str) -> str:
@@ -60,23 +60,18 @@ def _resample_pair(
     Reasons: "insufficient_bars", "nan_or_negative", "ok".
     """
     min_bars = max(2, window + 1)
-    g = g.sort_values("ts_utc").set_index("ts_utc")
-    price = g["price_usd"]
-    ohlc = price.resample(freq).ohlc()
-    ohlc.columns = ["open", "high", "low", "close"]
-    ohlc = ohlc.dropna(subset=["close"])
+    g = g.sort_values("ts_utc")
+    ohlc = resample_ohlc(g, freq, last_cols=("liquidity_usd", "vol_h24"))
     if len(ohlc) < min_bars:
         return None, "insufficient_bars"
     # Sanity: non-negative OHLC, no NaNs in close after resample
-    if (ohlc <= 0).any().any() or ohlc["close"].isna().any():
+    if (ohlc[["open", "high", "low", "close"]] <= 0).any().any() or ohlc["close"].isna().any():
         return None, "nan_or_negative"
     ohlc["log_return"] = log_returns(ohlc["close"]).values
     ohlc["cum_return"] = cumulative_returns_log(ohlc["log_return"]).values
     ohlc["roll_vol"] = rolling_volatility(ohlc["log_return"], window).values
-    liq = g["liquidity_usd"].resample(freq).last()
-    vol24 = g["vol_h24"].resample(freq).last()
-    ohlc["liquidity_usd"] = liq.reindex(ohlc.index).ffill().bfill()
-    ohlc["vol_h24"] = vol24.reindex(ohlc.index).ffill().bfill()
+    ohlc["liquidity_usd"] = ohlc["liquidity_usd"].ffill().bfill()
+    ohlc["vol_h24"] = ohlc["vol_h24"].ffill().bfill()
     if ohlc["roll_vol"].isna().all() or (ohlc["liquidity_usd"] <= 0).all():
         return None, "nan_or_negative"
     ohlc["chain_id"] = g["chain_id"].iloc[0]
@@ -224,6 +224,16 @@ def ensure_db(conn: sqlite3.Connection) -> None:
         """
     )
     conn.execute("CREATE INDEX IF NOT EXISTS idx_sol_monitor_ts ON sol_monitor_snapshots(ts_utc);")
+    try:
+        conn.execute("ALTER TABLE sol_monitor_snapshots ADD COLUMN ts_epoch INTEGER;")
+        conn.commit()
+    except sqlite3.OperationalError:
+        pass
+    # Same index and one-time backfill as db.migrations, so readers can filter on ts_epoch alone.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sol_monitor_epoch ON sol_monitor_snapshots(ts_epoch);")
+    conn.execute(
+        "UPDATE sol_monitor_snapshots SET ts_epoch = CAST(strftime('%s', ts_utc) AS INTEGER) WHERE ts_epoch IS NULL;"
+    )
 
     conn.execute(
         """
@@ -953,14 +963,14 @@ def insert_snapshot(
             dex_price_usd, dex_price_native,
             liquidity_usd, vol_h24, txns_h24_buys, txns_h24_sells,
             spot_source, spot_price_usd,
-            raw_pair_json
+            raw_pair_json, ts_epoch
         ) VALUES (
             :ts_utc,
             :chain_id, :pair_address, :dex_id, :base_symbol, :quote_symbol,
             :dex_price_usd, :dex_price_native,
             :liquidity_usd, :vol_h24, :txns_h24_buys, :txns_h24_sells,
             :spot_source, :spot_price_usd,
-            :raw_pair_json
+            :raw_pair_json, CAST(strftime('%s', :ts_utc) AS INTEGER)
         );
         """,
         row,
@@ -15,6 +15,7 @@ from typing import List, Optional
 import numpy as np
 import pandas as pd
 
+from crypto_analyzer import fastkernels
 from crypto_analyzer.alpha_research import (
     compute_dispersion_series,
     compute_forward_returns,
@@ -250,8 +251,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         cost_drag = (gross_total - net_total) * 100 if pd.notna(gross_total) and pd.notna(net_total) else 0
         summ = significance_summary(port_ret_net, args.freq)
         eq = (1 + port_ret_net).cumprod()
-        dd = eq.cummax() - eq
-        max_dd = float(dd.max()) if len(dd) else np.nan
+        max_dd = fastkernels.max_drawdown(eq.to_numpy()) if len(eq) else np.nan
         avg_turnover = float(turnover_ser.mean()) if turnover_ser.notna().any() else 0
         lines.append(f"### {name}")
         lines.append(
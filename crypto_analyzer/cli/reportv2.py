@@ -24,6 +24,7 @@ import pandas as pd
 from crypto_analyzer.alpha_research import (
     compute_dispersion_series,
     compute_forward_returns,
+    dispersion_regime_labels,
     dispersion_zscore_series,
     ic_decay,
     ic_summary,
@@ -1473,7 +1474,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     )
     regime_series = pd.Series(index=returns_df.index, dtype=str)
     if not disp_z.empty:
-        regime_series = disp_z.apply(lambda z: "high_disp" if z > 1 else ("low_disp" if z < -1 else "mid"))
+        regime_series = dispersion_regime_labels(disp_z)
     for name, pnl in portfolio_pnls.items():
         if pnl.empty or regime_series.empty:
             continue
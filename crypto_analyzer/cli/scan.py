@@ -92,20 +92,21 @@ def _get_bars_or_from_snapshots(
     )
     if snap.empty:
         return snap
-    from crypto_analyzer.features import cumulative_returns_log
+    from crypto_analyzer.features import cumulative_returns_log, resample_ohlc
 
     window = 24 if freq == "1h" else 288
     rows = []
     for (cid, addr), g in snap.groupby(["chain_id", "pair_address"]):
-        g = g.sort_values("ts_utc").set_index("ts_utc")
-        close = g["price_usd"].resample(freq).last().dropna()
+        g = g.sort_values("ts_utc")
+        bars = resample_ohlc(g, freq, last_cols=("liquidity_usd", "vol_h24"))
+        close = bars["close"]
         if len(close) < max(min_bars_count, window + 2):
             continue
         lr = log_returns(close)
         cr = cumulative_returns_log(lr)
         rv = rolling_volatility(lr, window)
-        liq = g["liquidity_usd"].resample(freq).last().reindex(close.index).ffill().bfill()
-        v24 = g["vol_h24"].resample(freq).last().reindex(close.index).ffill().bfill()
+        liq = bars["liquidity_usd"].ffill().bfill()
+        v24 = bars["vol_h24"].ffill().bfill()
         for ts in close.index:
             rows.append(
                 {
@@ -12,8 +12,6 @@ from typing import List, Optional
 
 from crypto_analyzer.config import db_path, default_freq
 from crypto_analyzer.config import min_bars as config_min_bars
-from crypto_analyzer.data import load_bars
-from crypto_analyzer.walkforward import bars_per_day, run_walkforward_backtest
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -34,8 +32,19 @@ def main(argv: Optional[List[str]] = None) -> int:
     ap.add_argument("--plot", default=None, metavar="DIR", help="Save equity/drawdown plots to DIR")
     ap.add_argument("--csv", default=None, metavar="FILE", help="Save fold metrics CSV")
     ap.add_argument("--db", default=None)
+    ap.add_argument("--workers", type=int, default=1, help="Run folds in this many worker processes (default 1)")
+    ap.add_argument(
+        "--precompute-positions",
+        action="store_true",
+        help="Compute indicators/positions once over the full history and slice per fold (warm indicators at fold starts)",
+    )
     args = ap.parse_args(argv)
 
+    # pandas/numba come in with these; import them only after parsing so --help stays fast.
+    from crypto_analyzer.data import load_bars
+    from crypto_analyzer.features import drawdown
+    from crypto_analyzer.walkforward import bars_per_day, run_walkforward_backtest
+
     freq = args.freq or default_freq() if callable(default_freq) else "1h"
     db = args.db or (db_path() if callable(db_path) else db_path())
     min_bars_count = config_min_bars() if callable(config_min_bars) else 48
@@ -69,6 +78,8 @@ def main(argv: Optional[List[str]] = None) -> int:
         params=params,
         costs=costs,
         expanding=args.expanding,
+        workers=args.workers,
+        precompute_positions=args.precompute_positions,
     )
 
     if not fold_metrics:
@@ -95,18 +106,21 @@ def main(argv: Optional[List[str]] = None) -> int:
             matplotlib.use("Agg")
             import matplotlib.pyplot as plt
 
+            from crypto_analyzer.ui import downsample_minmax
+
+            # ~960 px wide at dpi=150: min/max per pixel column draws the same image as every point, much faster.
             args.plot = Path(args.plot)
             args.plot.mkdir(parents=True, exist_ok=True)
             fig, ax = plt.subplots(1, 1)
-            stitched.plot(ax=ax)
+            downsample_minmax(stitched, max_points=2000).plot(ax=ax)
             ax.set_title(f"Walk-forward equity — {args.strategy} ({freq})")
             ax.set_ylabel("Equity")
             plt.tight_layout()
             plt.savefig(args.plot / "equity.png", dpi=150)
             plt.close()
             fig, ax = plt.subplots(1, 1)
-            dd = stitched.cummax() - stitched
-            dd.plot(ax=ax)
+            dd = drawdown(stitched)
+            downsample_minmax(dd, max_points=2000).plot(ax=ax)
             ax.set_title(f"Drawdown — {args.strategy} ({freq})")
             plt.tight_layout()
             plt.savefig(args.plot / "drawdown.png", dpi=150)
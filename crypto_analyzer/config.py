@@ -5,6 +5,7 @@ Single source of truth for DB path, table, price column, filters, and defaults.
 
 from __future__ import annotations
 
+import copy
 import os
 from pathlib import Path
 
@@ -77,17 +78,30 @@ def _config_yaml_path() -> Path:
     return _repo_root() / "config.yaml"
 
 
+# (path, mtime_ns, size) -> parsed config.yaml; every accessor goes through get_config, so parse once per file version.
+_YAML_CACHE: dict = {}
+
+
 def _load_yaml() -> dict:
     try:
         import yaml
     except ImportError:
         return {}
     config_path = _config_yaml_path()
-    if not config_path.exists():
+    try:
+        st = config_path.stat()
+    except OSError:
         return {}
-    with open(config_path, encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-    return data if isinstance(data, dict) else {}
+    key = (str(config_path), st.st_mtime_ns, st.st_size)
+    data = _YAML_CACHE.get(key)
+    if data is None:
+        with open(config_path, encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        data = data if isinstance(data, dict) else {}
+        _YAML_CACHE.clear()
+        _YAML_CACHE[key] = data
+    # Callers may mutate what the accessors return (lists, nested dicts); never hand out the cached object.
+    return copy.deepcopy(data)
 
 
 def _deep_merge(base: dict, override: dict) -> dict:
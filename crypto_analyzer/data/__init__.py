@@ -5,6 +5,7 @@ Imports config and read_api only; does not import cli or promotion. Do not add e
 
 from __future__ import annotations
 
+import os
 import sqlite3
 from typing import Dict, List, Optional, Tuple
 
@@ -59,6 +60,10 @@ def load_snapshots(
     only_pairs: Optional[List[tuple]] = None,
     apply_filters: bool = True,
 ) -> pd.DataFrame:
+    """
+    Snapshot rows (NORMAL_COLUMNS) sorted by ts_utc. only_pairs and, with apply_filters, the liquidity/volume
+    minimums (strictly greater than) are applied in the SQL WHERE so filtered-out rows are never read into pandas.
+    """
     path = db_path_override or db_path()
     table = table_override or db_table()
     price_col = price_col_override or price_column()
@@ -66,14 +71,21 @@ def load_snapshots(
     min_liq = min_liquidity_usd if min_liquidity_usd is not None else config_min_liq()
     min_vol = min_vol_h24 if min_vol_h24 is not None else config_min_vol()
 
-    where = ""
-    params: List[str] = []
+    clauses: List[str] = []
+    params: List[object] = []
     if only_pairs:
-        clauses = []
+        pair_clauses = []
         for cid, addr in only_pairs:
-            clauses.append("(chain_id=? AND pair_address=?)")
+            pair_clauses.append("(chain_id=? AND pair_address=?)")
             params.extend([cid, addr])
-        where = "WHERE " + " OR ".join(clauses)
+        clauses.append("(" + " OR ".join(pair_clauses) + ")")
+    if apply_filters and min_liq is not None:
+        clauses.append("liquidity_usd > ?")
+        params.append(float(min_liq))
+    if apply_filters and min_vol is not None:
+        clauses.append("vol_h24 > ?")
+        params.append(float(min_vol))
+    where = "WHERE " + " AND ".join(clauses) if clauses else ""
 
     select_price = f"{price_col} AS price_usd" if price_col != "price_usd" else "price_usd"
     query = f"""
@@ -124,15 +136,6 @@ def load_snapshots(
             UserWarning,
             stacklevel=2,
         )
-    if apply_filters and (min_liq is not None or min_vol is not None):
-        mask = pd.Series(True, index=df.index)
-        if min_liq is not None and "liquidity_usd" in df.columns:
-            liq = pd.to_numeric(df["liquidity_usd"], errors="coerce")
-            mask = mask & (liq > min_liq)
-        if min_vol is not None and "vol_h24" in df.columns:
-            vol = pd.to_numeric(df["vol_h24"], errors="coerce")
-            mask = mask & (vol > min_vol)
-        df = df.loc[mask]
     df = df.reset_index(drop=True)
     try:
         from crypto_analyzer.integrity import assert_monotonic_time_index
@@ -213,12 +216,61 @@ def load_venue_bars_1h(
     return df
 
 
+def _db_file_key(path: str) -> Optional[Tuple[int, ...]]:
+    """(mtime_ns, size) of the DB file and its WAL, or None when the DB is not a plain file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = [st.st_mtime_ns, st.st_size]
+    try:
+        wal = os.stat(path + "-wal")
+        key += [wal.st_mtime_ns, wal.st_size]
+    except OSError:
+        pass
+    return tuple(key)
+
+
+def _bars_cache_path(path: str, table: str, key: Tuple[int, ...]) -> str:
+    """Parquet snapshot of one bars table, named after the DB file state it was read from."""
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), ".bars_cache")
+    stem = f"{os.path.basename(path)}.{table}"
+    return os.path.join(cache_dir, f"{stem}.{'_'.join(str(k) for k in key)}.parquet")
+
+
+def _write_bars_cache(cache_path: str, df: pd.DataFrame) -> None:
+    """Write the parquet snapshot atomically and drop snapshots of older DB states."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    cache_dir, name = os.path.split(cache_path)
+    stem = name.rsplit(".", 2)[0]
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp)
+    os.replace(tmp, cache_path)
+    for other in os.listdir(cache_dir):
+        if other != name and other.startswith(stem + ".") and other.endswith(".parquet"):
+            try:
+                os.remove(os.path.join(cache_dir, other))
+            except OSError:
+                pass
+
+
 def load_bars(
     freq: str,
     db_path_override: Optional[str] = None,
     min_bars: Optional[int] = None,
     only_pairs: Optional[List[tuple]] = None,
+    use_cache: bool = True,
 ) -> pd.DataFrame:
+    """
+    Load a materialized bars table, sorted by ts_utc.
+
+    Full-table reads are snapshotted to a Parquet file under ``.bars_cache/`` next to the DB, keyed by the DB
+    (and WAL) file mtime and size; later calls memory-map that file instead of re-running the SELECT. Any write
+    to the DB changes the key. Pass use_cache=False or set CRYPTO_ANALYZER_NO_CACHE=1 to always read SQLite.
+    """
     path = db_path_override or db_path()
     table = f"bars_{freq.replace(' ', '')}"
     allowed = allowed_bars_tables()
@@ -239,21 +291,44 @@ def load_bars(
         FROM {table} {where}
         ORDER BY ts_utc ASC
     """
-    try:
-        with _with_conn(path) as con:
-            df = pd.read_sql_query(query, con, params=params if params else None)
-    except Exception as e:
-        # pandas wraps sqlite3.OperationalError as pandas.errors.DatabaseError
-        if "no such table" not in str(e).lower():
-            raise
-        import warnings
+    cache_key = None
+    if use_cache and not only_pairs:
+        from crypto_analyzer.stats.cache_flags import is_cache_disabled
+
+        if not is_cache_disabled():
+            cache_key = _db_file_key(path)
+    df = None
+    if cache_key is not None:
+        cache_path = _bars_cache_path(path, table, cache_key)
+        if os.path.isfile(cache_path):
+            try:
+                import pyarrow.parquet as pq
+
+                df = pq.read_table(cache_path, memory_map=True).to_pandas()
+            except Exception:
+                df = None
+    if df is None:
+        try:
+            with _with_conn(path) as con:
+                df = pd.read_sql_query(query, con, params=params if params else None)
+        except Exception as e:
+            # pandas wraps sqlite3.OperationalError as pandas.errors.DatabaseError
+            if "no such table" not in str(e).lower():
+                raise
+            import warnings
 
-        warnings.warn(
-            f"load_bars: table {table!r} does not exist (run materialize_bars for this freq). Return empty.",
-            UserWarning,
-            stacklevel=2,
-        )
-        return pd.DataFrame()
+            warnings.warn(
+                f"load_bars: table {table!r} does not exist (run materialize_bars for this freq). Return empty.",
+                UserWarning,
+                stacklevel=2,
+            )
+            return pd.DataFrame()
+        # Only snapshot when nothing wrote to the DB while we read it (migrations on a fresh DB count as a write).
+        if cache_key is not None and not df.empty and _db_file_key(path) == cache_key:
+            try:
+                _write_bars_cache(cache_path, df)
+            except Exception:
+                pass
     if df.empty:
         return df
     df["ts_utc"] = pd.to_datetime(df["ts_utc"], utc=True, errors="coerce")
@@ -79,6 +79,14 @@ def run_migrations(conn: sqlite3.Connection, db_path: str | None = None) -> None
     _safe_add_column(conn, "sol_monitor_snapshots", "fetch_status", "TEXT")
     _safe_add_column(conn, "sol_monitor_snapshots", "error_message", "TEXT")
 
+    # Integer epoch seconds next to ts_utc so readers can bucket and convert time without parsing ISO strings.
+    # Writers fill it on insert; the backfill only touches rows written before the column existed.
+    _safe_add_column(conn, "sol_monitor_snapshots", "ts_epoch", "INTEGER")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sol_monitor_epoch ON sol_monitor_snapshots(ts_epoch);")
+    conn.execute(
+        "UPDATE sol_monitor_snapshots SET ts_epoch = CAST(strftime('%s', ts_utc) AS INTEGER) WHERE ts_epoch IS NULL;"
+    )
+
     # Universe tables
     conn.execute(
         """
@@ -86,8 +86,8 @@ class DbWriter:
                 dex_price_usd, dex_price_native,
                 liquidity_usd, vol_h24, txns_h24_buys, txns_h24_sells,
                 spot_source, spot_price_usd, raw_pair_json,
-                provider_name, fetched_at_utc, fetch_status, error_message
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                provider_name, fetched_at_utc, fetch_status, error_message, ts_epoch
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', ?) AS INTEGER));
             """,
             (
                 ts_utc,
@@ -109,6 +109,7 @@ class DbWriter:
                 snapshot.fetched_at_utc,
                 snapshot.status.value,
                 snapshot.error_message,
+                ts_utc,
             ),
         )
         return True
@@ -6,7 +6,7 @@ Used by portfolio (research) and backtest. Deterministic only.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -81,6 +81,20 @@ def slippage_bps_from_liquidity(liquidity_usd: float, config: Optional[Execution
     )
 
 
+def slippage_bps_series_from_liquidity(
+    liquidity_usd: pd.Series, config: Optional[ExecutionCostConfig] = None
+) -> pd.Series:
+    """slippage_bps_from_liquidity applied elementwise in one vectorized pass; same index as liquidity_usd."""
+    cfg = config or ExecutionCostConfig()
+    liq = liquidity_usd.to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slip = np.minimum(
+            cfg.slippage_bps_missing_liquidity, cfg.slippage_bps * (LIQUIDITY_SLIPPAGE_SCALE / liq) ** 0.5
+        )
+    slip = np.where(liq > 0, slip, cfg.slippage_bps_missing_liquidity)
+    return pd.Series(slip, index=liquidity_usd.index, dtype=float)
+
+
 class ExecutionCostModel:
     """
     Single place for applying costs to gross returns.
@@ -124,6 +138,17 @@ class ExecutionCostModel:
         net_returns = gross_returns - cost
         return net_returns, cost
 
+    def cost_rate(self, slippage_bps: Optional[np.ndarray] = None) -> Union[float, np.ndarray]:
+        """
+        Cost in return units per unit of turnover, (fee + slippage) / 10_000: the array form of apply_costs for
+        callers working on raw NumPy arrays. slippage_bps: optional per-period bps (NaN -> missing-liquidity
+        bps); None uses config.slippage_bps.
+        """
+        if slippage_bps is None:
+            return (self.config.fee_bps + self.config.slippage_bps) / 10_000
+        slip_bps = np.where(np.isnan(slippage_bps), self.config.slippage_bps_missing_liquidity, slippage_bps)
+        return (self.config.fee_bps + slip_bps) / 10_000
+
 
 def apply_costs(
     gross_returns: pd.Series,
@@ -0,0 +1,845 @@
+"""
+Optional Numba kernels for hot numeric paths (returns, rolling stats, ratios, backtest position paths).
+Public functions take and return NumPy arrays; each falls back to a NumPy implementation when
+numba is not installed (pip install -e ".[perf]"). Set CRYPTO_ANALYZER_NO_NUMBA=1 to force the fallback.
+float32 inputs are read as-is by the kernels (half the memory traffic); accumulation and outputs are float64.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numba
+
+    HAS_NUMBA = os.environ.get("CRYPTO_ANALYZER_NO_NUMBA", "").strip() != "1"
+except ImportError:
+    numba = None  # type: ignore[assignment]
+    HAS_NUMBA = False
+
+
+def _jit(**kwargs):
+    """njit with on-disk cache and NumPy float semantics (x/0 -> inf/nan instead of raising)."""
+    return numba.njit(cache=True, error_model="numpy", **kwargs)
+
+
+if HAS_NUMBA:
+
+    @_jit()
+    def _pct_change_nb(p):
+        n = p.shape[0]
+        out = np.empty(n)
+        if n == 0:
+            return out
+        out[0] = np.nan
+        prev = np.float64(p[0])
+        for i in range(1, n):
+            cur = np.float64(p[i])
+            out[i] = cur / prev - 1.0
+            prev = cur
+        return out
+
+    @_jit()
+    def _rolling_std_nb(x, window, ddof, scale, min_periods):
+        # Welford add/remove over a trailing window; a bar is emitted once the window holds
+        # `min_periods` non-NaN values. As in pandas, a window whose values are all equal is exactly 0
+        # (tracked by the run length of repeated values) rather than add/remove rounding residue.
+        n = x.shape[0]
+        out = np.full(n, np.nan)
+        cnt = 0
+        mean = 0.0
+        m2 = 0.0
+        prev = np.nan
+        same = 0
+        for i in range(n):
+            v = np.float64(x[i])
+            if v == v:
+                cnt += 1
+                delta = v - mean
+                mean += delta / cnt
+                m2 += delta * (v - mean)
+                same = same + 1 if v == prev else 1
+                prev = v
+            if i >= window:
+                old = np.float64(x[i - window])
+                if old == old:
+                    cnt -= 1
+                    if cnt == 0:
+                        mean = 0.0
+                        m2 = 0.0
+                    else:
+                        delta = old - mean
+                        mean -= delta / cnt
+                        m2 -= delta * (old - mean)
+            if cnt >= min_periods and cnt > ddof:
+                out[i] = 0.0 if same >= cnt else scale * np.sqrt(max(m2, 0.0) / (cnt - ddof))
+        return out
+
+    @_jit(parallel=True)
+    def _rolling_std_cols_nb(x, window, ddof, scale, min_periods):
+        out = np.empty(x.shape)
+        for c in numba.prange(x.shape[1]):
+            out[:, c] = _rolling_std_nb(x[:, c], window, ddof, scale, min_periods)
+        return out
+
+    @_jit()
+    def _rolling_zscore_nb(x, window):
+        # (x - rolling mean) / rolling ddof=1 std over trailing `window` rows that must all be present
+        # (min_periods=window), with _rolling_std_nb's Welford add/remove; NaN where the window is constant.
+        n = x.shape[0]
+        out = np.full(n, np.nan)
+        cnt = 0
+        mean = 0.0
+        m2 = 0.0
+        prev = np.nan
+        same = 0
+        for i in range(n):
+            v = np.float64(x[i])
+            if v == v:
+                cnt += 1
+                delta = v - mean
+                mean += delta / cnt
+                m2 += delta * (v - mean)
+                same = same + 1 if v == prev else 1
+                prev = v
+            if i >= window:
+                old = np.float64(x[i - window])
+                if old == old:
+                    cnt -= 1
+                    if cnt == 0:
+                        mean = 0.0
+                        m2 = 0.0
+                    else:
+                        delta = old - mean
+                        mean -= delta / cnt
+                        m2 -= delta * (old - mean)
+            if cnt == window and cnt > 1 and same < cnt and m2 > 0.0:
+                out[i] = (v - mean) / np.sqrt(m2 / (cnt - 1))
+        return out
+
+    @_jit(parallel=True)
+    def _row_std_nb(x, ddof):
+        # Two-pass (mean, then squared deviations) std of the non-NaN values of each row; rows run in parallel.
+        n, k = x.shape
+        out = np.full(n, np.nan)
+        for i in numba.prange(n):
+            cnt = 0
+            s = 0.0
+            for j in range(k):
+                v = np.float64(x[i, j])
+                if v == v:
+                    cnt += 1
+                    s += v
+            if cnt <= ddof:
+                continue
+            mean = s / cnt
+            ss = 0.0
+            for j in range(k):
+                v = np.float64(x[i, j])
+                if v == v:
+                    ss += (v - mean) * (v - mean)
+            out[i] = np.sqrt(ss / (cnt - ddof))
+        return out
+
+    @_jit()
+    def _sharpe_sortino_nb(r):
+        # One pass: Welford mean/M2 for the Sharpe denominator, mean of squared
+        # negative returns (semi-variance over all bars) for Sortino.
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        down = 0.0
+        for i in range(r.shape[0]):
+            v = np.float64(r[i])
+            if v != v:
+                continue
+            n += 1
+            delta = v - mean
+            mean += delta / n
+            m2 += delta * (v - mean)
+            if v < 0.0:
+                down += v * v
+        if n == 0:
+            return np.nan, np.nan, np.nan
+        sig = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+        return mean, sig, np.sqrt(down / n)
+
+    @_jit()
+    def _equity_stats_nb(e):
+        # One pass over an equity curve: per-bar returns e[i] / e[i-1] - 1 (NaN returns skipped), Welford mean/M2
+        # over all of them and over the losing ones, the winners' sum, and the largest fall of the compounded
+        # return below its running peak.
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        n_win = 0
+        s_win = 0.0
+        n_loss = 0
+        mean_loss = 0.0
+        m2_loss = 0.0
+        acc = 1.0
+        peak = -np.inf
+        max_dd = 0.0
+        for i in range(1, e.shape[0]):
+            v = np.float64(e[i]) / np.float64(e[i - 1]) - 1.0
+            if v != v:
+                continue
+            n += 1
+            delta = v - mean
+            mean += delta / n
+            m2 += delta * (v - mean)
+            if v > 0.0:
+                n_win += 1
+                s_win += v
+            elif v < 0.0:
+                n_loss += 1
+                d = v - mean_loss
+                mean_loss += d / n_loss
+                m2_loss += d * (v - mean_loss)
+            acc *= 1.0 + v
+            if acc > peak:
+                peak = acc
+            if peak - acc > max_dd:
+                max_dd = peak - acc
+        std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+        std_loss = np.sqrt(m2_loss / (n_loss - 1)) if n_loss > 1 else np.nan
+        mean_win = s_win / n_win if n_win else np.nan
+        if n_loss == 0:
+            mean_loss = np.nan
+        if n == 0:
+            mean = np.nan
+            max_dd = np.nan
+        return n, mean, std, n_win, mean_win, n_loss, mean_loss, std_loss, max_dd
+
+    @_jit(parallel=True)
+    def _sharpe_sortino_cols_nb(r):
+        # Column c of r is an independent return series; columns run in parallel.
+        k = r.shape[1]
+        mean = np.empty(k)
+        sig = np.empty(k)
+        dd = np.empty(k)
+        for c in numba.prange(k):
+            mean[c], sig[c], dd[c] = _sharpe_sortino_nb(r[:, c])
+        return mean, sig, dd
+
+    @_jit()
+    def _cum_return_nb(r):
+        # Column-wise prefix product of (1 + r), NaN treated as a flat bar; r is 2-D (n, k).
+        n, k = r.shape
+        out = np.empty((n, k))
+        acc = np.ones(k)
+        for i in range(n):
+            for j in range(k):
+                v = np.float64(r[i, j])
+                if v == v:
+                    acc[j] *= 1.0 + v
+                out[i, j] = acc[j] - 1.0
+        return out
+
+    @_jit()
+    def _rolling_beta_nb(r, f, window):
+        # cov(r, f) / var(f) over the last `window` bars where both are non-NaN (pandas rolling cov/var on the
+        # aligned, dropna'd pair), NaN at bars where either is missing. Welford co-moments with add/remove;
+        # the in-window pairs sit in a ring buffer. A window of identical f values has var 0 -> NaN, as in pandas.
+        n = r.shape[0]
+        out = np.full(n, np.nan)
+        bx = np.empty(window)
+        by = np.empty(window)
+        cnt = 0
+        head = 0
+        mx = 0.0
+        my = 0.0
+        cxy = 0.0
+        m2y = 0.0
+        prev = np.nan
+        same = 0
+        for i in range(n):
+            x = np.float64(r[i])
+            y = np.float64(f[i])
+            if x != x or y != y:
+                continue
+            if cnt == window:
+                ox = bx[head]
+                oy = by[head]
+                cnt -= 1
+                if cnt == 0:
+                    mx = 0.0
+                    my = 0.0
+                    cxy = 0.0
+                    m2y = 0.0
+                else:
+                    dx = ox - mx
+                    dy = oy - my
+                    mx -= dx / cnt
+                    my -= dy / cnt
+                    cxy -= dx * (oy - my)
+                    m2y -= dy * (oy - my)
+            bx[head] = x
+            by[head] = y
+            head = (head + 1) % window
+            cnt += 1
+            dx = x - mx
+            dy = y - my
+            mx += dx / cnt
+            my += dy / cnt
+            cxy += dx * (y - my)
+            m2y += dy * (y - my)
+            same = same + 1 if y == prev else 1
+            prev = y
+            if cnt == window and same < window and m2y > 0.0:
+                out[i] = cxy / m2y
+        return out
+
+    @_jit(parallel=True)
+    def _rolling_beta_cols_nb(r, f, window):
+        out = np.empty(r.shape)
+        for c in numba.prange(r.shape[1]):
+            out[:, c] = _rolling_beta_nb(r[:, c], f, window)
+        return out
+
+    @_jit()
+    def _rolling_corr_beta_nb(x, y, window):
+        # Series.rolling(window).corr and cov / var(y): each window is the last `window` rows, all of which need
+        # both values (min_periods=window), so a missing bar restarts the run. Welford co-moments with add/remove
+        # of the row leaving the window; one pass yields both stats. Row 0 of the output is corr, row 1 beta.
+        # corr is NaN when either side is constant (var 0), beta when y is.
+        n = x.shape[0]
+        out = np.full((2, n), np.nan)
+        run = 0
+        mx = 0.0
+        my = 0.0
+        cxy = 0.0
+        m2x = 0.0
+        m2y = 0.0
+        px = np.nan
+        py = np.nan
+        same_x = 0
+        same_y = 0
+        for i in range(n):
+            a = np.float64(x[i])
+            b = np.float64(y[i])
+            if a != a or b != b:
+                run = 0
+                mx = 0.0
+                my = 0.0
+                cxy = 0.0
+                m2x = 0.0
+                m2y = 0.0
+                px = np.nan
+                py = np.nan
+                continue
+            if run == window:
+                oa = np.float64(x[i - window])
+                ob = np.float64(y[i - window])
+                run -= 1
+                if run == 0:
+                    mx = 0.0
+                    my = 0.0
+                    cxy = 0.0
+                    m2x = 0.0
+                    m2y = 0.0
+                else:
+                    dx = oa - mx
+                    dy = ob - my
+                    mx -= dx / run
+                    my -= dy / run
+                    cxy -= dx * (ob - my)
+                    m2x -= dx * (oa - mx)
+                    m2y -= dy * (ob - my)
+            run += 1
+            dx = a - mx
+            dy = b - my
+            mx += dx / run
+            my += dy / run
+            cxy += dx * (b - my)
+            m2x += dx * (a - mx)
+            m2y += dy * (b - my)
+            same_x = same_x + 1 if a == px else 1
+            same_y = same_y + 1 if b == py else 1
+            px = a
+            py = b
+            if run == window and same_y < window and m2y > 0.0:
+                out[1, i] = cxy / m2y
+                if same_x < window and m2x > 0.0:
+                    out[0, i] = cxy / np.sqrt(m2x * m2y)
+        return out
+
+    @_jit(parallel=True)
+    def _rolling_corr_cols_nb(x, y, window):
+        out = np.empty(x.shape)
+        for c in numba.prange(x.shape[1]):
+            out[:, c] = _rolling_corr_beta_nb(x[:, c], y, window)[0]
+        return out
+
+    @_jit(parallel=True)
+    def _beta_columns_nb(x, f):
+        # Per column: two-pass cov(x, f) / var(f) over the rows where both are present, columns in parallel.
+        # NaN with fewer than 2 such rows or when f takes a single value there.
+        n, k = x.shape
+        out = np.full(k, np.nan)
+        for c in numba.prange(k):
+            cnt = 0
+            sx = 0.0
+            sf = 0.0
+            fmin = np.inf
+            fmax = -np.inf
+            for i in range(n):
+                a = np.float64(x[i, c])
+                b = np.float64(f[i])
+                if a == a and b == b:
+                    cnt += 1
+                    sx += a
+                    sf += b
+                    fmin = min(fmin, b)
+                    fmax = max(fmax, b)
+            if cnt < 2 or fmin == fmax:
+                continue
+            mx = sx / cnt
+            mf = sf / cnt
+            sxf = 0.0
+            sff = 0.0
+            for i in range(n):
+                a = np.float64(x[i, c])
+                b = np.float64(f[i])
+                if a == a and b == b:
+                    sxf += (a - mx) * (b - mf)
+                    sff += (b - mf) * (b - mf)
+            out[c] = sxf / sff
+        return out
+
+    @_jit()
+    def _trailing_stop_position_nb(close, z, z_entry, stop_pct, position_pct, start):
+        # Flat -> position_pct when z >= z_entry; held until close drops stop_pct below the high since entry.
+        # Bars before start or with NaN z carry the previous position and reset the high-water mark to close.
+        n = close.shape[0]
+        pos = np.zeros(n)
+        hw = np.float64(close[0]) if n else 0.0
+        for i in range(1, n):
+            c = np.float64(close[i])
+            zi = np.float64(z[i])
+            prev = pos[i - 1]
+            if i < start or zi != zi:
+                pos[i] = prev
+                hw = c
+            elif prev == 0 and zi >= z_entry:
+                pos[i] = position_pct
+                hw = c
+            elif prev > 0:
+                if c > hw:
+                    hw = c
+                pos[i] = 0.0 if c < hw * (1.0 - stop_pct) else prev
+            else:
+                hw = c
+        return pos
+
+    @_jit()
+    def _drawdown_nb(c):
+        # Column-wise running peak - c over a 2-D (n, k) array; NaN bars stay NaN and do not move the peak.
+        n, k = c.shape
+        peak = np.full(k, -np.inf)
+        out = np.empty((n, k))
+        for i in range(n):
+            for j in range(k):
+                v = np.float64(c[i, j])
+                if v != v:
+                    out[i, j] = np.nan
+                    continue
+                if v > peak[j]:
+                    peak[j] = v
+                out[i, j] = peak[j] - v
+        return out
+
+    @_jit()
+    def _max_drawdown_nb(c):
+        # Column-wise max of (running peak - c) over a 2-D (n, k) array; NaN bars are skipped.
+        n, k = c.shape
+        peak = np.full(k, -np.inf)
+        out = np.full(k, np.nan)
+        for i in range(n):
+            for j in range(k):
+                v = np.float64(c[i, j])
+                if v != v:
+                    continue
+                if v > peak[j]:
+                    peak[j] = v
+                dd = peak[j] - v
+                if not dd <= out[j]:
+                    out[j] = dd
+        return out
+
+
+def _as_input(x: np.ndarray) -> np.ndarray:
+    """C-contiguous float array for the kernels: float32 is kept (no upcast copy), anything else -> float64."""
+    a = np.asarray(x)
+    return np.ascontiguousarray(a, dtype=np.float32 if a.dtype == np.float32 else np.float64)
+
+
+def pct_change(prices: np.ndarray) -> np.ndarray:
+    """Simple returns p[i] / p[i-1] - 1 of a 1-D price array; first element NaN (matches Series.pct_change)."""
+    if HAS_NUMBA:
+        return _pct_change_nb(_as_input(prices))
+    p = np.ascontiguousarray(prices, dtype=np.float64)
+    out = np.empty_like(p)
+    if p.size:
+        out[0] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(p[1:], p[:-1], out=out[1:])
+        out[1:] -= 1.0
+    return out
+
+
+def cum_return(r: np.ndarray) -> np.ndarray:
+    """
+    Compounded return (1 + r).cumprod() - 1 with NaN bars treated as 0, for a 1-D array or
+    column-wise for a 2-D (bars x assets) array; matches (1 + r.fillna(0)).cumprod() - 1.
+    """
+    a = _as_input(r)
+    a2 = a[:, None] if a.ndim == 1 else a
+    if HAS_NUMBA:
+        out = _cum_return_nb(a2)
+    else:
+        out = np.cumprod(1.0 + np.nan_to_num(a2.astype(np.float64), nan=0.0), axis=0) - 1.0
+    return out.reshape(a.shape)
+
+
+def rolling_std(
+    x: np.ndarray, window: int, ddof: int = 1, scale: float = 1.0, min_periods: int | None = None
+) -> np.ndarray:
+    """
+    Trailing-window std in O(n) of a 1-D array, or per column of a 2-D (bars x assets) array with the
+    columns run in parallel; matches Series/DataFrame.rolling(window, min_periods).std(ddof) * scale
+    (min_periods defaults to window). Pass scale=sqrt(periods_per_year) to get annualized vol without a
+    second full-length temporary.
+    """
+    a = _as_input(x)
+    mp = int(window if min_periods is None else min_periods)
+    if HAS_NUMBA:
+        if a.ndim == 2:
+            return _rolling_std_cols_nb(a, int(window), int(ddof), float(scale), mp)
+        return _rolling_std_nb(a, int(window), int(ddof), float(scale), mp)
+    out = pd.DataFrame(a, dtype=np.float64).rolling(window, min_periods=mp).std(ddof=ddof).to_numpy().reshape(a.shape)
+    if scale != 1.0:
+        np.multiply(out, scale, out=out)
+    return out
+
+
+def beta_columns(x: np.ndarray, f: np.ndarray) -> np.ndarray:
+    """
+    Full-sample beta cov / var(f) of every column of a 2-D (bars x assets) array against f (same length), each
+    over the rows where both the column and f are present; NaN with fewer than 2 such rows or a flat factor.
+    """
+    a = _as_input(x)
+    fv = _as_input(f)
+    if HAS_NUMBA:
+        return _beta_columns_nb(a, fv)
+    a = a.astype(np.float64, copy=False)
+    fc = fv.astype(np.float64, copy=False)[:, None]
+    valid = ~np.isnan(a) & ~np.isnan(fc)
+    n = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mx = np.where(valid, a, 0.0).sum(axis=0) / n
+        mf = np.where(valid, fc, 0.0).sum(axis=0) / n
+        dx = np.where(valid, a - mx, 0.0)
+        df = np.where(valid, fc - mf, 0.0)
+        beta = (dx * df).sum(axis=0) / (df * df).sum(axis=0)
+    flat = np.where(valid, fc, np.inf).min(axis=0, initial=np.inf) == np.where(valid, fc, -np.inf).max(
+        axis=0, initial=-np.inf
+    )
+    beta[(n < 2) | flat] = np.nan
+    return beta
+
+
+def rolling_zscore(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    (x - rolling mean) / rolling std (ddof=1) of a 1-D array in one O(n) pass; matches
+    (s - s.rolling(window).mean()) / s.rolling(window).std(), with NaN wherever the window's std is 0.
+    """
+    a = _as_input(x)
+    if window < 2:
+        return np.full(a.shape, np.nan)
+    if HAS_NUMBA:
+        return _rolling_zscore_nb(a, int(window))
+    s = pd.Series(a, dtype=np.float64)
+    roll = s.rolling(window)
+    std = roll.std(ddof=1)
+    return ((s - roll.mean()) / std).where(std > 0).to_numpy()
+
+
+def row_std(x: np.ndarray, ddof: int = 1) -> np.ndarray:
+    """
+    Std of the non-NaN values in each row of a 2-D (bars x assets) array, rows reduced in parallel; matches
+    DataFrame.std(axis=1, ddof) (NaN for rows with ddof or fewer values).
+    """
+    a = _as_input(x)
+    if HAS_NUMBA:
+        return _row_std_nb(a, int(ddof))
+    return pd.DataFrame(a, dtype=np.float64).std(axis=1, ddof=ddof).to_numpy()
+
+
+def rolling_beta(r: np.ndarray, f: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling beta cov(r, f) / var(f) of a 1-D return array, or of every column of a 2-D (bars x assets) array,
+    against the factor returns f (same length). Each window is the last `window` bars where both the asset and
+    f are present, so one call matches a per-asset pandas rolling cov/var on the dropna'd aligned pair; bars
+    where either is missing are NaN.
+    """
+    a = _as_input(r)
+    fv = _as_input(f)
+    if window < 2:
+        return np.full(a.shape, np.nan)
+    if HAS_NUMBA:
+        if a.ndim == 1:
+            return _rolling_beta_nb(a, fv, int(window))
+        return _rolling_beta_cols_nb(a, fv, int(window))
+    a2 = a[:, None] if a.ndim == 1 else a
+    out = np.full(a2.shape, np.nan)
+    for c in range(a2.shape[1]):
+        both = ~(np.isnan(a2[:, c]) | np.isnan(fv))
+        x = pd.Series(a2[both, c], dtype=np.float64)
+        y = pd.Series(fv[both], dtype=np.float64)
+        var_f = y.rolling(window).var(ddof=1)
+        out[both, c] = (x.rolling(window).cov(y) / var_f).where(var_f > 0).to_numpy()
+    return out.reshape(a.shape)
+
+
+def rolling_corr(x: np.ndarray, y: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling Pearson correlation of a 1-D array, or of every column of a 2-D (bars x assets) array, with y
+    (same length) over trailing `window`-row windows; matches Series.rolling(window).corr(y) per column, except
+    that windows where either side is constant are NaN instead of pandas' 0/0 or +-inf.
+    """
+    a = _as_input(x)
+    yv = _as_input(y)
+    if window < 2:
+        return np.full(a.shape, np.nan)
+    if HAS_NUMBA:
+        if a.ndim == 1:
+            return _rolling_corr_beta_nb(a, yv, int(window))[0]
+        return _rolling_corr_cols_nb(a, yv, int(window))
+    a2 = a[:, None] if a.ndim == 1 else a
+    ys = pd.Series(yv, dtype=np.float64)
+    out = pd.DataFrame(a2, dtype=np.float64).rolling(window).corr(ys).to_numpy()
+    out[~np.isfinite(out)] = np.nan
+    return out.reshape(a.shape)
+
+
+def rolling_corr_beta(x: np.ndarray, y: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (rolling corr, rolling beta cov / var(y)) of 1-D x against y from a single pass, with rolling_corr's
+    window semantics (trailing `window` rows, all present). On arrays already aligned and NaN-free, beta equals
+    rolling_beta(x, y, window).
+    """
+    a = _as_input(x)
+    yv = _as_input(y)
+    if window < 2:
+        return np.full(a.shape, np.nan), np.full(a.shape, np.nan)
+    if HAS_NUMBA:
+        out = _rolling_corr_beta_nb(a, yv, int(window))
+        return out[0], out[1]
+    xs = pd.Series(a, dtype=np.float64)
+    ys = pd.Series(yv, dtype=np.float64)
+    var_y = ys.rolling(window).var(ddof=1)
+    beta = (xs.rolling(window).cov(ys) / var_y).where(var_y > 0).to_numpy()
+    corr = xs.rolling(window).corr(ys).to_numpy()
+    corr[~np.isfinite(corr)] = np.nan
+    return corr, beta
+
+
+def drawdown(cum: np.ndarray) -> np.ndarray:
+    """
+    Distance below the running peak, cummax(c) - c, of a 1-D cumulative-return (or equity) array or per column of
+    a 2-D array, in one pass; NaN bars stay NaN and are skipped by the peak (matches Series.cummax() - s).
+    """
+    a = _as_input(cum)
+    a2 = a[:, None] if a.ndim == 1 else a
+    if HAS_NUMBA:
+        out = _drawdown_nb(a2)
+    else:
+        a2 = a2.astype(np.float64)
+        out = np.fmax.accumulate(a2, axis=0) - a2
+    return out.reshape(a.shape)
+
+
+def max_drawdown(cum: np.ndarray) -> float | np.ndarray:
+    """
+    Largest fall from the running peak, max(cummax(c) - c), of a 1-D cumulative-return array (float), or
+    per column of a 2-D array; NaN bars are skipped and NaN is returned when there are no values.
+    """
+    a = _as_input(cum)
+    a2 = a[:, None] if a.ndim == 1 else a
+    if HAS_NUMBA:
+        out = _max_drawdown_nb(a2)
+    else:
+        a2 = a2.astype(np.float64)
+        dd = np.fmax.accumulate(a2, axis=0) - a2 if a2.shape[0] else np.full((1, a2.shape[1]), np.nan)
+        out = np.where(np.isnan(dd), -np.inf, dd).max(axis=0)
+        out[np.isneginf(out)] = np.nan
+    return float(out[0]) if a.ndim == 1 else out
+
+
+def trailing_stop_position(
+    close: np.ndarray, z: np.ndarray, z_entry: float, stop_pct: float, position_pct: float, start: int
+) -> np.ndarray:
+    """
+    Position path of a breakout rule with a trailing stop over 1-D close and signal (z) arrays: go from flat to
+    position_pct when z >= z_entry, exit once close falls stop_pct below the highest close since entry.
+    Bars before index start or with NaN z keep the previous position; the path starts flat.
+    """
+    c = _as_input(close)
+    zz = _as_input(z)
+    if HAS_NUMBA:
+        return _trailing_stop_position_nb(c, zz, float(z_entry), float(stop_pct), float(position_pct), int(start))
+    cl = c.astype(np.float64).tolist()
+    zl = zz.astype(np.float64).tolist()
+    pos = [0.0] * len(cl)
+    hw = cl[0] if cl else 0.0
+    for i in range(1, len(cl)):
+        ci, zi, prev = cl[i], zl[i], pos[i - 1]
+        if i < start or zi != zi:
+            pos[i] = prev
+            hw = ci
+        elif prev == 0 and zi >= z_entry:
+            pos[i] = float(position_pct)
+            hw = ci
+        elif prev > 0:
+            if ci > hw:
+                hw = ci
+            pos[i] = 0.0 if ci < hw * (1.0 - stop_pct) else prev
+        else:
+            hw = ci
+    return np.array(pos, dtype=np.float64)
+
+
+def sharpe_sortino(r: np.ndarray, periods_per_year: float) -> tuple[float, float]:
+    """
+    Annualized (Sharpe, Sortino) of per-bar returns (rf=0), NaNs ignored, in a single pass.
+    Sharpe uses the ddof=1 std; Sortino uses sqrt(mean(min(r, 0)^2)) over all bars. NaN when undefined.
+    """
+    a = _as_input(r)
+    if HAS_NUMBA:
+        mean, sig, dd = _sharpe_sortino_nb(a)
+    else:
+        mean, sig, dd = _moments_np(a)
+    scale = np.sqrt(periods_per_year)
+    sharpe = float(mean / sig * scale) if sig > 0 else float("nan")
+    sortino = float(mean / dd * scale) if dd > 0 else float("nan")
+    return sharpe, sortino
+
+
+def equity_stats(equity: np.ndarray) -> tuple:
+    """
+    Return statistics of a 1-D equity curve in one pass over it, from per-bar returns e[i] / e[i-1] - 1 with NaN
+    returns dropped: (n, mean, ddof=1 std, n_win, mean_win, n_loss, mean_loss, ddof=1 std of losses, max drawdown
+    of the compounded return (1 + r).cumprod() below its running peak). Counts are ints; undefined stats are NaN.
+    """
+    a = _as_input(equity)
+    if HAS_NUMBA:
+        n, mean, std, n_win, mean_win, n_loss, mean_loss, std_loss, max_dd = _equity_stats_nb(a)
+        return int(n), mean, std, int(n_win), mean_win, int(n_loss), mean_loss, std_loss, max_dd
+    a = a.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = a[1:] / a[:-1] - 1.0
+    r = r[~np.isnan(r)]
+    if r.size == 0:
+        return 0, np.nan, np.nan, 0, np.nan, 0, np.nan, np.nan, np.nan
+    wins, losses = r[r > 0], r[r < 0]
+    cum = np.cumprod(1.0 + r)
+    return (
+        int(r.size),
+        float(r.mean()),
+        float(r.std(ddof=1)) if r.size > 1 else np.nan,
+        int(wins.size),
+        float(wins.mean()) if wins.size else np.nan,
+        int(losses.size),
+        float(losses.mean()) if losses.size else np.nan,
+        float(losses.std(ddof=1)) if losses.size > 1 else np.nan,
+        float((np.maximum.accumulate(cum) - cum).max()),
+    )
+
+
+def sharpe_sortino_columns(r: np.ndarray, periods_per_year: float) -> tuple[np.ndarray, np.ndarray]:
+    """Per-column sharpe_sortino of a 2-D (bars x assets) return array; columns are reduced in parallel."""
+    a = _as_input(r)
+    if HAS_NUMBA:
+        mean, sig, dd = _sharpe_sortino_cols_nb(a)
+    else:
+        mean, sig, dd = np.array([_moments_np(a[:, c]) for c in range(a.shape[1])]).reshape(-1, 3).T
+    scale = np.sqrt(periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(sig > 0, mean / sig * scale, np.nan)
+        sortino = np.where(dd > 0, mean / dd * scale, np.nan)
+    return sharpe, sortino
+
+
+def _moments_np(a: np.ndarray) -> tuple[float, float, float]:
+    """(mean, ddof=1 std, downside deviation) of the non-NaN values of a 1-D array; NaN when undefined."""
+    a = a[~np.isnan(a)].astype(np.float64, copy=False)
+    if a.size == 0:
+        return float("nan"), float("nan"), float("nan")
+    sig = float(a.std(ddof=1)) if a.size > 1 else float("nan")
+    return float(a.mean()), sig, float(np.sqrt(np.mean(np.minimum(a, 0.0) ** 2)))
+
+
+def precompile() -> list[str]:
+    """
+    Compile every kernel for the float64 and float32 C-contiguous inputs the wrappers pass, filling numba's
+    on-disk cache so later processes load machine code instead of paying JIT latency on first call.
+    Run once after install (python -m crypto_analyzer.fastkernels). Returns the kernel names; [] without numba.
+    """
+    if not HAS_NUMBA:
+        return []
+    for dtype in (np.float64, np.float32):
+        vec = np.ones(4, dtype=dtype)
+        mat = np.ones((4, 2), dtype=dtype)
+        pct_change(vec)
+        cum_return(vec)
+        max_drawdown(vec)
+        drawdown(vec)
+        rolling_std(vec, 2)
+        rolling_std(mat, 2)
+        rolling_zscore(vec, 2)
+        row_std(mat)
+        sharpe_sortino(vec, 1.0)
+        sharpe_sortino_columns(mat, 1.0)
+        equity_stats(vec)
+        rolling_beta(vec, vec, 2)
+        rolling_beta(mat, vec, 2)
+        rolling_corr(vec, vec, 2)
+        rolling_corr(mat, vec, 2)
+        rolling_corr_beta(vec, vec, 2)
+        beta_columns(mat, vec)
+        trailing_stop_position(vec, vec, 1.0, 0.05, 0.25, 1)
+    kernels = (
+        _pct_change_nb,
+        _rolling_std_nb,
+        _rolling_std_cols_nb,
+        _rolling_zscore_nb,
+        _row_std_nb,
+        _sharpe_sortino_nb,
+        _sharpe_sortino_cols_nb,
+        _equity_stats_nb,
+        _cum_return_nb,
+        _rolling_beta_nb,
+        _rolling_beta_cols_nb,
+        _rolling_corr_beta_nb,
+        _rolling_corr_cols_nb,
+        _beta_columns_nb,
+        _trailing_stop_position_nb,
+        _drawdown_nb,
+        _max_drawdown_nb,
+    )
+    return [k.py_func.__name__ for k in kernels]
+
+
+if __name__ == "__main__":
+    import time
+
+    t0 = time.perf_counter()
+    names = precompile()
+    if names:
+        print(f"Compiled {len(names)} kernels in {time.perf_counter() - t0:.2f}s: {', '.join(names)}")
+    else:
+        print("numba not available (or CRYPTO_ANALYZER_NO_NUMBA=1); NumPy fallbacks need no compilation.")
@@ -4,11 +4,14 @@ Feature engineering from bar data: returns, volatility, drawdown, momentum, tren
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from . import fastkernels
+
 
 def _normalize_freq(freq: str) -> str:
     f = (freq or "").strip().replace(" ", "").lower()
@@ -34,6 +37,7 @@ def periods_per_year(freq: str) -> float:
     return minutes_per_year / period_minutes
 
 
+@lru_cache(maxsize=32)
 def bars_per_day(freq: str) -> float:
     n = _normalize_freq(freq)
     if n == "1D":
@@ -116,6 +120,55 @@ def log_returns(close: pd.Series) -> pd.Series:
     return np.log(close).diff()
 
 
+def resample_ohlc(
+    g: pd.DataFrame,
+    freq: str,
+    price_col: str = "price_usd",
+    last_cols: Tuple[str, ...] = (),
+) -> pd.DataFrame:
+    """
+    Bar aggregation of one pair's ts_utc-sorted snapshots; same bars as
+    g.set_index("ts_utc")[price_col].resample(freq).ohlc().dropna() for fixed-duration freqs.
+    Rows are bucketed once (origin = first day's midnight, resample's default); open/close are gathers at each
+    bucket's first/last valid price and high/low are reduceat over the bucket slices. Each of last_cols gets its
+    last non-null value in the bucket (NaN if none), like resample().last(). Index: bucket start, named ts_utc.
+    """
+    step = pd.Timedelta(freq)
+    cols = ["open", "high", "low", "close", *last_cols]
+    ts = pd.DatetimeIndex(g["ts_utc"]).as_unit("ns")
+    price = pd.to_numeric(g[price_col], errors="coerce").to_numpy(dtype=np.float64)
+    valid = ~np.isnan(price)
+    if not valid.any():
+        return pd.DataFrame(columns=cols, index=pd.DatetimeIndex([], tz=ts.tz, name="ts_utc"), dtype=float)
+    origin = ts.min().normalize().value
+    bucket = (ts.asi8 - origin) // step.value
+    b, p = bucket[valid], price[valid]
+    starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+    ends = np.r_[starts[1:], len(b)] - 1
+    keys = b[starts]
+    index = pd.DatetimeIndex((origin + keys * step.value).view("datetime64[ns]"), name="ts_utc").tz_localize(ts.tz)
+    out = pd.DataFrame(
+        {
+            "open": p[starts],
+            "high": np.maximum.reduceat(p, starts),
+            "low": np.minimum.reduceat(p, starts),
+            "close": p[ends],
+        },
+        index=index,
+    )
+    for col in last_cols:
+        v = pd.to_numeric(g[col], errors="coerce").to_numpy(dtype=np.float64)
+        has = ~np.isnan(v)
+        if not has.any():
+            out[col] = np.nan
+            continue
+        bv, vv = bucket[has], v[has]
+        last = np.flatnonzero(np.r_[bv[1:] != bv[:-1], True])
+        pos = np.minimum(np.searchsorted(bv[last], keys), len(last) - 1)
+        out[col] = np.where(bv[last][pos] == keys, vv[last][pos], np.nan)
+    return out
+
+
 def compute_ratio_series(numerator_price: pd.Series, denominator_price: pd.Series) -> pd.Series:
     idx = numerator_price.dropna().index.intersection(denominator_price.dropna().index)
     num = numerator_price.reindex(idx).dropna()
@@ -137,25 +190,28 @@ def cumulative_returns_log(log_ret: pd.Series) -> pd.Series:
 
 
 def rolling_volatility(log_ret: pd.Series, window: int, ddof: int = 1) -> pd.Series:
-    return log_ret.rolling(window, min_periods=1).std(ddof=ddof)
+    return pd.Series(
+        fastkernels.rolling_std(log_ret.to_numpy(), window, ddof=ddof, min_periods=1),
+        index=log_ret.index,
+        name=log_ret.name,
+    )
 
 
 def annualized_volatility(log_ret: pd.Series, freq: str, window: Optional[int] = None) -> pd.Series:
     bars_yr = bars_per_year(freq)
     if window is not None:
-        roll_std = log_ret.rolling(window, min_periods=1).std(ddof=1)
-        return roll_std * np.sqrt(bars_yr)
+        ann = fastkernels.rolling_std(log_ret.to_numpy(), window, scale=np.sqrt(bars_yr), min_periods=1)
+        return pd.Series(ann, index=log_ret.index, name=log_ret.name)
     std = log_ret.std(ddof=1)
     return pd.Series(np.sqrt(bars_yr) * std, index=log_ret.index)
 
 
 def drawdown(cum_return: pd.Series) -> pd.Series:
-    return cum_return.cummax() - cum_return
+    return pd.Series(fastkernels.drawdown(cum_return.to_numpy()), index=cum_return.index, name=cum_return.name)
 
 
 def max_drawdown(cum_return: pd.Series) -> float:
-    dd = drawdown(cum_return)
-    return float(dd.max()) if len(dd) else np.nan
+    return fastkernels.max_drawdown(cum_return.to_numpy()) if len(cum_return) else np.nan
 
 
 def momentum_returns(close: pd.Series, freq: str) -> pd.DataFrame:
@@ -197,7 +253,25 @@ def liquidity_change_pct(liquidity_usd: pd.Series, window: int = 24) -> pd.Serie
 def compute_correlation_matrix(returns_df: pd.DataFrame) -> pd.DataFrame:
     if returns_df.empty or returns_df.shape[1] < 2:
         return pd.DataFrame()
-    return returns_df.corr()
+    # Pairwise-complete Pearson (same as DataFrame.corr) from four BLAS matrix products instead of pandas'
+    # per-pair loop. Shifting each column by its first valid value keeps the sums well conditioned and makes
+    # a constant stretch exactly zero, so zero-variance pairs come out NaN just as in pandas.
+    x = returns_df.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(x)
+    first = x[valid.argmax(axis=0), np.arange(x.shape[1])]
+    x = np.where(valid, x - first, 0.0)
+    m = valid.astype(np.float64)
+    n = m.T @ m
+    sx = x.T @ m  # sx[i, j]: sum of column i over rows where j is also valid
+    sxx = (x * x).T @ m
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = n * sxx - sx * sx
+        corr = (n * (x.T @ x) - sx * sx.T) / np.sqrt(var * var.T)
+    corr[(n < 2) | ~(var > 0) | ~(var.T > 0)] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+    diag = np.diagonal(corr)
+    np.fill_diagonal(corr, np.where(np.isnan(diag), np.nan, 1.0))
+    return pd.DataFrame(corr, index=returns_df.columns, columns=returns_df.columns)
 
 
 def compute_rolling_correlation(returns_df: pd.DataFrame, window: int) -> pd.DataFrame:
@@ -205,11 +279,7 @@ def compute_rolling_correlation(returns_df: pd.DataFrame, window: int) -> pd.Dat
         return pd.DataFrame()
     if returns_df.shape[1] == 2:
         return returns_df.iloc[:, 0].rolling(window).corr(returns_df.iloc[:, 1]).to_frame("corr")
-    out = pd.DataFrame(index=returns_df.index)
-    ref = returns_df.iloc[:, 0]
-    for c in returns_df.columns[1:]:
-        out[c] = ref.rolling(window).corr(returns_df[c])
-    return out
+    return rolling_corr_matrix(returns_df.iloc[:, 1:], returns_df.iloc[:, 0], window)
 
 
 def compute_beta_vs_factor(asset_returns: pd.Series, factor_returns: pd.Series) -> float:
@@ -223,6 +293,16 @@ def compute_beta_vs_factor(asset_returns: pd.Series, factor_returns: pd.Series)
     return float(cov / var_f)
 
 
+def compute_beta_vs_factor_panel(returns_df: pd.DataFrame, factor_returns: pd.Series) -> pd.Series:
+    """
+    compute_beta_vs_factor for every column of returns_df in one pass (columns in parallel): per column, cov/var over the
+    timestamps where both the column and the factor are non-NaN (NaN with fewer than 2 such rows or a flat factor).
+    """
+    f = factor_returns.reindex(returns_df.index).to_numpy(dtype=np.float64)
+    beta = fastkernels.beta_columns(returns_df.to_numpy(dtype=np.float64), f)
+    return pd.Series(beta, index=returns_df.columns, dtype=float)
+
+
 def _align_returns(asset_ret: pd.Series, factor_ret: pd.Series) -> Tuple[pd.Series, pd.Series]:
     common = asset_ret.dropna().index.union(factor_ret.dropna().index)
     common = common[common.isin(asset_ret.index) & common.isin(factor_ret.index)]
@@ -268,10 +348,53 @@ def compute_rolling_beta(asset_ret: pd.Series, factor_ret: pd.Series, window: in
     a, f = _align_returns(asset_ret, factor_ret)
     if len(a) < window:
         return pd.Series(dtype=float)
-    cov = a.rolling(window).cov(f)
-    var_f = f.rolling(window).var(ddof=1)
-    out = cov / var_f
-    return out.where(var_f > 0, np.nan)
+    return pd.Series(fastkernels.rolling_beta(a.to_numpy(), f.to_numpy(), window), index=a.index)
+
+
+def latest_rolling_beta(asset_ret: pd.Series, factor_ret: pd.Series, window: int) -> float:
+    """
+    Last defined value of compute_rolling_beta(asset_ret, factor_ret, window), from the final window only instead
+    of the whole rolling series (falls back to the series when that window's factor is flat). NaN if none.
+    """
+    a, f = _align_returns(asset_ret, factor_ret)
+    if window < 2 or len(a) < window:
+        return np.nan
+    x = a.to_numpy(dtype=np.float64)[-window:]
+    y = f.to_numpy(dtype=np.float64)[-window:]
+    if np.ptp(y) > 0:
+        dy = y - y.mean()
+        return float(np.dot(x - x.mean(), dy) / np.dot(dy, dy))
+    beta = compute_rolling_beta(a, f, window).dropna()
+    return float(beta.iloc[-1]) if not beta.empty else np.nan
+
+
+def compute_rolling_corr_beta(asset_ret: pd.Series, factor_ret: pd.Series, window: int) -> Tuple[pd.Series, pd.Series]:
+    """(compute_rolling_corr, compute_rolling_beta) from one kernel pass over the aligned pair."""
+    a, f = _align_returns(asset_ret, factor_ret)
+    if len(a) < window:
+        return pd.Series(dtype=float), pd.Series(dtype=float)
+    corr, beta = fastkernels.rolling_corr_beta(a.to_numpy(), f.to_numpy(), window)
+    return pd.Series(corr, index=a.index), pd.Series(beta, index=a.index)
+
+
+def rolling_beta_matrix(returns_df: pd.DataFrame, factor_ret: pd.Series, window: int) -> pd.DataFrame:
+    """
+    Rolling beta of every column of returns_df vs factor_ret in one pass. Per column this equals
+    compute_rolling_beta (windows run over bars where both are present) placed on returns_df's index, NaN elsewhere.
+    """
+    f = factor_ret.reindex(returns_df.index).to_numpy()
+    beta = fastkernels.rolling_beta(returns_df.to_numpy(dtype=np.float64), f, window)
+    return pd.DataFrame(beta, index=returns_df.index, columns=returns_df.columns)
+
+
+def rolling_corr_matrix(returns_df: pd.DataFrame, ref: pd.Series, window: int) -> pd.DataFrame:
+    """
+    Rolling correlation of every column of returns_df with ref in one pass; per column this is
+    ref.rolling(window).corr(col) on returns_df's index (constant windows are NaN rather than +-inf).
+    """
+    y = ref.reindex(returns_df.index).to_numpy()
+    corr = fastkernels.rolling_corr(returns_df.to_numpy(dtype=np.float64), y, window)
+    return pd.DataFrame(corr, index=returns_df.index, columns=returns_df.columns)
 
 
 def rolling_windows_for_freq(freq: str) -> Tuple[int, int]:
@@ -306,16 +429,14 @@ def classify_beta_state(beta_btc_24: float, beta_btc_72: float, threshold: float
 def compute_dispersion_index(returns_df: pd.DataFrame) -> pd.Series:
     if returns_df.empty or returns_df.shape[1] < 2:
         return pd.Series(dtype=float)
-    return returns_df.std(axis=1, ddof=1)
+    return pd.Series(fastkernels.row_std(returns_df.to_numpy(dtype=np.float64), ddof=1), index=returns_df.index)
 
 
 def compute_dispersion_zscore(disp_series: pd.Series, window: int) -> pd.Series:
     if disp_series.empty or len(disp_series) < window:
         return pd.Series(dtype=float)
-    roll_mean = disp_series.rolling(window).mean()
-    roll_std = disp_series.rolling(window).std(ddof=1)
-    z = (disp_series - roll_mean) / roll_std
-    return z.where(roll_std > 0, np.nan)
+    z = fastkernels.rolling_zscore(disp_series.to_numpy(), window)
+    return pd.Series(z, index=disp_series.index, name=disp_series.name)
 
 
 def dispersion_window_for_freq(freq: str) -> int:
@@ -39,15 +39,13 @@ def winsorize_cross_section(signal_df: pd.DataFrame, p: float = 0.01) -> pd.Data
     """At each timestamp, winsorize to [p, 1-p] quantiles (cross-sectional)."""
     if signal_df.empty:
         return signal_df.copy()
-    out = signal_df.copy()
-    for t in out.index:
-        row = out.loc[t].dropna()
-        if len(row) < 2:
-            continue
-        lo = row.quantile(p)
-        hi = row.quantile(1 - p)
-        out.loc[t] = out.loc[t].clip(lower=lo, upper=hi)
-    return out
+    # Row quantiles for all timestamps at once; rows with < 2 values get NaN bounds, which clip leaves alone.
+    lo = signal_df.quantile(p, axis=1)
+    hi = signal_df.quantile(1 - p, axis=1)
+    few = signal_df.notna().sum(axis=1) < 2
+    lo[few] = np.nan
+    hi[few] = np.nan
+    return signal_df.clip(lower=lo, upper=hi, axis=0)
 
 
 def _ols_residual_cross_section(y: np.ndarray, X: np.ndarray) -> np.ndarray:
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 
@@ -65,16 +66,36 @@ def st_plot(fig: Any, **kwargs: Any) -> Any:
     return st.plotly_chart(fig, **width_kw)
 
 
+def downsample_minmax(s: pd.Series, max_points: int = 4000) -> pd.Series:
+    """
+    Thin a long series for plotting: split into max_points // 2 equal buckets and keep each bucket's min and max
+    (plus the first and last point), so spikes and drawdown troughs survive. Series at or under max_points pass
+    through unchanged; an all-NaN bucket keeps one NaN so line gaps still render.
+    """
+    n = len(s)
+    if n <= max_points or max_points < 4:
+        return s
+    width = -(-n // (max_points // 2))
+    n_buckets = -(-n // width)
+    y = np.full(n_buckets * width, np.nan)
+    y[:n] = s.to_numpy(dtype=np.float64, na_value=np.nan)
+    y = y.reshape(n_buckets, width)
+    starts = np.arange(n_buckets) * width
+    lo = np.where(np.isnan(y), np.inf, y).argmin(axis=1)
+    hi = np.where(np.isnan(y), -np.inf, y).argmax(axis=1)
+    idx = np.unique(np.concatenate([[0, n - 1], starts + lo, starts + hi]))
+    return s.iloc[idx[idx < n]]
+
+
 def safe_for_streamlit_df(df: pd.DataFrame) -> pd.DataFrame:
-    """Cast object/category columns to str so pyarrow does not coerce to double (e.g. regime/beta_state)."""
+    """
+    Cast object/category columns to Arrow-backed strings so pyarrow does not coerce them to double (e.g.
+    regime/beta_state) and Streamlit can ship them without a per-cell conversion; missing values stay <NA>.
+    """
     if df.empty:
         return df.copy()
-    out = df.copy()
-    for c in out.columns:
-        d = out[c].dtype
-        if d == "object" or str(d) == "category":
-            out[c] = out[c].astype(str)
-    return out
+    casts = {c: "string[pyarrow]" for c, d in df.dtypes.items() if d == "object" or isinstance(d, pd.CategoricalDtype)}
+    return df.astype(casts) if casts else df.copy()
 
 
 def format_percent(x: Any, decimals: int = 2) -> str:
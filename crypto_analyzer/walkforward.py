@@ -4,6 +4,9 @@ Walk-forward / out-of-sample validation. No lookahead; fit only on train, simula
 
 from __future__ import annotations
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
@@ -62,6 +65,41 @@ def walk_forward_splits(
     return out
 
 
+def _run_fold(
+    strategy: str,
+    test_bars_sub: pd.DataFrame,
+    freq: str,
+    fee_bps: float,
+    position_pct: float,
+    params: Dict[str, Any],
+) -> pd.Series:
+    """Equity of one test fold (module-level so worker processes can run it)."""
+    from crypto_analyzer.backtest_core import run_trend_strategy, run_vol_breakout_strategy
+
+    run = run_trend_strategy if strategy == "trend" else run_vol_breakout_strategy
+    _, equity = run(
+        test_bars_sub,
+        freq,
+        fee_bps=fee_bps,
+        position_pct=position_pct,
+        **{k: v for k, v in params.items() if k not in ("position_pct",)},
+    )
+    return equity
+
+
+def _run_fold_positions(
+    test_pos_sub: pd.DataFrame,
+    fee_bps: float,
+    position_pct: float,
+    slippage_bps_fixed: Optional[float],
+) -> pd.Series:
+    """Equity of one test fold sliced from full-history positions (module-level so worker processes can run it)."""
+    from crypto_analyzer.backtest_core import run_positions
+
+    _, equity = run_positions(test_pos_sub, position_pct, fee_bps=fee_bps, slippage_bps_fixed=slippage_bps_fixed)
+    return equity
+
+
 def run_walkforward_backtest(
     bars_df: pd.DataFrame,
     freq: str,
@@ -72,20 +110,22 @@ def run_walkforward_backtest(
     params: Optional[Dict[str, Any]] = None,
     costs: Optional[Dict[str, float]] = None,
     expanding: bool = False,
+    workers: int = 1,
+    precompute_positions: bool = False,
 ) -> Tuple[pd.Series, pd.DataFrame, List[Dict]]:
     """
     Run backtest on each fold (train then test). For trend/vol_breakout we simulate on test
     data only (no separate fit on train in this implementation; train window is for fold boundaries).
     Returns: (stitched_equity_series, fold_df, per_fold_metrics_list).
     stitched_equity: concatenated equity from each test fold (no overlap).
+    workers > 1 runs the (independent) folds in that many worker processes; results are identical to workers=1.
+    precompute_positions=True computes indicators and positions once per pair over the full history and each fold
+    only slices and costs them (O(N) instead of O(folds * N)). Indicators are then warm at every fold start and a
+    position can carry into a fold, so fold results differ from the default per-fold restart (both are causal).
     """
     from crypto_analyzer.backtest_core import (
         metrics as backtest_metrics,
     )
-    from crypto_analyzer.backtest_core import (
-        run_trend_strategy,
-        run_vol_breakout_strategy,
-    )
 
     params = params or {}
     costs = costs or {}
@@ -98,32 +138,50 @@ def run_walkforward_backtest(
     if not folds:
         return pd.Series(dtype=float), pd.DataFrame(), []
 
-    all_equity = []
-    fold_metrics = []
+    if precompute_positions:
+        from crypto_analyzer.backtest_core import strategy_positions
+
+        signal_params = {k: v for k, v in params.items() if k not in ("position_pct", "slippage_bps_fixed")}
+        bars_df = strategy_positions(bars_df, strategy, position_pct=position_pct, **signal_params)
+        if bars_df.empty:
+            return pd.Series(dtype=float), pd.DataFrame(), []
 
+    # Train slice available as bars_df[bars_df["ts_utc"].isin(train_idx)] if needed for future fit-on-train logic
+    tasks = []
     for fold_idx, (train_idx, test_idx) in enumerate(folds):
-        train_ts = train_idx
-        test_ts = test_idx
-        # Train slice available as bars_df[bars_df["ts_utc"].isin(train_ts)] if needed for future fit-on-train logic
-        test_bars_sub = bars_df[bars_df["ts_utc"].isin(test_ts)]
-        if test_bars_sub.empty:
-            continue
-        if strategy == "trend":
-            trades_df, equity = run_trend_strategy(
-                test_bars_sub,
-                freq,
-                fee_bps=fee_bps,
-                position_pct=position_pct,
-                **{k: v for k, v in params.items() if k not in ("position_pct",)},
-            )
-        else:
-            trades_df, equity = run_vol_breakout_strategy(
-                test_bars_sub,
-                freq,
-                fee_bps=fee_bps,
-                position_pct=position_pct,
-                **{k: v for k, v in params.items() if k not in ("position_pct",)},
-            )
+        test_bars_sub = bars_df[bars_df["ts_utc"].isin(test_idx)]
+        if not test_bars_sub.empty:
+            tasks.append((fold_idx, train_idx, test_idx, test_bars_sub))
+    if precompute_positions:
+        fold_fn = _run_fold_positions
+        fold_args = (
+            [t[3] for t in tasks],
+            repeat(fee_bps),
+            repeat(position_pct),
+            repeat(params.get("slippage_bps_fixed")),
+        )
+    else:
+        fold_fn = _run_fold
+        fold_args = (
+            repeat(strategy),
+            [t[3] for t in tasks],
+            repeat(freq),
+            repeat(fee_bps),
+            repeat(position_pct),
+            repeat(params),
+        )
+    if workers > 1 and len(tasks) > 1:
+        # spawn, as in tools/analyze_legacy.py: forking after numba's thread pool has started can hang the parent.
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)), mp_context=multiprocessing.get_context("spawn")
+        ) as ex:
+            equities = list(ex.map(fold_fn, *fold_args))
+    else:
+        equities = list(map(fold_fn, *fold_args))
+
+    all_equity = []
+    fold_metrics = []
+    for (fold_idx, train_ts, test_ts, _), equity in zip(tasks, equities):
         if equity is None or (hasattr(equity, "empty") and equity.empty):
             continue
         all_equity.append(equity)
@@ -1,10 +1,11 @@
-"""Alpha research: IC sign, IC decay smoke, turnover bounds."""
+"""Alpha research: IC sign, IC decay smoke, turnover bounds, dispersion regime labels."""
 
 import numpy as np
 import pandas as pd
 
 from crypto_analyzer.alpha_research import (
     compute_forward_returns,
+    dispersion_regime_labels,
     ic_decay,
     ic_summary,
     information_coefficient,
@@ -58,3 +59,10 @@ def test_turnover_bounds():
     if turnover_ser.notna().any():
         assert (turnover_ser.dropna() >= 0).all() and (turnover_ser.dropna() <= 2.0 + 1e-6).all()
     assert 0 <= avg <= 2.0 + 1e-6
+
+
+def test_dispersion_regime_labels_match_scalar_rule():
+    """Vectorized labels equal the per-element rule, with NaN and the +-1 boundaries falling in mid."""
+    z = pd.Series([2.0, 1.0, 0.3, -1.0, -1.5, np.nan], index=pd.date_range("2024-01-01", periods=6, freq="1h"))
+    expected = z.apply(lambda v: "high_disp" if v > 1 else ("low_disp" if v < -1 else "mid"))
+    pd.testing.assert_series_equal(dispersion_regime_labels(z), expected)
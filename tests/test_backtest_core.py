@@ -0,0 +1,100 @@
+"""Backtest strategies: single-pass gross equity matches the net curve's pre-cost stream; pairs run independently and combine equal-weight."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from crypto_analyzer.backtest_core import _combine_equity, metrics, run_trend_strategy, run_vol_breakout_strategy
+
+
+def _bars(n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    frames = []
+    for addr, seed_shift in [("0xa", 0.0), ("0xb", 0.002)]:
+        close = 100.0 * np.exp(np.cumsum(rng.normal(seed_shift, 0.02, n)))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "ts_utc": pd.date_range("2024-01-01", periods=n, freq="1h"),
+                    "chain_id": "ethereum",
+                    "pair_address": addr,
+                    "close": close,
+                    "liquidity_usd": 5e5,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize("strategy", [run_trend_strategy, run_vol_breakout_strategy])
+def test_return_gross_matches_separate_runs(strategy):
+    bars = _bars()
+    trades, equity = strategy(bars, "1h")
+    trades_g, equity_net, equity_gross = strategy(bars, "1h", return_gross=True)
+    pd.testing.assert_series_equal(equity_net, equity)
+    pd.testing.assert_frame_equal(trades_g, trades)
+    assert not trades.empty
+    # Pre-cost curve equals a (near) zero-cost run over the same trade stream.
+    _, equity_free = strategy(bars, "1h", fee_bps=0, slippage_bps_fixed=1e-12)
+    np.testing.assert_allclose(equity_gross.to_numpy(), equity_free.to_numpy(), rtol=1e-9)
+    assert equity_gross.iloc[-1] > equity_net.iloc[-1]
+
+
+def test_return_gross_empty_when_not_enough_bars():
+    trades, equity, equity_gross = run_trend_strategy(_bars(20), "1h", return_gross=True)
+    assert trades.empty and equity.empty and equity_gross.empty
+
+
+@pytest.mark.parametrize("strategy", [run_trend_strategy, run_vol_breakout_strategy])
+def test_panel_run_matches_per_pair_runs(strategy):
+    """Shuffled multi-pair input (plus rows without a pair key) gives the same trades as running each pair alone."""
+    bars = _bars()
+    noise = bars.head(3).assign(pair_address=None)
+    shuffled = pd.concat([bars, noise]).sample(frac=1.0, random_state=0)
+    trades, equity = strategy(shuffled, "1h")
+    per_pair = [strategy(g, "1h") for _, g in bars.groupby("pair_address")]
+    expected = pd.concat([t for t, _ in per_pair], ignore_index=True)
+    pd.testing.assert_frame_equal(trades, expected)
+    pd.testing.assert_series_equal(equity, pd.concat([e for _, e in per_pair], axis=1).mean(axis=1))
+
+
+def test_combine_equity_matches_ffill_bfill_mean():
+    """Staggered, gappy pair curves average on the timestamp union as the dense ffill/bfill frame would."""
+    rng = np.random.default_rng(2)
+    grid = pd.date_range("2024-01-01", periods=500, freq="1h")
+    curves = []
+    for size in (1, 40, 300, 500):
+        rows = np.sort(rng.choice(len(grid), size, replace=False))
+        curves.append(pd.Series(np.cumprod(1 + rng.normal(0, 0.01, size)), index=grid[rows]))
+    dense = pd.concat(curves, axis=1).sort_index().ffill().bfill().mean(axis=1)
+    pd.testing.assert_series_equal(_combine_equity(curves), dense, rtol=1e-12, check_freq=False)
+    assert _combine_equity(curves[:1]) is curves[0]
+
+
+def test_combine_equity_flat_stretches_keep_metrics():
+    """Where every pair is flat the combined curve is exactly flat, so metrics() match the dense mean's."""
+    grid = pd.date_range("2024-01-01", periods=600, freq="1h")
+    for seed in range(16):
+        rng = np.random.default_rng(seed)
+        curves = []
+        for _ in range(6):
+            start = int(rng.integers(0, 300))
+            stop = int(rng.integers(start + 50, 601))
+            r = rng.normal(0, 0.01, stop - start) * (rng.random(stop - start) < 0.3)  # flat most of the time
+            curves.append(pd.Series(np.cumprod(1 + r), index=grid[start:stop]))
+        dense = pd.concat(curves, axis=1).sort_index().ffill().bfill().mean(axis=1)
+        got, want = metrics(_combine_equity(curves), "1h"), metrics(dense, "1h")
+        assert got["win_rate"] == want["win_rate"] and got["n_bars"] == want["n_bars"], seed
+        for key in ("total_return", "vol_annual", "sharpe", "sortino", "max_drawdown", "avg_win", "avg_loss"):
+            assert got[key] == pytest.approx(want[key], rel=1e-9), (seed, key)
+
+
+def test_metrics_pads_nan_equity():
+    """A NaN bar carries the previous equity forward (pct_change() semantics) instead of dropping returns."""
+    eq = pd.Series([1.0, 1.1, np.nan, 1.2, 1.0, 1.3], index=pd.date_range("2024-01-01", periods=6, freq="1h"))
+    m = metrics(eq, "1h")
+    assert m["win_rate"] == pytest.approx(0.6)
+    assert m["max_drawdown"] == pytest.approx(0.2)
+    assert m == metrics(eq.ffill(), "1h")
@@ -0,0 +1,25 @@
+"""config.yaml is parsed once per file version; edits are picked up and callers cannot mutate the cache."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from crypto_analyzer import config
+
+pytest.importorskip("yaml")
+
+
+def test_yaml_reloads_on_change_and_is_not_shared(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    path.write_text("defaults:\n  freq: 1h\nbars_freqs: [1h]\n", encoding="utf-8")
+    monkeypatch.setattr(config, "_config_yaml_path", lambda: path)
+    assert config.default_freq() == "1h"
+    config.get_config()["bars_freqs"].append("5min")
+    assert config.bars_freqs() == ["1h"]
+
+    path.write_text("defaults:\n  freq: 15min\nbars_freqs: [1h]\n", encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert config.default_freq() == "15min"
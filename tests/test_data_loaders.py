@@ -102,6 +102,32 @@ def test_load_snapshots_invalid_price_col_raises(temp_db):
     assert "evil_col" in str(exc_info.value)
 
 
+def test_load_snapshots_filters_liquidity_and_volume(temp_db):
+    """apply_filters keeps only rows strictly above both minimums (NULLs excluded); only_pairs combines with them."""
+    rows = [
+        ("2025-01-01 10:00:00", "addr1", 2e6, 2e6),
+        ("2025-01-01 11:00:00", "addr1", 1e6, 2e6),  # liquidity == min -> dropped
+        ("2025-01-01 12:00:00", "addr1", 2e6, None),  # NULL volume -> dropped
+        ("2025-01-01 13:00:00", "addr2", 3e6, 3e6),
+    ]
+    with sqlite3.connect(temp_db) as conn:
+        for ts, addr, liq, vol in rows:
+            conn.execute(
+                """INSERT INTO sol_monitor_snapshots (ts_utc, chain_id, pair_address, base_symbol, quote_symbol, dex_price_usd, liquidity_usd, vol_h24)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (ts, "solana", addr, "SOL", "USDC", 100.0, liq, vol),
+            )
+        conn.commit()
+    df = load_snapshots(db_path_override=temp_db, min_liquidity_usd=1e6, min_vol_h24=1e6)
+    assert list(df["pair_address"]) == ["addr1", "addr2"]
+    assert df.index.tolist() == [0, 1]
+    df = load_snapshots(
+        db_path_override=temp_db, min_liquidity_usd=1e6, min_vol_h24=1e6, only_pairs=[("solana", "addr1")]
+    )
+    assert len(df) == 1 and df["ts_utc"].iloc[0].hour == 10
+    assert len(load_snapshots(db_path_override=temp_db, apply_filters=False)) == 4
+
+
 def test_load_bars_returns_expected_columns(temp_db):
     """load_bars returns correct columns, sorted by ts_utc, no duplicates."""
     with sqlite3.connect(temp_db) as conn:
@@ -158,6 +184,33 @@ def test_load_bars_no_such_table_returns_empty(tmp_path):
     assert isinstance(df, pd.DataFrame)
 
 
+def test_load_bars_parquet_cache_matches_sqlite_and_invalidates(temp_db, tmp_path):
+    """Repeat full-table loads come from a Parquet snapshot that tracks DB writes."""
+
+    def _insert(conn, i):
+        conn.execute(
+            """INSERT INTO bars_1h (ts_utc, chain_id, pair_address, base_symbol, quote_symbol, open, high, low, close)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (f"2025-01-01 {i:02d}:00:00", "solana", "addr1", "SOL", "USDC", 1.0, 1.0, 1.0, 1.0 + i),
+        )
+
+    with sqlite3.connect(temp_db) as conn:
+        for i in range(5):
+            _insert(conn, i)
+    load_bars("1h", db_path_override=temp_db)
+    first = load_bars("1h", db_path_override=temp_db)
+    cached = list((tmp_path / ".bars_cache").glob("*.parquet"))
+    assert len(cached) == 1
+    pd.testing.assert_frame_equal(load_bars("1h", db_path_override=temp_db), first)
+    pd.testing.assert_frame_equal(load_bars("1h", db_path_override=temp_db, use_cache=False), first)
+
+    with sqlite3.connect(temp_db) as conn:
+        _insert(conn, 5)
+    assert len(load_bars("1h", db_path_override=temp_db)) == 6
+    assert len(load_bars("1h", db_path_override=temp_db, min_bars=10)) == 0
+    assert [p.name for p in (tmp_path / ".bars_cache").glob("*.parquet")] != [cached[0].name]
+
+
 def test_load_spot_series_empty(temp_db):
     """Empty spot_price_snapshots returns empty Series."""
     s = load_spot_series(db_path_override=temp_db, symbol="BTC")
@@ -117,6 +117,9 @@ class TestDbWriter:
         assert row[2] == "dexscreener"
         assert row[3] == "OK"
 
+        ts_epoch = db_conn.execute("SELECT ts_epoch FROM sol_monitor_snapshots").fetchone()[0]
+        assert ts_epoch == 1767225600  # 2026-01-01T00:00:00Z
+
     def test_batch_spot_writes(self, db_conn):
         writer = DbWriter(db_conn)
         quotes = [
@@ -228,3 +231,13 @@ class TestMigrations:
         assert "provider_name" in columns
         assert "fetched_at_utc" in columns
         assert "fetch_status" in columns
+
+    def test_ts_epoch_backfilled_for_existing_rows(self, db_conn):
+        db_conn.execute(
+            "INSERT INTO sol_monitor_snapshots (ts_utc, chain_id, pair_address) VALUES (?, ?, ?)",
+            ("2026-01-01T00:01:30+00:00", "solana", "abc123"),
+        )
+        db_conn.commit()
+        run_migrations(db_conn)
+        row = db_conn.execute("SELECT ts_epoch FROM sol_monitor_snapshots").fetchone()
+        assert row[0] == 1767225690
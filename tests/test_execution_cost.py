@@ -16,6 +16,7 @@ from crypto_analyzer.execution_cost import (
     capacity_curve_is_non_monotone,
     impact_bps_from_participation,
     slippage_bps_from_liquidity,
+    slippage_bps_series_from_liquidity,
     spread_bps_from_vol_liquidity,
 )
 
@@ -55,6 +56,16 @@ def test_missing_liquidity_conservative_fallback():
     assert slippage_bps_from_liquidity(-1, cfg) == DEFAULT_SLIPPAGE_BPS_WHEN_MISSING_LIQUIDITY
 
 
+def test_slippage_series_matches_scalar_proxy():
+    """Vectorized liquidity proxy equals the scalar one, including NaN/zero/negative liquidity."""
+    cfg = ExecutionCostConfig(slippage_bps=12.0)
+    liq = pd.Series([np.nan, 0.0, -5.0, 1e3, 2.5e5, 1e6, 4e7], index=list("abcdefg"))
+    got = slippage_bps_series_from_liquidity(liq, cfg)
+    expected = [slippage_bps_from_liquidity(x, cfg) for x in liq]
+    np.testing.assert_allclose(got.to_numpy(), expected, rtol=1e-12)
+    assert got.index.equals(liq.index)
+
+
 def test_portfolio_wrapper_consistent():
     """apply_costs_to_portfolio (portfolio module) matches ExecutionCostModel net result."""
     from crypto_analyzer.portfolio import apply_costs_to_portfolio
@@ -156,3 +167,18 @@ def test_capacity_curve_is_non_monotone():
     # Empty or no column
     assert not capacity_curve_is_non_monotone(pd.DataFrame())
     assert not capacity_curve_is_non_monotone(pd.DataFrame({"x": [1]}))
+
+
+def test_cost_rate_matches_apply_costs():
+    """cost_rate is apply_costs' cost per unit turnover, for fixed and per-period (NaN -> missing) slippage."""
+    idx = pd.RangeIndex(4)
+    gross = pd.Series([0.01, -0.02, 0.0, 0.03], index=idx)
+    turnover = pd.Series([0.25, 0.0, 0.5, 0.25], index=idx)
+    slip = pd.Series([5.0, np.nan, 20.0, 80.0], index=idx)
+    model = ExecutionCostModel(ExecutionCostConfig(fee_bps=12.0, slippage_bps=7.0))
+    net_fixed, _ = model.apply_costs(gross, turnover)
+    np.testing.assert_allclose(gross.to_numpy() - turnover.to_numpy() * model.cost_rate(), net_fixed.to_numpy())
+    net_slip, _ = model.apply_costs(gross, turnover, slippage_bps_series=slip)
+    rate = model.cost_rate(slip.to_numpy())
+    np.testing.assert_allclose(gross.to_numpy() - turnover.to_numpy() * rate, net_slip.to_numpy())
+    assert rate[1] == (12.0 + DEFAULT_SLIPPAGE_BPS_WHEN_MISSING_LIQUIDITY) / 10_000
@@ -0,0 +1,308 @@
+"""Numba kernels match their pandas reference on both the numba and NumPy-fallback paths."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from crypto_analyzer import fastkernels
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numba" and not fastkernels.HAS_NUMBA:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(fastkernels, "HAS_NUMBA", request.param == "numba")
+    return request.param
+
+
+def _prices(n: int = 200, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def test_pct_change_matches_pandas(backend):
+    p = _prices()
+    expected = pd.Series(p).pct_change().to_numpy()
+    np.testing.assert_allclose(fastkernels.pct_change(p), expected, rtol=1e-12, equal_nan=True)
+
+
+def test_pct_change_empty_and_single(backend):
+    assert fastkernels.pct_change(np.array([])).shape == (0,)
+    assert np.isnan(fastkernels.pct_change(np.array([5.0]))[0])
+
+
+@pytest.mark.parametrize("window", [1, 2, 5, 30])
+def test_rolling_std_matches_pandas(backend, window):
+    r = pd.Series(_prices()).pct_change()
+    r.iloc[50] = np.nan
+    expected = r.rolling(window).std(ddof=1).to_numpy()
+    np.testing.assert_allclose(fastkernels.rolling_std(r.to_numpy(), window), expected, rtol=1e-9, equal_nan=True)
+
+
+def test_cum_return_matches_pandas_1d_and_2d(backend):
+    r = pd.Series(_prices()).pct_change()
+    r.iloc[10] = np.nan
+    expected = ((1.0 + r.fillna(0)).cumprod() - 1.0).to_numpy()
+    np.testing.assert_allclose(fastkernels.cum_return(r.to_numpy()), expected, rtol=1e-12)
+
+    wide = pd.DataFrame({"a": _prices(seed=1), "b": _prices(seed=2)}).pct_change()
+    expected_wide = ((1.0 + wide.fillna(0)).cumprod() - 1.0).to_numpy()
+    np.testing.assert_allclose(fastkernels.cum_return(wide.to_numpy()), expected_wide, rtol=1e-12)
+    assert fastkernels.cum_return(np.array([])).shape == (0,)
+
+
+def test_rolling_std_2d_matches_dataframe(backend):
+    wide = pd.DataFrame({"a": _prices(seed=1), "b": _prices(seed=2), "c": _prices(seed=3)}).pct_change()
+    wide.iloc[40, 1] = np.nan
+    expected = wide.rolling(10).std(ddof=1).to_numpy()
+    np.testing.assert_allclose(fastkernels.rolling_std(wide.to_numpy(), 10), expected, rtol=1e-9, equal_nan=True)
+
+
+def test_rolling_std_scale(backend):
+    r = pd.Series(_prices()).pct_change().to_numpy()
+    np.testing.assert_allclose(
+        fastkernels.rolling_std(r, 30, scale=np.sqrt(365.0)),
+        fastkernels.rolling_std(r, 30) * np.sqrt(365.0),
+        rtol=1e-12,
+        equal_nan=True,
+    )
+
+
+def _ref_sharpe_sortino(r: pd.Series, ppy: float) -> tuple[float, float]:
+    r = r.dropna()
+    s = r.std(ddof=1)
+    sharpe = float(r.mean() / s * np.sqrt(ppy)) if s > 0 else float("nan")
+    dd = np.sqrt((r.clip(upper=0) ** 2).mean())
+    sortino = float(r.mean() / dd * np.sqrt(ppy)) if dd > 0 else float("nan")
+    return sharpe, sortino
+
+
+def test_sharpe_sortino_matches_pandas(backend):
+    r = pd.Series(_prices()).pct_change()
+    got = fastkernels.sharpe_sortino(r.to_numpy(), 525600.0)
+    np.testing.assert_allclose(got, _ref_sharpe_sortino(r, 525600.0), rtol=1e-9)
+
+
+def test_sharpe_sortino_degenerate_inputs(backend):
+    assert all(np.isnan(fastkernels.sharpe_sortino(np.array([np.nan, np.nan]), 365.0)))
+    sharpe, sortino = fastkernels.sharpe_sortino(np.array([0.01, 0.01, 0.01]), 365.0)
+    assert np.isnan(sharpe) and np.isnan(sortino)
+    sharpe, sortino = fastkernels.sharpe_sortino(np.array([-0.02]), 365.0)
+    assert np.isnan(sharpe) and sortino == pytest.approx(-np.sqrt(365.0))
+
+
+def test_sharpe_sortino_columns_matches_per_column(backend):
+    wide = pd.DataFrame({"a": _prices(seed=1), "b": _prices(seed=2), "flat": np.ones(200)}).pct_change()
+    sharpe, sortino = fastkernels.sharpe_sortino_columns(wide.to_numpy(), 365.0)
+    for c, col in enumerate(wide.columns):
+        exp_sh, exp_so = _ref_sharpe_sortino(wide[col], 365.0)
+        np.testing.assert_allclose([sharpe[c], sortino[c]], [exp_sh, exp_so], rtol=1e-9, equal_nan=True)
+    empty = fastkernels.sharpe_sortino_columns(np.empty((10, 0)), 365.0)
+    assert empty[0].shape == (0,) and empty[1].shape == (0,)
+
+
+def test_float32_inputs_accumulate_in_float64(backend):
+    r = pd.Series(_prices()).pct_change().to_numpy()
+    r32 = r.astype(np.float32)
+    ref = r32.astype(np.float64)
+    assert fastkernels.rolling_std(r32, 5).dtype == np.float64
+    np.testing.assert_allclose(
+        fastkernels.rolling_std(r32, 5), fastkernels.rolling_std(ref, 5), rtol=1e-9, equal_nan=True
+    )
+    np.testing.assert_allclose(fastkernels.cum_return(r32), fastkernels.cum_return(ref), rtol=1e-12)
+    np.testing.assert_allclose(
+        fastkernels.sharpe_sortino(r32, 365.0), fastkernels.sharpe_sortino(ref, 365.0), rtol=1e-9
+    )
+
+
+def test_precompile_covers_all_kernels(backend):
+    names = fastkernels.precompile()
+    if backend == "numpy":
+        assert names == []
+    else:
+        assert "_rolling_std_nb" in names and "_cum_return_nb" in names
+        assert all(getattr(fastkernels, n).signatures for n in names)
+
+
+@pytest.mark.parametrize("window", [1, 3, 24])
+def test_rolling_std_min_periods_matches_pandas(backend, window):
+    r = pd.Series(_prices(100)).pct_change()
+    r.iloc[[20, 21, 60]] = np.nan
+    expected = r.rolling(window, min_periods=1).std(ddof=1).to_numpy()
+    got = fastkernels.rolling_std(r.to_numpy(), window, min_periods=1)
+    np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-15, equal_nan=True)
+
+
+def test_rolling_std_constant_window_is_exactly_zero(backend):
+    x = np.r_[np.linspace(0.1, 0.5, 10), np.full(12, 0.3), [np.nan], np.full(5, 0.3)]
+    got = fastkernels.rolling_std(x, 5, min_periods=1)
+    expected = pd.Series(x).rolling(5, min_periods=1).std().to_numpy()
+    np.testing.assert_array_equal(got[14:], expected[14:])
+    assert (got[14:][~np.isnan(got[14:])] == 0.0).all()
+
+
+def test_max_drawdown_matches_pandas_1d_and_2d(backend):
+    cum = pd.DataFrame({"a": _prices(seed=1), "b": _prices(seed=2)}) / 100.0 - 1.0
+    cum.iloc[[0, 30], 0] = np.nan
+    expected = (cum.cummax() - cum).max().to_numpy()
+    np.testing.assert_allclose(fastkernels.max_drawdown(cum.to_numpy()), expected, rtol=1e-12)
+    assert fastkernels.max_drawdown(cum["b"].to_numpy()) == pytest.approx(expected[1], rel=1e-12)
+    assert np.isnan(fastkernels.max_drawdown(np.array([np.nan, np.nan])))
+    assert np.isnan(fastkernels.max_drawdown(np.array([])))
+
+
+def test_equity_stats_matches_pandas(backend):
+    eq = pd.Series(_prices(500, seed=31))
+    eq.iloc[[40, 41]] = np.nan  # returns touching NaN are dropped
+    ret = (eq / eq.shift(1) - 1.0).dropna()
+    wins, losses = ret[ret > 0], ret[ret < 0]
+    cum = (1 + ret).cumprod()
+    expected = (
+        len(ret),
+        ret.mean(),
+        ret.std(ddof=1),
+        len(wins),
+        wins.mean(),
+        len(losses),
+        losses.mean(),
+        losses.std(ddof=1),
+        (cum.cummax() - cum).max(),
+    )
+    got = fastkernels.equity_stats(eq.to_numpy())
+    assert got[0] == expected[0] and got[3] == expected[3] and got[5] == expected[5]
+    np.testing.assert_allclose(got, expected, rtol=1e-10)
+    assert fastkernels.equity_stats(np.array([1.0]))[0] == 0
+    n, mean, std, *_ = fastkernels.equity_stats(np.array([1.0, 1.1]))
+    assert n == 1 and mean == pytest.approx(0.1) and np.isnan(std)
+
+
+def test_drawdown_matches_pandas_1d_and_2d(backend):
+    cum = pd.DataFrame({"a": _prices(seed=1), "b": _prices(seed=2)}) / 100.0 - 1.0
+    cum.iloc[[0, 30], 0] = np.nan
+    expected = (cum.cummax() - cum).to_numpy()
+    np.testing.assert_allclose(fastkernels.drawdown(cum.to_numpy()), expected, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(fastkernels.drawdown(cum["b"].to_numpy()), expected[:, 1], rtol=1e-12)
+    assert fastkernels.drawdown(np.array([])).shape == (0,)
+
+
+def test_rolling_beta_matches_pandas_on_aligned_pairs(backend):
+    rng = np.random.default_rng(3)
+    f = pd.Series(rng.normal(0, 0.01, 400))
+    f.iloc[[7, 90, 91]] = np.nan
+    f.iloc[200:230] = 0.002  # flat factor window -> var 0 -> NaN
+    wide = pd.DataFrame(0.8 * f.to_numpy()[:, None] + rng.normal(0, 0.01, (400, 3)), columns=list("abc"))
+    wide.iloc[:50, 1] = np.nan
+    wide.iloc[[10, 11, 150], 2] = np.nan
+    got = fastkernels.rolling_beta(wide.to_numpy(), f.to_numpy(), 24)
+    for c, col in enumerate(wide.columns):
+        both = wide[col].notna() & f.notna()
+        x, y = wide[col][both], f[both]
+        var_f = y.rolling(24).var(ddof=1)
+        expected = (x.rolling(24).cov(y) / var_f).where(var_f > 0)
+        np.testing.assert_allclose(got[both.to_numpy(), c], expected.to_numpy(), rtol=1e-8, atol=1e-12, equal_nan=True)
+        assert np.isnan(got[~both.to_numpy(), c]).all()
+    np.testing.assert_allclose(
+        fastkernels.rolling_beta(wide["a"].to_numpy(), f.to_numpy(), 24), got[:, 0], rtol=1e-12, equal_nan=True
+    )
+
+
+@pytest.mark.parametrize("window", [2, 24])
+def test_rolling_corr_matches_pandas(backend, window):
+    rng = np.random.default_rng(5)
+    y = pd.Series(rng.normal(0, 0.01, 300))
+    y.iloc[[40, 41, 200]] = np.nan
+    wide = pd.DataFrame(0.5 * y.to_numpy()[:, None] + rng.normal(0, 0.01, (300, 3)), columns=list("abc"))
+    wide.iloc[:30, 1] = np.nan
+    wide.iloc[100:140, 2] = 0.003  # constant window -> NaN (pandas: 0/0 or inf)
+    got = fastkernels.rolling_corr(wide.to_numpy(), y.to_numpy(), window)
+    for c, col in enumerate(wide.columns):
+        expected = wide[col].rolling(window).corr(y).to_numpy()
+        expected[~np.isfinite(expected)] = np.nan
+        if window == 2:  # two points are always perfectly (anti)correlated; pandas rounding can miss +-1 slightly
+            np.testing.assert_allclose(got[:, c], expected, atol=1e-6, equal_nan=True)
+        else:
+            np.testing.assert_allclose(got[:, c], expected, rtol=1e-7, atol=1e-10, equal_nan=True)
+    assert np.isnan(got[100 + window - 1 : 140, 2]).all()
+    np.testing.assert_allclose(
+        fastkernels.rolling_corr(wide["a"].to_numpy(), y.to_numpy(), window), got[:, 0], rtol=1e-12, equal_nan=True
+    )
+
+
+def test_rolling_corr_beta_single_pass_matches_separate_kernels(backend):
+    rng = np.random.default_rng(9)
+    f = rng.normal(0, 0.01, 500)
+    f[100:160] = 0.001  # flat factor window -> both NaN
+    x = 1.3 * f + rng.normal(0, 0.01, 500)
+    corr, beta = fastkernels.rolling_corr_beta(x, f, 48)
+    np.testing.assert_allclose(corr, fastkernels.rolling_corr(x, f, 48), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(beta, fastkernels.rolling_beta(x, f, 48), rtol=1e-9, equal_nan=True)
+    assert np.isnan(beta[147:160]).all() and np.isnan(corr[147:160]).all() and np.isnan(corr[:47]).all()
+
+
+@pytest.mark.parametrize("window", [2, 21, 72])
+def test_rolling_zscore_matches_pandas(backend, window):
+    rng = np.random.default_rng(13)
+    s = pd.Series(np.abs(rng.normal(0.01, 0.004, 400)))
+    s.iloc[[30, 31, 250]] = np.nan
+    s.iloc[300:380] = 0.007  # constant windows -> NaN (pandas: std 0)
+    roll = s.rolling(window)
+    std = roll.std(ddof=1)
+    expected = ((s - roll.mean()) / std).where(std > 0).to_numpy()
+    got = fastkernels.rolling_zscore(s.to_numpy(), window)
+    np.testing.assert_allclose(got, expected, rtol=1e-7, atol=1e-9, equal_nan=True)
+    assert np.isnan(got[300 + window - 1 : 380]).all()
+
+
+def test_row_std_matches_dataframe_std(backend):
+    rng = np.random.default_rng(17)
+    df = pd.DataFrame(rng.normal(0, 0.01, (500, 6)))
+    df.iloc[::7, 2] = np.nan
+    df.iloc[10, :5] = np.nan  # one value -> NaN
+    df.iloc[11, :] = np.nan
+    df.iloc[12, :] = 0.004  # flat row -> 0
+    got = fastkernels.row_std(df.to_numpy())
+    np.testing.assert_allclose(got, df.std(axis=1, ddof=1).to_numpy(), rtol=1e-12, atol=1e-15, equal_nan=True)
+    assert np.isnan(got[[10, 11]]).all() and got[12] == 0.0
+
+
+def test_beta_columns_matches_per_column_beta(backend):
+    from crypto_analyzer.features import compute_beta_vs_factor
+
+    rng = np.random.default_rng(23)
+    f = pd.Series(rng.normal(0, 0.01, 400))
+    df = pd.DataFrame({i: 0.5 * i * f + rng.normal(0, 0.005, 400) for i in range(5)})
+    f.iloc[::11] = np.nan
+    df.iloc[::5, 1] = np.nan
+    df.iloc[1:, 3] = np.nan  # one aligned row -> NaN
+    got = fastkernels.beta_columns(df.to_numpy(), f.to_numpy())
+    ref = [compute_beta_vs_factor(df[c], f) for c in df.columns]
+    np.testing.assert_allclose(got, ref, rtol=1e-10, equal_nan=True)
+    assert np.isnan(got[3])
+    flat = fastkernels.beta_columns(df.to_numpy(), np.zeros(400))
+    assert np.isnan(flat).all()
+
+
+def _trailing_stop_reference(close, z, z_entry, stop_pct, position_pct, start):
+    pos = np.zeros(len(close))
+    hw = close.copy()
+    for i in range(1, len(close)):
+        if i < start or np.isnan(z[i]):
+            pos[i] = pos[i - 1]
+        elif pos[i - 1] == 0 and z[i] >= z_entry:
+            pos[i] = position_pct
+        elif pos[i - 1] > 0:
+            hw[i] = max(hw[i - 1], close[i])
+            pos[i] = 0.0 if close[i] < hw[i] * (1 - stop_pct) else pos[i - 1]
+    return pos
+
+
+def test_trailing_stop_position_matches_reference(backend):
+    close = _prices(2000, seed=29)
+    z = np.random.default_rng(29).normal(0, 1, 2000)
+    z[[100, 101, 900]] = np.nan
+    got = fastkernels.trailing_stop_position(close, z, 1.5, 0.01, 0.25, 24)
+    np.testing.assert_array_equal(got, _trailing_stop_reference(close, z, 1.5, 0.01, 0.25, 24))
+    assert set(np.unique(got)) == {0.0, 0.25} and (got[:24] == 0).all()
+    assert fastkernels.trailing_stop_position(np.array([]), np.array([]), 1.0, 0.05, 0.25, 1).size == 0
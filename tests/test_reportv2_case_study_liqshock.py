@@ -144,3 +144,29 @@ def test_case_study_liqshock_arg_triggers_renderer():
             Path(db_path).unlink(missing_ok=True)
         except PermissionError:
             pass
+
+
+def test_top10_valuable_pairs_column_stats():
+    """Per-pair OOS stats come out as the per-column median / p10 / missing% / event rate."""
+    from crypto_analyzer.cli.case_study_liqshock_renderer import _raw_z_pre_negation, _top10_valuable_pairs
+
+    rng = np.random.default_rng(4)
+    idx = pd.date_range("2025-01-01", periods=120, freq="h")
+    cols = pd.Index([f"pair_{i}" for i in range(8)])
+    liq = pd.DataFrame(np.exp(rng.normal(13.5, 1.0, (120, 8))), index=idx, columns=cols)
+    liq.iloc[::9, 2] = 0.0
+    liq.iloc[::11, 4] = np.nan
+    returns_df = pd.DataFrame(0.0, index=idx[20:], columns=cols)
+    rows = _top10_valuable_pairs(returns_df, liq, returns_df.index, p10_liq_floor=0.0)
+    assert rows and len(rows) <= 10
+    oos = liq.reindex(returns_df.index)
+    raw_z = _raw_z_pre_negation(liq, returns_df.index, cols)
+    for row in rows:
+        s = oos[row["pair"]]
+        assert row["median_liquidity_usd"] == s.median()
+        assert row["p10_liquidity_usd"] == s.quantile(0.10)
+        assert row["missing_pct"] == 100.0 * ((s.isna()) | (s <= 0)).sum() / len(s)
+        assert row["event_rate"] == (raw_z[row["pair"]] < -2).sum() / len(s)
+        assert row["opportunity_score"] == row["event_rate"] * row["median_liquidity_usd"]
+    scores = [r["opportunity_score"] for r in rows]
+    assert scores == sorted(scores, reverse=True)
@@ -1,12 +1,18 @@
-"""Cumulative return from log returns; drawdown correctness."""
+"""Cumulative return from log returns; drawdown correctness; correlation matrix; panel beta; OHLC bar aggregation."""
 
 import numpy as np
 import pandas as pd
 
 from crypto_analyzer.features import (
+    compute_beta_vs_factor,
+    compute_beta_vs_factor_panel,
+    compute_correlation_matrix,
     compute_drawdown_from_equity,
+    compute_rolling_beta,
     cumulative_returns_log,
+    latest_rolling_beta,
     log_returns,
+    resample_ohlc,
 )
 
 
@@ -31,3 +37,76 @@ def test_drawdown_correctness():
     assert (dd_ser <= 0).all()
     assert max_dd <= 0
     assert dd_ser.min() == max_dd
+
+
+def test_correlation_matrix_matches_pandas_pairwise():
+    """Pairwise-complete correlation equals DataFrame.corr, incl. ragged NaNs and zero-variance columns."""
+    rng = np.random.default_rng(0)
+    common = rng.normal(0, 0.01, (300, 1))
+    df = pd.DataFrame(common + rng.normal(0, 0.01, (300, 4)), columns=list("abcd"))
+    df.iloc[:40, 1] = np.nan
+    df.iloc[[5, 77, 150], 2] = np.nan
+    df["flat"] = 0.25
+    df["empty"] = np.nan
+    pd.testing.assert_frame_equal(compute_correlation_matrix(df), df.corr(), rtol=1e-10, atol=1e-12)
+    assert compute_correlation_matrix(df[["a"]]).empty
+
+
+def test_beta_panel_matches_per_column_beta():
+    """Panel beta equals compute_beta_vs_factor per column, incl. ragged NaNs, a flat factor stretch and short columns."""
+    rng = np.random.default_rng(3)
+    idx = pd.date_range("2024-01-01", periods=400, freq="1h")
+    f = pd.Series(rng.normal(0, 0.01, len(idx)), index=idx)
+    f.iloc[[3, 50, 51]] = np.nan
+    df = pd.DataFrame({c: b * f.to_numpy() + rng.normal(0, 0.005, len(idx)) for c, b in zip("abc", (0.5, 1.2, 2.0))})
+    df.index = idx
+    df.iloc[:120, 1] = np.nan
+    df["short"] = np.nan
+    df.iloc[10, 3] = 0.01
+    df["flat_factor"] = np.nan
+    df.iloc[200:210, 4] = 0.02
+    f.iloc[200:210] = 0.0
+    out = compute_beta_vs_factor_panel(df, f.iloc[5:])
+    expected = pd.Series({c: compute_beta_vs_factor(df[c], f.iloc[5:]) for c in df.columns})
+    pd.testing.assert_series_equal(out, expected, rtol=1e-10)
+    assert out[["short", "flat_factor"]].isna().all() and out[["a", "b", "c"]].notna().all()
+
+
+def test_latest_rolling_beta_matches_last_rolling_value():
+    """Final-window beta equals the last defined compute_rolling_beta value, incl. a flat final factor window."""
+    rng = np.random.default_rng(21)
+    idx = pd.date_range("2024-01-01", periods=300, freq="1h")
+    f = pd.Series(rng.normal(0, 0.01, len(idx)), index=idx)
+    a = pd.Series(0.8 * f.to_numpy() + rng.normal(0, 0.004, len(idx)), index=idx)
+    a.iloc[[7, 150]] = np.nan
+    for window in (24, 72):
+        expected = compute_rolling_beta(a, f, window).dropna().iloc[-1]
+        assert abs(latest_rolling_beta(a, f, window) - expected) < 1e-10
+    f_flat = f.copy()
+    f_flat.iloc[-30:] = 0.0
+    expected = compute_rolling_beta(a, f_flat, 24).dropna().iloc[-1]
+    assert latest_rolling_beta(a, f_flat, 24) == expected
+    assert np.isnan(latest_rolling_beta(a.iloc[:10], f, 24))
+
+
+def test_resample_ohlc_matches_pandas_resample():
+    """Bucketed OHLC + last-valid extras equal resample().ohlc()/.last() on occupied buckets, NaNs skipped."""
+    rng = np.random.default_rng(1)
+    n = 3000
+    ts = pd.Timestamp("2026-01-01 07:13", tz="UTC") + pd.to_timedelta(np.sort(rng.integers(0, 86400 * 3, n)), unit="s")
+    g = pd.DataFrame(
+        {
+            "ts_utc": ts,
+            "price_usd": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+            "liquidity_usd": rng.uniform(1, 2, n),
+        }
+    )
+    g.loc[rng.random(n) < 0.2, "price_usd"] = np.nan
+    g.loc[rng.random(n) < 0.9, "liquidity_usd"] = np.nan
+    gi = g.set_index("ts_utc")
+    for freq in ["5min", "1h", "1D", "7min"]:
+        expected = gi["price_usd"].resample(freq).ohlc().dropna(subset=["close"])
+        expected["liquidity_usd"] = gi["liquidity_usd"].resample(freq).last().reindex(expected.index)
+        got = resample_ohlc(g, freq, last_cols=("liquidity_usd",))
+        pd.testing.assert_frame_equal(got, expected, check_freq=False)
+    assert resample_ohlc(g.assign(price_usd=np.nan), "1h").empty
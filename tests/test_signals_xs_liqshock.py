@@ -136,3 +136,21 @@ def test_sixteen_deterministic_variant_names():
                                 seen.add((N, p, c))
                                 break
     assert len(seen) == 16
+
+
+def test_winsorize_cross_section_matches_row_quantiles():
+    """Each timestamp is clipped to its own [p, 1-p] quantiles; rows with < 2 values pass through."""
+    from crypto_analyzer.signals_xs import winsorize_cross_section
+
+    rng = np.random.default_rng(6)
+    df = pd.DataFrame(rng.standard_t(2, (N_TS, N_COLS)))
+    df.iloc[3, 1:] = np.nan
+    df.iloc[4] = np.nan
+    df.iloc[5, 2] = np.nan
+    out = winsorize_cross_section(df, p=0.1)
+    for t in df.index:
+        row = df.loc[t]
+        if row.count() < 2:
+            pd.testing.assert_series_equal(out.loc[t], row)
+        else:
+            pd.testing.assert_series_equal(out.loc[t], row.clip(row.quantile(0.1), row.quantile(0.9)))
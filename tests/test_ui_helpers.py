@@ -0,0 +1,51 @@
+"""UI helpers: plot downsampling keeps extremes and endpoints; display frames use Arrow-backed strings."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from crypto_analyzer.ui import downsample_minmax, safe_for_streamlit_df
+
+
+def test_downsample_minmax_short_series_unchanged():
+    s = pd.Series([1.0, 2.0, 3.0])
+    assert downsample_minmax(s, max_points=10) is s
+
+
+def test_downsample_minmax_keeps_extremes_and_endpoints():
+    rng = np.random.default_rng(0)
+    idx = pd.date_range("2024-01-01", periods=50_001, freq="5min")
+    s = pd.Series(np.cumsum(rng.normal(0, 1, len(idx))), index=idx)
+    s.iloc[12_345] = s.max() + 100.0
+    s.iloc[33_333] = s.min() - 100.0
+    out = downsample_minmax(s, max_points=1000)
+    assert len(out) <= 1002
+    assert out.index.is_monotonic_increasing and out.index.is_unique
+    assert out.index[0] == idx[0] and out.index[-1] == idx[-1]
+    assert out.max() == s.max() and out.min() == s.min()
+    pd.testing.assert_series_equal(out, s.loc[out.index])
+
+
+def test_downsample_minmax_keeps_nan_gap():
+    s = pd.Series(np.arange(10_000, dtype=float))
+    s.iloc[4_000:6_000] = np.nan
+    out = downsample_minmax(s, max_points=200)
+    assert out.isna().any()
+    assert out.dropna().min() == 0.0 and out.dropna().max() == 9_999.0
+
+
+def test_safe_df_casts_labels_to_arrow_strings():
+    df = pd.DataFrame(
+        {
+            "regime": pd.Series(["high", None, "low"], dtype=object),
+            "state": pd.Categorical(["a", "b", "a"]),
+            "x": [1.0, np.nan, 3.0],
+        }
+    )
+    out = safe_for_streamlit_df(df)
+    assert str(out["regime"].dtype) == "string" and str(out["state"].dtype) == "string"
+    assert out["regime"].dtype.storage == "pyarrow"
+    assert out["regime"].tolist()[0::2] == ["high", "low"] and out["regime"].isna().tolist() == [False, True, False]
+    pd.testing.assert_series_equal(out["x"], df["x"])
+    assert str(df["regime"].dtype) == "object"  # input untouched
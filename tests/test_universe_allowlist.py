@@ -571,3 +571,21 @@ def test_persist_universe_allowlist_table():
         assert "USDC" in (by_addr["addr1"][6] or "")
     finally:
         Path(path).unlink(missing_ok=True)
+
+
+def test_ensure_db_indexes_and_backfills_ts_epoch():
+    """ensure_db on a pre-ts_epoch table adds the column, its index, and fills existing rows."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE sol_monitor_snapshots (id INTEGER PRIMARY KEY AUTOINCREMENT, ts_utc TEXT NOT NULL, "
+        "chain_id TEXT NOT NULL, pair_address TEXT NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO sol_monitor_snapshots (ts_utc, chain_id, pair_address) VALUES (?, ?, ?)",
+        ("2026-01-01T00:01:30+00:00", "solana", "addr1"),
+    )
+    ensure_db(conn)
+    assert conn.execute("SELECT ts_epoch FROM sol_monitor_snapshots").fetchone()[0] == 1767225690
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(sol_monitor_snapshots)")}
+    assert "idx_sol_monitor_epoch" in indexes
+    conn.close()
@@ -1,9 +1,10 @@
-"""Walk-forward backtest: stitched OOS index, import without path hacks."""
+"""Walk-forward backtest: stitched OOS index, parallel folds, precomputed positions, import without path hacks."""
 
 import subprocess
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -62,3 +63,55 @@ def test_splits_non_overlapping_train_test():
         train_set = set(train_idx)
         test_set = set(test_idx)
         assert train_set.isdisjoint(test_set), "train and test must be disjoint"
+
+
+def _two_pair_bars(n: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    index = pd.date_range("2020-01-01", periods=n, freq="1h")
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "ts_utc": index,
+                    "chain_id": 1,
+                    "pair_address": addr,
+                    "close": 100.0 * np.exp(np.cumsum(rng.normal(0, 0.02, n))),
+                    "liquidity_usd": 1e6,
+                }
+            )
+            for addr in ("0xabc", "0xdef")
+        ],
+        ignore_index=True,
+    )
+
+
+def test_parallel_folds_match_sequential():
+    """workers > 1 runs folds in worker processes with the same stitched equity and fold metrics."""
+    bars_df = _two_pair_bars()
+    kw = dict(train_bars=60, test_bars=80, step_bars=80, params={"z_entry": 1.0})
+    seq = run_walkforward_backtest(bars_df, "1h", "volatility_breakout", **kw)
+    par = run_walkforward_backtest(bars_df, "1h", "volatility_breakout", workers=2, **kw)
+    assert len(seq[2]) >= 2
+    pd.testing.assert_series_equal(par[0], seq[0])
+    pd.testing.assert_frame_equal(par[1], seq[1])
+
+
+@pytest.mark.parametrize("strategy", ["trend", "volatility_breakout"])
+def test_precomputed_positions_are_sliced_per_fold(strategy):
+    """precompute_positions=True costs each test fold's slice of the full-history positions."""
+    from crypto_analyzer.backtest_core import run_positions, strategy_positions
+
+    bars_df = _two_pair_bars()
+    kw = dict(train_bars=60, test_bars=80, step_bars=80, params={"z_entry": 1.0}, precompute_positions=True)
+    stitched, fold_df, fold_metrics = run_walkforward_backtest(bars_df, "1h", strategy, **kw)
+    assert len(fold_metrics) == 4
+
+    positions = strategy_positions(bars_df, strategy, z_entry=1.0)
+    for met in fold_metrics:
+        in_fold = positions["ts_utc"].between(met["test_start"], met["test_end"])
+        _, equity = run_positions(positions[in_fold], 0.25, fee_bps=30.0)
+        pd.testing.assert_series_equal(stitched.loc[equity.index], equity, check_names=False, check_freq=False)
+
+    par = run_walkforward_backtest(bars_df, "1h", strategy, workers=2, **kw)
+    pd.testing.assert_series_equal(par[0], stitched)
+    pd.testing.assert_frame_equal(par[1], fold_df)
@@ -2,21 +2,56 @@
 from __future__ import annotations
 
 import argparse
+import json
+import multiprocessing
 import os
 import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
 
-import matplotlib.pyplot as plt
+import matplotlib
 import numpy as np
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Headless unless --show: pick Agg before pyplot loads so no GUI backend is probed or initialised.
+if "--show" not in sys.argv[1:]:
+    matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from crypto_analyzer.fastkernels import (  # noqa: E402
+    cum_return,
+    pct_change,
+    rolling_std,
+    sharpe_sortino,
+    sharpe_sortino_columns,
+)
+
 DB_PATH = "dex_data.sqlite"
 OUT_DIR = "plots"
+CACHE_DIR = os.path.join(OUT_DIR, ".cache")  # bucketed bars from earlier runs (Parquet + JSON sidecar)
 SHOW_PLOTS = False  # set True or use --show to display plot windows after saving
 
 # matches your poller table
 TABLE = "sol_monitor_snapshots"
 SPOT_TABLE = "spot_price_snapshots"
 
+# Read-side SQLite tuning for the snapshot scans. WAL lets the poller keep appending while we read;
+# the 200 MB page cache and 256 MB mmap keep the hot snapshot table resident across the two queries.
+SQLITE_READ_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-200000;
+PRAGMA mmap_size=268435456;
+PRAGMA temp_store=MEMORY;
+"""
+
 # Set True once you have at least a day of data for meaningful daily returns/vol
 DAILY_MODE = False
 
@@ -36,32 +71,294 @@ else:
     DEFAULT_MIN_POINTS_FOR_RATIOS = 300
 
 
-def sharpe_ratio(r: pd.Series, periods_per_year: float) -> float:
-    r = r.dropna()
-    if r.empty:
-        return float("nan")
-    s = r.std(ddof=1)
-    if s == 0 or np.isnan(s):
-        return float("nan")
-    return float((r.mean() / s) * np.sqrt(periods_per_year))
+def fetch_float_frame(conn: sqlite3.Connection, sql: str, params: dict, columns: list[str]) -> pd.DataFrame:
+    """
+    Run a query whose columns are all numeric and return them as one float64 block (NULL -> NaN).
+    Skips read_sql_query's per-column object boxing and type inference.
+    """
+    rows = conn.execute(sql, params).fetchall()
+    return pd.DataFrame(np.array(rows, dtype=np.float64).reshape(-1, len(columns)), columns=columns)
+
+
+def since_params(since_bucket: int, bucket_secs: int) -> dict:
+    """
+    Lower time bound of since_bucket as epoch seconds (for ts_epoch) and as an ISO string in the
+    writers' utc_now_iso format (for ts_utc, whose string order then matches time order).
+    """
+    since_ts = since_bucket * bucket_secs
+    return {
+        "since_ts": since_ts,
+        "since_iso": datetime.fromtimestamp(since_ts, timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def load_bars_cached(label: str, bucket_secs: int, fetch, fingerprint, use_cache: bool = True) -> pd.DataFrame:
+    """
+    Bars (with an integer-valued 'bucket' column) for label, reusing CACHE_DIR/<label>_<freq>.parquet.
+    fetch(since_bucket) must return the bars with bucket >= since_bucket. Only buckets from the last
+    cached one onwards are queried; that bucket is re-read because it may have been partial when cached.
+    fingerprint(since_bucket) must return a cheap JSON-able summary of the source rows before
+    since_bucket (e.g. first timestamp, row count, max id); the cache is dropped when it no longer
+    matches the one stored in the sidecar, so deleted or backfilled history is re-read.
+    """
+    path = os.path.join(CACHE_DIR, f"{label}_{RESAMPLE_FREQ}.parquet")
+    meta_path = path[: -len(".parquet")] + ".json"
+    cached = None
+    since = 0
+    if use_cache and os.path.exists(path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("bucket_secs") == bucket_secs:
+                since = int(meta["last_bucket"])
+                if meta.get("fingerprint") == list(fingerprint(since)):
+                    cached = pd.read_parquet(path)
+        except (OSError, ValueError, KeyError):
+            cached = None
+        if cached is None:
+            since = 0
+
+    fresh = fetch(since)
+    if cached is not None and list(cached.columns) != list(fresh.columns):
+        cached, since, fresh = None, 0, fetch(0)  # query columns changed since the cache was written
+    bars = fresh if cached is None else pd.concat([cached[cached["bucket"] < since], fresh], ignore_index=True)
+
+    if use_cache and not bars.empty:
+        last_bucket = int(bars["bucket"].max())
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        bars.to_parquet(path, index=False)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"bucket_secs": bucket_secs, "last_bucket": last_bucket, "fingerprint": list(fingerprint(last_bucket))},
+                f,
+            )
+    return bars
+
+
+_SHARED_FIG = None
+
+
+def new_axes(show: bool):
+    """
+    Axes for the next plot. With show=True each plot gets its own pyplot window; otherwise one
+    Agg-backed Figure outside pyplot's registry (tight layout set once) is cleared and reused,
+    avoiding per-plot figure/font/artist setup and pyplot's global state.
+    """
+    global _SHARED_FIG
+    if show:
+        return plt.figure(layout="tight").add_subplot()
+    if _SHARED_FIG is None:
+        _SHARED_FIG = Figure(layout="tight", dpi=150)
+        FigureCanvasAgg(_SHARED_FIG)
+    _SHARED_FIG.clf()
+    return _SHARED_FIG.add_subplot()
+
+
+def save_axes(ax, path: str, title: str, xlabel: str | None = None, ylabel: str | None = None) -> None:
+    """Label ax and save its figure to path (PNG, 150 dpi)."""
+    ax.set_title(title)
+    if xlabel is not None:
+        ax.set_xlabel(xlabel)
+    if ylabel is not None:
+        ax.set_ylabel(ylabel)
+    if ax.figure is _SHARED_FIG:
+        ax.figure.canvas.print_png(path)
+    else:
+        ax.figure.savefig(path, dpi=150)
+
+
+def connect_read(db_path: str) -> sqlite3.Connection:
+    """SQLite connection with SQLITE_READ_PRAGMAS applied."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SQLITE_READ_PRAGMAS)
+    return conn
+
+
+def load_dex_bars(
+    conn: sqlite3.Connection, bucket_secs: int, use_cache: bool = True, pair: tuple[str, str] | None = None
+) -> pd.DataFrame:
+    """
+    Last dex snapshot per RESAMPLE_FREQ bucket from TABLE (optionally one (chain_id, pair_address)),
+    indexed by bucket start (UTC), via the Parquet bar cache.
+    """
+    # Integer ts_epoch (filled by the writers / migrations) avoids parsing ts_utc strings per row, and the
+    # range filters use the bare indexed columns (idx_sol_monitor_epoch / idx_sol_monitor_ts) so SQLite seeks
+    # instead of scanning. Databases that predate ts_epoch fall back to ts_utc.
+    dex_cols = {row[1] for row in conn.execute(f"PRAGMA table_info({TABLE})")}
+    if "ts_epoch" in dex_cols:
+        dex_epoch = "COALESCE(ts_epoch, CAST(strftime('%s', ts_utc) AS INTEGER))"
+        dex_time, dex_since = "ts_epoch", ":since_ts"
+    else:
+        dex_epoch = "CAST(strftime('%s', ts_utc) AS INTEGER)"
+        dex_time, dex_since = "ts_utc", ":since_iso"
+    pair_filter = "chain_id = :chain_id AND pair_address = :pair_address AND" if pair is not None else ""
+    params = {"secs": bucket_secs}
+    if pair is not None:
+        params.update(chain_id=pair[0], pair_address=pair[1])
+
+    def fetch_dex(since: int) -> pd.DataFrame:
+        return fetch_float_frame(
+            conn,
+            f"""
+            SELECT bucket, spot_price_usd, dex_price_usd, liquidity_usd, vol_h24
+            FROM (
+                SELECT {dex_epoch} / :secs AS bucket,
+                       spot_price_usd, dex_price_usd, liquidity_usd, vol_h24,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY {dex_epoch} / :secs
+                           ORDER BY ts_utc DESC
+                       ) AS rn
+                FROM {TABLE}
+                WHERE {pair_filter} {dex_time} >= {dex_since}
+            )
+            WHERE rn = 1 AND bucket IS NOT NULL
+            ORDER BY bucket ASC
+            """,
+            {**params, **since_params(since, bucket_secs)},
+            ["bucket", "spot_price_usd", "dex_price_usd", "liquidity_usd", "vol_h24"],
+        )
 
+    def fingerprint_dex(since: int) -> tuple:
+        return conn.execute(
+            f"SELECT MIN({dex_time}), COUNT(*), MAX(id) FROM {TABLE} WHERE {pair_filter} {dex_time} < {dex_since}",
+            {**params, **since_params(since, bucket_secs)},
+        ).fetchone()
+
+    label = TABLE if pair is None else f"{TABLE}_{pair[0]}_{pair[1]}"
+    dex_df = load_bars_cached(label, bucket_secs, fetch_dex, fingerprint_dex, use_cache=use_cache)
+    dex_index = pd.to_datetime(dex_df.pop("bucket").astype(np.int64) * bucket_secs, unit="s", utc=True)
+    # Liquidity/volume are only plotted, so float32 is plenty. Prices stay float64: pct_change on float32
+    # prices cancels to a few 1e-6 relative error in Sharpe/Sortino.
+    return dex_df.set_axis(dex_index.rename("ts_utc")).astype({"liquidity_usd": np.float32, "vol_h24": np.float32})
+
+
+def list_pairs(conn: sqlite3.Connection) -> list[tuple[str, str, str]]:
+    """(chain_id, pair_address, label) for every pair in TABLE; label is BASE/QUOTE when known."""
+    rows = conn.execute(
+        f"""
+        SELECT chain_id, pair_address, MAX(base_symbol), MAX(quote_symbol)
+        FROM {TABLE}
+        GROUP BY chain_id, pair_address
+        ORDER BY chain_id, pair_address
+        """
+    ).fetchall()
+    return [(c, a, f"{b}/{q}" if b and q else f"{c}:{a}") for c, a, b, q in rows]
+
+
+def series_stats(price: pd.Series) -> tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
+    """(simple returns, cumulative return, rolling std, annualized rolling std) of a bar price series."""
+    r_arith = pd.Series(pct_change(price.to_numpy()), index=price.index)
+    cum_ret = pd.Series(cum_return(r_arith.to_numpy()), index=r_arith.index)
+    roll_vol = pd.Series(rolling_std(r_arith.to_numpy(), ROLLING_WINDOW), index=r_arith.index)
+    roll_vol_ann = roll_vol * np.sqrt(PERIODS_PER_YEAR)  # both scales are plotted, so one multiply is needed
+    return r_arith, cum_ret, roll_vol, roll_vol_ann
+
+
+def plot_series_set(
+    out_dir: str,
+    prefix: str,
+    label: str,
+    price_title: str,
+    price: pd.Series,
+    stats: tuple[pd.Series, pd.Series, pd.Series, pd.Series],
+    liq: pd.Series,
+    liq_title: str,
+    show: bool,
+) -> list[str]:
+    """Price, cumulative return, return histogram, rolling vol, vol clustering and liquidity plots; returns paths."""
+    r_arith, cum_ret, roll_vol, roll_vol_ann = stats
+    saved: list[str] = []
 
-def sortino_ratio(r: pd.Series, periods_per_year: float) -> float:
-    r = r.dropna()
-    if r.empty:
-        return float("nan")
-    downside = r.clip(upper=0)
-    dd = np.sqrt((downside**2).mean())
-    if dd == 0 or np.isnan(dd):
-        return float("nan")
-    return float((r.mean() / dd) * np.sqrt(periods_per_year))
+    # 1) Price
+    ax = new_axes(show)
+    price.plot(ax=ax)
+    p1 = os.path.join(out_dir, f"{prefix}_price.png")
+    save_axes(ax, p1, price_title, "Time (UTC)", "USD")
+    saved.append(p1)
 
+    # 2) Cumulative return
+    ax = new_axes(show)
+    cum_ret.plot(ax=ax)
+    p2 = os.path.join(out_dir, f"{prefix}_cum_return.png")
+    save_axes(ax, p2, f"{label} Cumulative Return", "Time (UTC)", "Cumulative Return")
+    saved.append(p2)
 
-def savefig_and_maybe_show(path: str, show: bool) -> None:
-    """Save figure to path. If show=False, close figure immediately."""
-    plt.savefig(path, dpi=150)
-    if not show:
-        plt.close()
+    # 3) Return histogram
+    ax = new_axes(show)
+    r_valid = r_arith.to_numpy()
+    counts, edges = np.histogram(r_valid[~np.isnan(r_valid)], bins=50)
+    ax.stairs(counts, edges, fill=True)
+    ax.grid(True)
+    p3 = os.path.join(out_dir, f"{prefix}_return_hist.png")
+    save_axes(ax, p3, f"{label} Return Histogram (Arithmetic)", "Return", "Frequency")
+    saved.append(p3)
+
+    # 4) Rolling vol (annualized)
+    ax = new_axes(show)
+    roll_vol_ann.plot(ax=ax)
+    window_label = f"{ROLLING_WINDOW} days" if DAILY_MODE else f"{ROLLING_WINDOW} bars"
+    p4 = os.path.join(out_dir, f"{prefix}_rolling_vol.png")
+    save_axes(
+        ax, p4, f"{label} Rolling Volatility (annualized, window={window_label})", "Time (UTC)", "Annualized Volatility"
+    )
+    saved.append(p4)
+
+    # 5) Volatility clustering: |returns| + rolling std (NOT annualized)
+    ax = new_axes(show)
+    r_arith.abs().plot(ax=ax, alpha=0.65, label="|return|")
+    roll_vol.plot(ax=ax, label="rolling std")
+    ax.legend()
+    p_cluster = os.path.join(out_dir, f"{prefix}_vol_clusters.png")
+    save_axes(ax, p_cluster, "Volatility clustering: |returns| and rolling volatility", "Time (UTC)")
+    saved.append(p_cluster)
+
+    # 6) Dex liquidity
+    ax = new_axes(show)
+    liq.plot(ax=ax)
+    p5 = os.path.join(out_dir, "dex_liquidity.png")
+    save_axes(ax, p5, liq_title, "Time (UTC)", "Liquidity USD")
+    saved.append(p5)
+    return saved
+
+
+def analyze_pair(
+    db_path: str, chain_id: str, pair_address: str, label: str, min_points_for_ratios: int, use_cache: bool
+) -> tuple[list[str], list[str]]:
+    """
+    Single-pair pipeline on the pair's own dex price (headless; runs in a worker process with its own
+    connection). Returns (report lines, saved plot paths).
+    """
+    bucket_secs = int(pd.Timedelta(RESAMPLE_FREQ).total_seconds())
+    conn = connect_read(db_path)
+    try:
+        dex_df = load_dex_bars(conn, bucket_secs, use_cache=use_cache, pair=(chain_id, pair_address))
+    finally:
+        conn.close()
+
+    price = dex_df["dex_price_usd"].dropna()
+    if len(price) < 3:
+        return [f"[{label}] {len(price)} bars — not enough for returns/vol, skipped."], []
+
+    stats = series_stats(price)
+    lines = [f"[{label}] bars: {len(price)}"]
+    if len(price) >= min_points_for_ratios:
+        sh, so = sharpe_sortino(stats[0].to_numpy(), PERIODS_PER_YEAR)
+        lines.append(f"[{label}] Sharpe={sh:.3f}  Sortino={so:.3f}")
+
+    out_dir = os.path.join(OUT_DIR, "pairs", f"{chain_id}_{pair_address}")
+    os.makedirs(out_dir, exist_ok=True)
+    saved = plot_series_set(
+        out_dir,
+        "pair",
+        label,
+        f"{label} Dex Price (USD)",
+        price,
+        stats,
+        dex_df["liquidity_usd"],
+        f"Dex Liquidity (USD) — {label} pool",
+        False,
+    )
+    return lines, saved
 
 
 def main() -> int:
@@ -76,6 +373,17 @@ def main() -> int:
         default=DEFAULT_MIN_POINTS_FOR_RATIOS,
         help="Min resampled points required before printing Sharpe/Sortino (default based on DAILY_MODE)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore and do not write the bar cache in {CACHE_DIR} (e.g. after editing existing rows in place)",
+    )
+    parser.add_argument(
+        "--per-pair",
+        action="store_true",
+        help=f"Also analyze each (chain_id, pair_address) in {TABLE} on its own dex price, in parallel processes "
+        f"(plots under {OUT_DIR}/pairs/)",
+    )
     args = parser.parse_args()
 
     if args.show:
@@ -86,194 +394,129 @@ def main() -> int:
     print("Analyzer starting...")
     os.makedirs(OUT_DIR, exist_ok=True)
 
-    conn = sqlite3.connect(DB_PATH)
+    # Resampling happens in SQL: one row per RESAMPLE_FREQ bucket (last snapshot wins), so
+    # the poll-rate multiple of raw rows never reaches pandas.
+    bucket_secs = int(pd.Timedelta(RESAMPLE_FREQ).total_seconds())
+
+    conn = connect_read(DB_PATH)
     try:
         tables = conn.execute("select name from sqlite_master where type='table'").fetchall()
         print("Tables:", tables)
         if (TABLE,) not in tables:
             raise SystemExit(f"Table '{TABLE}' not found.")
 
-        # Dex metrics (always from sol_monitor for liquidity/vol overlay)
-        dex_df = pd.read_sql_query(
-            f"""
-            SELECT ts_utc, spot_price_usd, liquidity_usd, vol_h24,
-                   txns_h24_buys, txns_h24_sells
-            FROM {TABLE}
-            ORDER BY ts_utc ASC
-            """,
-            conn,
-        )
+        # Dex metrics (always from sol_monitor for liquidity/vol overlay), already bucketed to RESAMPLE_FREQ
+        dex_df = load_dex_bars(conn, bucket_secs, use_cache=not args.no_cache)
+        pairs = list_pairs(conn) if args.per_pair else []
 
-        # Multi-asset: load from spot_price_snapshots if available
-        spot_df = None
-        if (SPOT_TABLE,) in tables:
-            spot_df = pd.read_sql_query(
+        # Multi-asset: load from spot_price_snapshots if available (last price per symbol per bucket).
+        # The ts_utc range filter is left bare so it can use idx_spot_ts_symbol.
+        def fetch_spot(since: int) -> pd.DataFrame:
+            return pd.read_sql_query(
                 f"""
-                SELECT ts_utc, symbol, spot_price_usd
-                FROM {SPOT_TABLE}
-                ORDER BY ts_utc ASC
+                SELECT bucket, symbol, spot_price_usd
+                FROM (
+                    SELECT CAST(strftime('%s', ts_utc) AS INTEGER) / :secs AS bucket,
+                           symbol, spot_price_usd,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY symbol, CAST(strftime('%s', ts_utc) AS INTEGER) / :secs
+                               ORDER BY ts_utc DESC
+                           ) AS rn
+                    FROM {SPOT_TABLE}
+                    WHERE ts_utc >= :since_iso
+                )
+                WHERE rn = 1 AND bucket IS NOT NULL
+                ORDER BY bucket ASC
                 """,
                 conn,
+                params={"secs": bucket_secs, **since_params(since, bucket_secs)},
+            )
+
+        def fingerprint_spot(since: int) -> tuple:
+            return conn.execute(
+                f"SELECT MIN(ts_utc), COUNT(*), MAX(id) FROM {SPOT_TABLE} WHERE ts_utc < :since_iso",
+                since_params(since, bucket_secs),
+            ).fetchone()
+
+        spot_df = None
+        if (SPOT_TABLE,) in tables:
+            spot_df = load_bars_cached(
+                SPOT_TABLE, bucket_secs, fetch_spot, fingerprint_spot, use_cache=not args.no_cache
             )
     finally:
         conn.close()
 
-    print("Loaded rows (dex):", len(dex_df))
+    print(f"Loaded bars (dex, {RESAMPLE_FREQ}):", len(dex_df))
     if dex_df.empty:
         raise SystemExit("No rows yet — let the poller run longer.")
 
-    dex_df["ts_utc"] = pd.to_datetime(dex_df["ts_utc"], utc=True)
-    dex_df = dex_df.set_index("ts_utc")
-
-    multi_asset = False
-    prices_by_symbol: dict[str, pd.Series] = {}
+    prices_multi: pd.DataFrame | None = None
 
     if spot_df is not None and not spot_df.empty:
         symbols = spot_df["symbol"].unique().tolist()
         if len(symbols) >= 2:
-            multi_asset = True
             print("Multi-asset mode: symbols", symbols)
-            for sym in symbols:
-                sub = spot_df[spot_df["symbol"] == sym][["ts_utc", "spot_price_usd"]].copy()
-                sub["ts_utc"] = pd.to_datetime(sub["ts_utc"], utc=True)
-                sub = sub.set_index("ts_utc").sort_index()
-                pr = sub["spot_price_usd"].astype(float).resample(RESAMPLE_FREQ).last().dropna()
-                if len(pr) >= 2:
-                    prices_by_symbol[sym] = pr
+            # One pivot (bucket x symbol) instead of a filter per symbol; SQL already kept one row per pair.
+            wide = spot_df.pivot(index="bucket", columns="symbol", values="spot_price_usd")
+            wide = wide.reindex(columns=symbols).astype(np.float64).rename_axis(columns=None)
+            wide.index = pd.to_datetime(wide.index * bucket_secs, unit="s", utc=True)
+            wide = wide.loc[:, wide.notna().sum() >= 2]
+            # Inner join: only timestamps where every asset has a value (no comparing non-overlapping periods)
+            prices_multi = wide.dropna(how="any")
+            if wide.shape[1] == 0 or len(prices_multi) < 2:
+                prices_multi = None
         else:
             print("Single symbol in spot table; using dex table for SOL.")
 
-    prices_multi: pd.DataFrame | None = None
-
-    if not multi_asset or not prices_by_symbol:
+    if prices_multi is None:
         # Single-asset: use dex table SOL spot price
-        price = dex_df["spot_price_usd"].astype(float).resample(RESAMPLE_FREQ).last().dropna()
-        prices_by_symbol = {"SOL": price}
+        price = dex_df["spot_price_usd"].dropna()
     else:
-        # Inner join: only timestamps where every asset has a value (no comparing non-overlapping periods)
-        prices_multi = pd.DataFrame(prices_by_symbol).dropna(how="any")
-        if prices_multi.empty or len(prices_multi) < 2:
-            multi_asset = False
-            price = dex_df["spot_price_usd"].astype(float).resample(RESAMPLE_FREQ).last().dropna()
-            prices_by_symbol = {"SOL": price}
-            prices_multi = None
-        else:
-            price = prices_multi["SOL"] if "SOL" in prices_multi else prices_multi.iloc[:, 0]
+        price = prices_multi["SOL"] if "SOL" in prices_multi else prices_multi.iloc[:, 0]
 
-    liq = dex_df["liquidity_usd"].astype(float).resample(RESAMPLE_FREQ).last()
-    dex_df["vol_h24"].astype(float).resample(RESAMPLE_FREQ).last()
+    liq = dex_df["liquidity_usd"]
 
     print("Resampled points (SOL series):", len(price))
 
     if len(price) < 3:
         print("Not enough points for returns/vol yet. Saved price plot only.")
-        plt.figure()
-        price.plot()
-        plt.title("SOL Spot Price (USD)")
-        plt.xlabel("Time (UTC)")
-        plt.ylabel("USD")
-        plt.tight_layout()
+        ax = new_axes(SHOW_PLOTS)
+        price.plot(ax=ax)
         outp = os.path.join(OUT_DIR, "sol_spot_price.png")
-        savefig_and_maybe_show(outp, SHOW_PLOTS)
+        save_axes(ax, outp, "SOL Spot Price (USD)", "Time (UTC)", "USD")
         print("Saved:", outp)
         if SHOW_PLOTS:
             plt.show()
         return 0
 
-    # Returns (SOL)
-    r_arith = price.pct_change()
-    cum_return = (1.0 + r_arith.fillna(0)).cumprod() - 1.0
-
-    # Rolling volatility (SOL)
-    roll_vol = r_arith.rolling(ROLLING_WINDOW).std(ddof=1)
-    roll_vol_ann = roll_vol * np.sqrt(PERIODS_PER_YEAR)
+    r_arith, cum_ret, roll_vol, roll_vol_ann = series_stats(price)
 
     n_pts = len(price)
     if n_pts >= min_points_for_ratios:
-        sh = sharpe_ratio(r_arith, PERIODS_PER_YEAR)
-        so = sortino_ratio(r_arith, PERIODS_PER_YEAR)
+        sh, so = sharpe_sortino(r_arith.to_numpy(), PERIODS_PER_YEAR)
         print(f"Sharpe (rf=0):  {sh:.3f}")
         print(f"Sortino (rf=0): {so:.3f}")
 
         if prices_multi is not None:
-            for sym in prices_multi.columns:
-                r = prices_multi[sym].pct_change()
-                print(
-                    f"  {sym}: Sharpe={sharpe_ratio(r, PERIODS_PER_YEAR):.3f}  Sortino={sortino_ratio(r, PERIODS_PER_YEAR):.3f}"
-                )
+            sh_cols, so_cols = sharpe_sortino_columns(prices_multi.pct_change().to_numpy(), PERIODS_PER_YEAR)
+            for sym, sym_sh, sym_so in zip(prices_multi.columns, sh_cols, so_cols):
+                print(f"  {sym}: Sharpe={sym_sh:.3f}  Sortino={sym_so:.3f}")
     else:
         print(f"Need {min_points_for_ratios}+ resampled points for Sharpe/Sortino (have {n_pts}). Plots only.")
 
     # ---- PLOTS ----
-    saved: list[str] = []
-
-    # 1) SOL Price
-    plt.figure()
-    price.plot()
-    plt.title("SOL Spot Price (USD)")
-    plt.xlabel("Time (UTC)")
-    plt.ylabel("USD")
-    plt.tight_layout()
-    p1 = os.path.join(OUT_DIR, "sol_price.png")
-    savefig_and_maybe_show(p1, SHOW_PLOTS)
-    saved.append(p1)
-
-    # 2) SOL Cumulative return
-    plt.figure()
-    cum_return.plot()
-    plt.title("SOL Cumulative Return")
-    plt.xlabel("Time (UTC)")
-    plt.ylabel("Cumulative Return")
-    plt.tight_layout()
-    p2 = os.path.join(OUT_DIR, "sol_cum_return.png")
-    savefig_and_maybe_show(p2, SHOW_PLOTS)
-    saved.append(p2)
-
-    # 3) SOL return histogram
-    plt.figure()
-    r_arith.dropna().hist(bins=50)
-    plt.title("SOL Return Histogram (Arithmetic)")
-    plt.xlabel("Return")
-    plt.ylabel("Frequency")
-    plt.tight_layout()
-    p3 = os.path.join(OUT_DIR, "sol_return_hist.png")
-    savefig_and_maybe_show(p3, SHOW_PLOTS)
-    saved.append(p3)
-
-    # 4) SOL rolling vol (annualized)
-    plt.figure()
-    roll_vol_ann.plot()
+    saved = plot_series_set(
+        OUT_DIR,
+        "sol",
+        "SOL",
+        "SOL Spot Price (USD)",
+        price,
+        (r_arith, cum_ret, roll_vol, roll_vol_ann),
+        liq,
+        "Dex Liquidity (USD) — SOL/USDC pool",
+        SHOW_PLOTS,
+    )
     window_label = f"{ROLLING_WINDOW} days" if DAILY_MODE else f"{ROLLING_WINDOW} bars"
-    plt.title(f"SOL Rolling Volatility (annualized, window={window_label})")
-    plt.xlabel("Time (UTC)")
-    plt.ylabel("Annualized Volatility")
-    plt.tight_layout()
-    p4 = os.path.join(OUT_DIR, "sol_rolling_vol.png")
-    savefig_and_maybe_show(p4, SHOW_PLOTS)
-    saved.append(p4)
-
-    # 5) Volatility clustering: |returns| + rolling std (NOT annualized)
-    plt.figure()
-    r_arith.abs().plot(alpha=0.65, label="|return|")
-    roll_vol.plot(label="rolling std")
-    plt.legend()
-    plt.title("Volatility clustering: |returns| and rolling volatility")
-    plt.xlabel("Time (UTC)")
-    plt.tight_layout()
-    p_cluster = os.path.join(OUT_DIR, "sol_vol_clusters.png")
-    savefig_and_maybe_show(p_cluster, SHOW_PLOTS)
-    saved.append(p_cluster)
-
-    # 6) Dex liquidity
-    plt.figure()
-    liq.plot()
-    plt.title("Dex Liquidity (USD) — SOL/USDC pool")
-    plt.xlabel("Time (UTC)")
-    plt.ylabel("Liquidity USD")
-    plt.tight_layout()
-    p5 = os.path.join(OUT_DIR, "dex_liquidity.png")
-    savefig_and_maybe_show(p5, SHOW_PLOTS)
-    saved.append(p5)
 
     # 7–10) Multi-asset comparison (if we have SOL, ETH, BTC)
     if prices_multi is not None and len(prices_multi.columns) >= 2:
@@ -281,64 +524,80 @@ def main() -> int:
 
         # Normalized price (base 100 at start)
         norm = (prices_multi / prices_multi.iloc[0]) * 100
-        plt.figure()
+        ax = new_axes(SHOW_PLOTS)
         for col in norm.columns:
-            norm[col].plot(label=col)
-        plt.legend()
-        plt.title("Spot price (normalized to 100)")
-        plt.xlabel("Time (UTC)")
-        plt.ylabel("Index")
-        plt.tight_layout()
+            norm[col].plot(ax=ax, label=col)
+        ax.legend()
         p6 = os.path.join(OUT_DIR, "multi_asset_normalized.png")
-        savefig_and_maybe_show(p6, SHOW_PLOTS)
+        save_axes(ax, p6, "Spot price (normalized to 100)", "Time (UTC)", "Index")
         saved.append(p6)
 
         # Cumulative return by asset
-        cum = (1.0 + prices_multi.pct_change().fillna(0)).cumprod() - 1.0
-        plt.figure()
+        cum = pd.DataFrame(
+            cum_return(prices_multi.pct_change().to_numpy()), index=prices_multi.index, columns=prices_multi.columns
+        )
+        ax = new_axes(SHOW_PLOTS)
         for col in cum.columns:
-            cum[col].plot(label=col)
-        plt.legend()
-        plt.title("Cumulative return (all assets)")
-        plt.xlabel("Time (UTC)")
-        plt.ylabel("Cumulative Return")
-        plt.tight_layout()
+            cum[col].plot(ax=ax, label=col)
+        ax.legend()
         p7 = os.path.join(OUT_DIR, "multi_asset_cum_return.png")
-        savefig_and_maybe_show(p7, SHOW_PLOTS)
+        save_axes(ax, p7, "Cumulative return (all assets)", "Time (UTC)", "Cumulative Return")
         saved.append(p7)
 
         # Rolling volatility comparison (annualized)
         rets_multi = prices_multi.pct_change()
-        roll_vol_multi = rets_multi.rolling(ROLLING_WINDOW).std(ddof=1) * np.sqrt(PERIODS_PER_YEAR)
-        plt.figure()
+        roll_vol_multi = pd.DataFrame(
+            rolling_std(rets_multi.to_numpy(), ROLLING_WINDOW, scale=np.sqrt(PERIODS_PER_YEAR)),
+            index=rets_multi.index,
+            columns=rets_multi.columns,
+        )
+        ax = new_axes(SHOW_PLOTS)
         for col in roll_vol_multi.columns:
-            roll_vol_multi[col].plot(label=col)
-        plt.legend()
-        plt.title(f"Rolling Volatility (annualized, window={window_label})")
-        plt.xlabel("Time (UTC)")
-        plt.ylabel("Annualized Volatility")
-        plt.tight_layout()
+            roll_vol_multi[col].plot(ax=ax, label=col)
+        ax.legend()
         p8 = os.path.join(OUT_DIR, "multi_asset_rolling_vol.png")
-        savefig_and_maybe_show(p8, SHOW_PLOTS)
+        save_axes(
+            ax, p8, f"Rolling Volatility (annualized, window={window_label})", "Time (UTC)", "Annualized Volatility"
+        )
         saved.append(p8)
 
         # Correlation matrix of returns
-        corr = rets_multi.dropna().corr()
+        # One corrcoef over the contiguous (assets x bars) block instead of pandas' pairwise loop
+        corr_vals = np.corrcoef(rets_multi.dropna().to_numpy().T)
+        corr = pd.DataFrame(corr_vals, index=rets_multi.columns, columns=rets_multi.columns)
         corr_csv = os.path.join(OUT_DIR, "multi_asset_corr.csv")
         corr.to_csv(corr_csv)
         print("Saved correlation CSV:", corr_csv)
 
-        plt.figure()
-        plt.imshow(corr.values, interpolation="nearest", vmin=-1, vmax=1, cmap="RdBu_r")
-        plt.xticks(range(len(corr.columns)), corr.columns)
-        plt.yticks(range(len(corr.index)), corr.index)
-        plt.colorbar(label="Correlation")
-        plt.title("Return Correlation Matrix")
-        plt.tight_layout()
+        ax = new_axes(SHOW_PLOTS)
+        im = ax.pcolormesh(corr_vals, vmin=-1, vmax=1, cmap="RdBu_r")
+        ticks = np.arange(len(corr.columns)) + 0.5
+        ax.set_xticks(ticks, corr.columns)
+        ax.set_yticks(ticks, corr.index)
+        ax.set_aspect("equal")
+        ax.invert_yaxis()  # first asset on top, as in a matrix
+        ax.figure.colorbar(im, ax=ax, label="Correlation")
         p9 = os.path.join(OUT_DIR, "multi_asset_corr.png")
-        savefig_and_maybe_show(p9, SHOW_PLOTS)
+        save_axes(ax, p9, "Return Correlation Matrix")
         saved.append(p9)
 
+    if pairs:
+        # Each pair's pipeline is independent and only reads the DB (WAL), so run them in worker processes,
+        # each with its own connection and headless figure.
+        workers = min(len(pairs), os.cpu_count() or 1)
+        print(f"Per-pair analysis: {len(pairs)} pairs on {workers} worker(s)...")
+        jobs = [
+            (DB_PATH, chain_id, pair_address, label, min_points_for_ratios, not args.no_cache)
+            for chain_id, pair_address, label in pairs
+        ]
+        # spawn (the Windows default everywhere): forking after numba's parallel kernels have started
+        # their thread pool can leave the parent hanging at exit.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+            for lines, pair_saved in ex.map(analyze_pair, *zip(*jobs)):
+                for line in lines:
+                    print(line)
+                saved.extend(pair_saved)
+
     print("Saved plots:")
     for p in saved:
         print(" ", p)
@@ -9,7 +9,8 @@ Interpretation:
 
 import sqlite3
 
-conn = sqlite3.connect("dex_data.sqlite")
+# Read-only: a diagnostic must not create an empty dex_data.sqlite when run from the wrong directory.
+conn = sqlite3.connect("file:dex_data.sqlite?mode=ro", uri=True)
 
 print("allowlist last 5 refreshes:")
 print(
@@ -22,19 +23,18 @@ LIMIT 5
 """).fetchall()
 )
 
-latest = conn.execute("SELECT MAX(ts_utc) FROM universe_churn_log").fetchone()[0]
-print("latest churn ts:", latest)
-print(
-    conn.execute(
-        """
-SELECT action, reason, COUNT(*) n
+# Latest churn ts and its breakdown in one statement (MAX(ts_utc) and the ts_utc = ... filter are both seeks on
+# the (ts_utc, chain_id, pair_address) primary-key index, as is the allowlist GROUP BY above).
+rows = conn.execute(
+    """
+SELECT ts_utc, action, reason, COUNT(*) n
 FROM universe_churn_log
-WHERE ts_utc = ?
+WHERE ts_utc = (SELECT MAX(ts_utc) FROM universe_churn_log)
 GROUP BY action, reason
 ORDER BY n DESC
-""",
-        (latest,),
-    ).fetchall()
-)
+"""
+).fetchall()
+print("latest churn ts:", rows[0][0] if rows else None)
+print([r[1:] for r in rows])
 
 conn.close()
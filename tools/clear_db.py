@@ -5,8 +5,10 @@ Historical graph data is only cleared when you run this script with --yes.
 The dashboard has no clear/delete button so you cannot accidentally wipe data from the UI.
 
 Usage:
-  python clear_db_data.py          # Dry run: show row counts, do nothing.
-  python clear_db_data.py --yes    # Permanently delete all table data (run with poller stopped).
+  python clear_db_data.py                 # Dry run: show approximate row counts, do nothing.
+  python clear_db_data.py --exact         # Dry run with exact COUNT(*) (full scan).
+  python clear_db_data.py --yes           # Permanently delete all table data (run with poller stopped).
+  python clear_db_data.py --yes --vacuum  # Also rewrite the file to return freed pages to the OS (slow on big DBs).
 """
 
 import argparse
@@ -20,6 +22,7 @@ DB_PATH = os.path.join(REPO_ROOT, "dex_data.sqlite")
 
 SOL_MONITOR_TABLE = "sol_monitor_snapshots"
 SPOT_TABLE = "spot_price_snapshots"
+TABLES = (SOL_MONITOR_TABLE, SPOT_TABLE)
 
 
 def main() -> None:
@@ -29,6 +32,16 @@ def main() -> None:
         action="store_true",
         help="Confirm: permanently delete all historical data from the DB.",
     )
+    parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="VACUUM after clearing to shrink the file (rewrites the whole DB; freed pages are reused otherwise).",
+    )
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        help="Show exact row counts (full table scan) instead of the MAX(rowid) estimate.",
+    )
     args = parser.parse_args()
 
     if not os.path.isfile(DB_PATH):
@@ -38,19 +51,22 @@ def main() -> None:
 
     conn = sqlite3.connect(DB_PATH)
     try:
-        cur = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name IN (?, ?)",
-            (SOL_MONITOR_TABLE, SPOT_TABLE),
-        )
-        tables = [r[0] for r in cur.fetchall()]
+        existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        tables = [t for t in TABLES if t in existing]
 
         total = 0
-        for table in [SOL_MONITOR_TABLE, SPOT_TABLE]:
-            if table not in tables:
+        for table in TABLES:
+            if table not in existing:
                 print(f"Table {table} missing; skipping.")
                 continue
-            n = conn.execute(f"SELECT COUNT(*) FROM [{table}]").fetchone()[0]
-            print(f"{table}: {n} rows")
+            if args.exact:
+                n = conn.execute(f"SELECT COUNT(*) FROM [{table}]").fetchone()[0]
+                print(f"{table}: {n} rows")
+            else:
+                # Both tables use INTEGER PRIMARY KEY AUTOINCREMENT: MAX(rowid) is a b-tree seek, 0 only when empty,
+                # and an upper bound on the row count once old rows have been pruned.
+                n = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM [{table}]").fetchone()[0]
+                print(f"{table}: ~{n} rows (approx; --exact to count)")
             total += n
 
         if total == 0:
@@ -66,16 +82,20 @@ def main() -> None:
 
         print("")
         print("Clearing all rows...")
-        for table in [SOL_MONITOR_TABLE, SPOT_TABLE]:
-            if table not in tables:
-                continue
-            conn.execute(f"DELETE FROM [{table}]")
-            conn.commit()
+        # One transaction for all tables; without secure_delete, freed pages are not overwritten with zeros,
+        # so the unfiltered DELETEs (SQLite's truncate optimization) only touch the freelist.
+        conn.execute("PRAGMA secure_delete=OFF")
+        with conn:
+            for table in tables:
+                conn.execute(f"DELETE FROM [{table}]")
+        for table in tables:
             print(f"  {table}: cleared.")
 
-        conn.execute("VACUUM")
-        conn.commit()
-        print("VACUUM done. DB is empty and ready for fresh data.")
+        if args.vacuum:
+            conn.execute("VACUUM")
+            print("VACUUM done. DB is empty and ready for fresh data.")
+        else:
+            print("DB is empty and ready for fresh data (file size unchanged; pass --vacuum to shrink it).")
         print("Start the poller again; refresh the dashboard (F5) to see only new data.")
     finally:
         conn.close()